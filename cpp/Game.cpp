@@ -1,5 +1,8 @@
 #include "Game.h"
 #include <algorithm>
+#include <random>
+#include <stdexcept>
+#include <tuple>
 
 // ============= Constructor =============
 
@@ -22,6 +25,8 @@ void Game::initializeHands() {
         for (int i = 1; i <= 2; ++i) hand.insert(HiveTile(player, Insect::BEETLE,      i));
         for (int i = 1; i <= 2; ++i) hand.insert(HiveTile(player, Insect::SPIDER,      i));
         hand.insert(HiveTile(player, Insect::QUEEN, 1));
+        for (auto& row : piece_table_.at(player - 1)) row = {0, 0, -1, 0};
+        for (const auto& tile : hand) hand_counts_.at(player - 1).at(static_cast<int>(tile.insect))++;
     }
 }
 
@@ -31,6 +36,13 @@ int Game::getCurrentPlayer() const {
     return (player_turns_.at(0) == player_turns_.at(1)) ? 1 : 2;
 }
 
+std::uint64_t Game::getHash() const {
+    // Turn counters distinguish otherwise identical boards (queen deadline, max turns)
+    auto turns = static_cast<std::uint64_t>(player_turns_.at(0)) << 32
+               | static_cast<std::uint32_t>(player_turns_.at(1));
+    return zobrist_ ^ (turns * 0x9E3779B97F4A7C15ULL);
+}
+
 bool Game::hasPlacedQueen(int player) const {
     return queen_positions_.at(player - 1).has_value();
 }
@@ -108,13 +120,21 @@ std::vector<Action> Game::getLegalActions() const {
             max_id_in_hand[tile.insect] = tile.id;
     }
 
+    // The placement cells are the same for every insect once the queen rules
+    // below have been applied, so they are computed once.
+    std::optional<std::vector<Position>> placements;
     for (const auto& [insect, max_id] : max_id_in_hand) {
         // Queen placement rule: must place queen by turn 4 (0-indexed turn 3)
         if (player_turns_.at(player - 1) == 3 && !hasPlacedQueen(player) && insect != Insect::QUEEN)
             continue;
+        // getValidPlacements' own queen rule (turn 2) — nothing else depends on the insect
+        if (player_turns_.at(player - 1) == 2 && !hasPlacedQueen(player) && insect != Insect::QUEEN)
+            continue;
 
+        if (!placements)
+            placements = getValidPlacements(insect);
         int tile_idx = tileToIdx(insect, max_id);
-        for (const auto& pos : getValidPlacements(insect))
+        for (const auto& pos : *placements)
             actions.push_back(Action{tile_idx, pos});
     }
 
@@ -133,26 +153,39 @@ std::vector<Action> Game::getLegalActions() const {
 }
 
 int Game::checkGameOver() const {
-    int threshold = simplified_game_ ? 3 : 6;
-
-    bool p1_surrounded = queen_positions_.at(0).has_value()
-        && countSurroundingPieces(*queen_positions_.at(0)) >= threshold;
-    bool p2_surrounded = queen_positions_.at(1).has_value()
-        && countSurroundingPieces(*queen_positions_.at(1)) >= threshold;
+    bool p1_surrounded = queenSurrounded(1);
+    bool p2_surrounded = queenSurrounded(2);
 
     if (p1_surrounded && p2_surrounded) return 0; // simultaneous — draw
     if (p1_surrounded) return 2;
     if (p2_surrounded) return 1;
 
     // Max turns reached: player with fewer pieces around their queen wins
-    if (max_turns_ > 0 && player_turns_.at(0) + player_turns_.at(1) >= max_turns_ * 2) {
-        int p1 = queen_positions_.at(0).has_value() ? countSurroundingPieces(*queen_positions_.at(0)) : 0;
-        int p2 = queen_positions_.at(1).has_value() ? countSurroundingPieces(*queen_positions_.at(1)) : 0;
-        if (p1 < p2) return 1;
-        if (p2 < p1) return 2;
-        return 0;
-    }
+    if (turnLimitReached())
+        return surroundWinner();
+
+    return 0;
+}
+
+bool Game::isOver() const {
+    return queenSurrounded(1) || queenSurrounded(2) || turnLimitReached();
+}
+
+bool Game::queenSurrounded(int player) const {
+    int threshold = simplified_game_ ? 3 : 6;
+    const auto& queen = queen_positions_.at(player - 1);
+    return queen.has_value() && countSurroundingPieces(*queen) >= threshold;
+}
+
+bool Game::turnLimitReached() const {
+    return max_turns_ > 0 && player_turns_.at(0) + player_turns_.at(1) >= max_turns_ * 2;
+}
 
+int Game::surroundWinner() const {
+    int p1 = queen_positions_.at(0).has_value() ? countSurroundingPieces(*queen_positions_.at(0)) : 0;
+    int p2 = queen_positions_.at(1).has_value() ? countSurroundingPieces(*queen_positions_.at(1)) : 0;
+    if (p1 < p2) return 1;
+    if (p2 < p1) return 2;
     return 0;
 }
 
@@ -198,9 +231,12 @@ void Game::undo(const Action& action, const std::optional<Position>& original_po
     } else {
         // Was a placement: remove from board and return to hand
         auto& stack = tile_positions_.at(action.to);
+        zobrist_ ^= pieceKey(tile, action.to, static_cast<int>(stack.size()) - 1);
         stack.pop_back();
         if (stack.empty()) tile_positions_.erase(action.to);
+        else syncStack(action.to);
         player_hands_.at(player - 1).insert(tile);
+        returnToHand(tile);
         if (insect == Insect::QUEEN)
             queen_positions_.at(player - 1) = std::nullopt;
     }
@@ -208,24 +244,166 @@ void Game::undo(const Action& action, const std::optional<Position>& original_po
     player_turns_.at(player - 1)--;
 }
 
+void Game::pass_turn() {
+    player_turns_.at(getCurrentPlayer() - 1)++;
+}
+
+void Game::undo_pass() {
+    player_turns_.at(2 - getCurrentPlayer())--;  // the player who passed is 3 - current
+}
+
+// ============= Playouts =============
+
+std::vector<std::array<int, 2>> Game::playouts(int n, int max_plies, std::uint64_t seed) const {
+    std::mt19937_64 rng(seed);
+    std::vector<std::array<int, 2>> results;
+    results.reserve(std::max(n, 0));
+
+    for (int i = 0; i < n; ++i) {
+        Game game = *this;
+        int plies = 0;
+        // checkGameOver() is 0 for a draw as well as for a running game
+        while (!game.isOver() && plies < max_plies) {
+            std::vector<Action> actions = game.getLegalActions();
+            if (actions.empty()) {
+                game.pass_turn();
+            } else {
+                std::uniform_int_distribution<std::size_t> pick(0, actions.size() - 1);
+                game.apply_action(actions[pick(rng)]);
+            }
+            ++plies;
+        }
+        int winner = game.isOver() ? game.checkGameOver() : game.surroundWinner();
+        results.push_back({winner, plies});
+    }
+    return results;
+}
+
+// ============= Serialization =============
+
+namespace {
+
+constexpr std::uint8_t SERIAL_VERSION = 1;
+constexpr std::size_t SERIAL_HEADER = 9;  // version, max_turns, simplified, 2 turn counters, piece count
+constexpr std::size_t SERIAL_PIECE = 6;
+
+void putInt16(std::string& out, int value) {
+    auto v = static_cast<std::uint16_t>(value);
+    out.push_back(static_cast<char>(v & 0xFF));
+    out.push_back(static_cast<char>(v >> 8));
+}
+
+int getInt16(const std::string& in, std::size_t at) {
+    auto v = static_cast<std::uint16_t>(static_cast<std::uint8_t>(in[at])
+                                        | static_cast<std::uint8_t>(in[at + 1]) << 8);
+    return static_cast<std::int16_t>(v);
+}
+
+}  // namespace
+
+std::string Game::toBytes() const {
+    std::string out;
+    out.reserve(SERIAL_HEADER + SERIAL_PIECE * 22);
+    out.push_back(static_cast<char>(SERIAL_VERSION));
+    putInt16(out, max_turns_);
+    out.push_back(static_cast<char>(simplified_game_ ? 1 : 0));
+    putInt16(out, player_turns_.at(0));
+    putInt16(out, player_turns_.at(1));
+    out.push_back(0);  // piece count, filled in below
+    std::uint8_t count = 0;
+    for (int player = 0; player < 2; ++player) {
+        for (int idx = 0; idx < 11; ++idx) {
+            const auto& row = piece_table_.at(player).at(idx);
+            if (row[2] < 0) continue;
+            out.push_back(static_cast<char>((player + 1) << 4 | idx));
+            putInt16(out, row[0]);
+            putInt16(out, row[1]);
+            out.push_back(static_cast<char>(row[2]));
+            ++count;
+        }
+    }
+    out[SERIAL_HEADER - 1] = static_cast<char>(count);
+    return out;
+}
+
+Game Game::fromBytes(const std::string& bytes) {
+    if (bytes.size() < SERIAL_HEADER || static_cast<std::uint8_t>(bytes[0]) != SERIAL_VERSION)
+        throw std::invalid_argument("not a Game encoding (wrong version or too short)");
+    std::size_t count = static_cast<std::uint8_t>(bytes[SERIAL_HEADER - 1]);
+    if (bytes.size() != SERIAL_HEADER + SERIAL_PIECE * count)
+        throw std::invalid_argument("Game encoding has the wrong length");
+
+    Game game(getInt16(bytes, 1), bytes[3] != 0);
+
+    // Pieces are placed bottom-up so every stack is rebuilt in order
+    std::vector<std::tuple<int, int, HiveTile, Position>> pieces;
+    for (std::size_t i = 0; i < count; ++i) {
+        std::size_t at = SERIAL_HEADER + SERIAL_PIECE * i;
+        auto packed = static_cast<std::uint8_t>(bytes[at]);
+        int player = packed >> 4, idx = packed & 0x0F;
+        if (player < 1 || player > 2 || idx > 10)
+            throw std::invalid_argument("Game encoding has an invalid piece");
+        auto [insect, id] = TILE_IDX_MAP[idx];
+        int level = static_cast<std::uint8_t>(bytes[at + 5]);
+        pieces.emplace_back(level, static_cast<int>(i), HiveTile(player, insect, id),
+                            Position{getInt16(bytes, at + 1), getInt16(bytes, at + 3)});
+    }
+    std::sort(pieces.begin(), pieces.end(),
+              [](const auto& a, const auto& b) { return std::tie(std::get<0>(a), std::get<1>(a))
+                                                        < std::tie(std::get<0>(b), std::get<1>(b)); });
+    for (const auto& [level, order, tile, pos] : pieces) {
+        auto it = game.tile_positions_.find(pos);
+        int height = it == game.tile_positions_.end() ? 0 : static_cast<int>(it->second.size());
+        if (height != level || !game.player_hands_.at(tile.player - 1).count(tile))
+            throw std::invalid_argument("Game encoding has an inconsistent stack");
+        game.placeTile(tile, pos);
+    }
+    game.player_turns_ = {getInt16(bytes, 4), getInt16(bytes, 6)};
+    return game;
+}
+
 // ============= Private Helpers =============
 
 void Game::placeTile(const HiveTile& tile, const Position& pos) {
-    tile_positions_[pos].push_back(tile);
+    auto& stack = tile_positions_[pos];
+    zobrist_ ^= pieceKey(tile, pos, static_cast<int>(stack.size()));
+    stack.push_back(tile);
     player_hands_.at(tile.player - 1).erase(tile);
+    hand_counts_.at(tile.player - 1).at(static_cast<int>(tile.insect))--;
+    syncStack(pos);
     if (tile.insect == Insect::QUEEN)
         queen_positions_.at(tile.player - 1) = pos;
 }
 
 void Game::moveTile(const HiveTile& tile, const Position& from, const Position& to) {
     auto& from_stack = tile_positions_.at(from);
+    zobrist_ ^= pieceKey(tile, from, static_cast<int>(from_stack.size()) - 1);
     from_stack.pop_back();
     if (from_stack.empty()) tile_positions_.erase(from);
-    tile_positions_[to].push_back(tile);
+    else syncStack(from);
+    auto& to_stack = tile_positions_[to];
+    zobrist_ ^= pieceKey(tile, to, static_cast<int>(to_stack.size()));
+    to_stack.push_back(tile);
+    syncStack(to);
     if (tile.insect == Insect::QUEEN)
         queen_positions_.at(tile.player - 1) = to;
 }
 
+void Game::syncStack(const Position& pos) {
+    const auto& stack = tile_positions_.at(pos);
+    auto height = static_cast<std::int16_t>(stack.size());
+    for (std::int16_t level = 0; level < height; ++level) {
+        const HiveTile& tile = stack[level];
+        piece_table_.at(tile.player - 1).at(tileToIdx(tile.insect, tile.id)) =
+            {static_cast<std::int16_t>(pos.q), static_cast<std::int16_t>(pos.r), level, height};
+    }
+}
+
+void Game::returnToHand(const HiveTile& tile) {
+    piece_table_.at(tile.player - 1).at(tileToIdx(tile.insect, tile.id)) = {0, 0, -1, 0};
+    hand_counts_.at(tile.player - 1).at(static_cast<int>(tile.insect))++;
+}
+
 int Game::tileToIdx(Insect insect, int id) {
     for (int i = 0; i < 11; i++) {
         if (TILE_IDX_MAP[i].first == insect && TILE_IDX_MAP[i].second == id) return i;
@@ -233,6 +411,20 @@ int Game::tileToIdx(Insect insect, int id) {
     return -1;
 }
 
+std::uint64_t Game::pieceKey(const HiveTile& tile, const Position& pos, int level) {
+    // The board is unbounded so keys are derived by mixing the packed piece
+    // description (splitmix64 finaliser) rather than read from a fixed table
+    std::uint64_t x = static_cast<std::uint64_t>(tileToIdx(tile.insect, tile.id))
+                    | static_cast<std::uint64_t>(tile.player) << 4
+                    | static_cast<std::uint64_t>(level & 0xFF) << 8
+                    | static_cast<std::uint64_t>(static_cast<std::uint16_t>(pos.q)) << 16
+                    | static_cast<std::uint64_t>(static_cast<std::uint16_t>(pos.r)) << 32;
+    x += 0x9E3779B97F4A7C15ULL;
+    x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9ULL;
+    x = (x ^ (x >> 27)) * 0x94D049BB133111EBULL;
+    return x ^ (x >> 31);
+}
+
 int Game::countSurroundingPieces(const Position& pos) const {
     int count = 0;
     for (const auto& neighbor : MoveFetcher::getNeighbors(pos)) {
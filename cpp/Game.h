@@ -7,6 +7,8 @@
 #include <vector>
 #include <array>
 #include <optional>
+#include <cstdint>
+#include <string>
 
 /**
  * Maps tile_idx (0-10) to (Insect type, instance id).
@@ -35,7 +37,7 @@ inline constexpr std::array<std::pair<Insect, int>, 11> TILE_IDX_MAP = {{
 }};
 
 /**
- * Unified action type used by all agents and returned by getBestMove.
+ * Unified action type used by all agents and returned by Search::search.
  *
  * tile_idx identifies the specific piece instance via TILE_IDX_MAP.
  * to is the destination position for both placements and movements.
@@ -91,11 +93,30 @@ public:
      */
     int checkGameOver() const;
 
+    /**
+     * Whether the game has ended: a queen is surrounded or the max-turns
+     * limit is reached. Unlike checkGameOver, also true for a draw.
+     */
+    bool isOver() const;
+
+    /**
+     * Winner by the max-turns rule: the player with fewer pieces around their
+     * own queen, 0 if level.
+     */
+    int surroundWinner() const;
+
     /**
      * Returns the current player (1 or 2).
      */
     int getCurrentPlayer() const;
 
+    /**
+     * Zobrist hash of the position: every piece with its cell and stack level,
+     * plus both turn counters. Maintained incrementally by apply_action/undo,
+     * so transposed move orders reaching the same position hash identically.
+     */
+    std::uint64_t getHash() const;
+
     // ============= Game Actions =============
 
     /**
@@ -114,6 +135,47 @@ public:
      */
     void undo(const Action& action, const std::optional<Position>& original_pos);
 
+    /**
+     * Passes the turn to the other player without moving (not a legal Hive
+     * move). Used by null-move pruning in search; must be reverted with
+     * undo_pass before any other action is undone.
+     */
+    void pass_turn();
+
+    /**
+     * Reverts the most recent pass_turn.
+     */
+    void undo_pass();
+
+    // ============= Playouts =============
+
+    /**
+     * Plays n uniformly random games from the current position, each on a
+     * copy of the game (this position is unchanged), and returns
+     * {winner, plies} per game. A player with no legal action passes.
+     * Games still running after max_plies are scored like the max-turns
+     * rule: the player with fewer pieces around their own queen wins, 0 if
+     * level. seed seeds the random number generator.
+     */
+    std::vector<std::array<int, 2>> playouts(int n, int max_plies, std::uint64_t seed) const;
+
+    // ============= Serialization =============
+
+    /**
+     * Compact byte encoding of the position: a 9-byte header (format
+     * version, max_turns, simplified flag, both turn counters, piece count)
+     * followed by 6 bytes per piece on the board (player and tile_idx, q, r,
+     * stack level). Hands follow from the pieces on the board.
+     */
+    std::string toBytes() const;
+
+    /**
+     * Rebuilds a game from toBytes(). The position, hash and turn counters
+     * are equal to the original's (legal actions may be listed in another
+     * order). Throws std::invalid_argument on malformed input.
+     */
+    static Game fromBytes(const std::string& bytes);
+
     // ============= State Access =============
 
     const std::unordered_map<Position, std::vector<HiveTile>>& getTilePositions() const {
@@ -129,6 +191,26 @@ public:
         return player_turns_;
     }
 
+    // ============= Array Views =============
+
+    /**
+     * Per piece, indexed [player - 1][tile_idx]: {q, r, level, stack height}.
+     * level is 0 on the ground and counts up a stack; a piece in hand has
+     * level -1 and height 0 (q, r = 0). Kept up to date by every placement,
+     * move and undo, so the bindings can expose it without copying.
+     */
+    using PieceTable = std::array<std::array<std::array<std::int16_t, 4>, 11>, 2>;
+    const PieceTable& getPieceTable() const {
+        return piece_table_;
+    }
+
+    /**
+     * Pieces in hand, indexed [player - 1][Insect].
+     */
+    const std::array<std::array<std::int8_t, 5>, 2>& getHandCounts() const {
+        return hand_counts_;
+    }
+
 private:
     // ============= State =============
 
@@ -138,17 +220,30 @@ private:
     std::array<int, 2> player_turns_;
     int max_turns_;
     bool simplified_game_;
+    std::uint64_t zobrist_ = 0;  // XOR of pieceKey() over every piece on the board
+    PieceTable piece_table_{};
+    std::array<std::array<std::int8_t, 5>, 2> hand_counts_{};
 
     // ============= Private Helpers =============
 
     void initializeHands();
     bool hasPlacedQueen(int player) const;
     int countSurroundingPieces(const Position& pos) const;
+    bool queenSurrounded(int player) const;
+    bool turnLimitReached() const;
 
     // Low-level primitives used by apply_action and undo (no turn increment)
     void placeTile(const HiveTile& tile, const Position& pos);
     void moveTile(const HiveTile& tile, const Position& from, const Position& to);
 
+    // Rewrites the piece table rows of every tile in the stack at pos (levels and height)
+    void syncStack(const Position& pos);
+    // Marks the tile as in hand in the piece table and hand counts
+    void returnToHand(const HiveTile& tile);
+
     // Returns tile_idx for a given (insect, id) pair, or -1 if not found
     static int tileToIdx(Insect insect, int id);
+
+    // Zobrist key for a tile at a given cell and stack level (0 = ground)
+    static std::uint64_t pieceKey(const HiveTile& tile, const Position& pos, int level);
 };
@@ -0,0 +1,63 @@
+#include "Heuristic.h"
+
+namespace {
+
+int countSurrounding(const Game& game, const std::optional<Position>& queen) {
+    if (!queen) return 0;
+    const auto& tiles = game.getTilePositions();
+    int count = 0;
+    for (const auto& neighbor : MoveFetcher::getNeighbors(*queen))
+        if (tiles.find(neighbor) != tiles.end()) count++;
+    return count;
+}
+
+bool ownedByOpponent(const Game& game, const std::optional<Position>& queen, int owner) {
+    if (!queen) return false;
+    const auto& tiles = game.getTilePositions();
+    auto it = tiles.find(*queen);
+    return it != tiles.end() && it->second.size() > 1 && it->second.back().player != owner;
+}
+
+// Top pieces of `player` with at least one valid move (each piece is on one cell)
+int countMoveable(const Game& game, int player) {
+    int count = 0;
+    for (const auto& [pos, stack] : game.getTilePositions()) {
+        if (!stack.empty() && stack.back().player == player && !game.getValidMoves(pos).empty())
+            count++;
+    }
+    return count;
+}
+
+}  // namespace
+
+namespace Heuristic {
+
+double evaluate(const Game& game, int player, const HeuristicParams& params) {
+    int winner = game.checkGameOver();
+    if (winner == player) return params.win_reward;
+    if (winner != 0) return -params.win_reward;
+
+    int opp = 3 - player;
+    const auto& queens = game.getQueenPositions();
+
+    double value = (countSurrounding(game, queens.at(opp - 1)) - countSurrounding(game, queens.at(player - 1)))
+                   * params.queen_surrounding_reward;
+    value += ((ownedByOpponent(game, queens.at(opp - 1), opp) ? 1 : 0)
+              - (ownedByOpponent(game, queens.at(player - 1), player) ? 1 : 0)) * params.ownership_reward;
+    value += (countMoveable(game, player) - countMoveable(game, opp)) * params.mp_reward;
+    return value;
+}
+
+std::vector<std::pair<Action, double>> scoreChildren(Game& game, int player, const HeuristicParams& params) {
+    std::vector<Action> actions = game.getLegalActions();
+    std::vector<std::pair<Action, double>> scored;
+    scored.reserve(actions.size());
+    for (const auto& action : actions) {
+        auto original = game.apply_action(action);
+        scored.emplace_back(action, evaluate(game, player, params));
+        game.undo(action, original);
+    }
+    return scored;
+}
+
+}  // namespace Heuristic
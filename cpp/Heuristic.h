@@ -0,0 +1,37 @@
+#pragma once
+#include "Game.h"
+#include <utility>
+#include <vector>
+
+/**
+ * Weights of the minimax heuristic. Field names and defaults match
+ * MinimaxParams in py2/agents/minimax_agent_py.py.
+ */
+struct HeuristicParams {
+    double queen_surrounding_reward = 1.0;
+    double ownership_reward = 3.0;
+    double win_reward = 100.0;
+    double mp_reward = 0.5;
+};
+
+/**
+ * Heuristic: native port of the Python minimax evaluation (_evaluate).
+ *
+ * Stateless like MoveFetcher. Scores are from `player`'s perspective and
+ * identical to the Python version: win/loss, pieces around each queen,
+ * an opponent piece on top of a queen and mobility (pieces with at least one
+ * move — getValidMoves only moves the current player's pieces, so only the
+ * side to move scores mobility, as in Python).
+ */
+namespace Heuristic {
+
+    double evaluate(const Game& game, int player, const HeuristicParams& params);
+
+    /**
+     * Applies each legal action, evaluates the result for `player` and
+     * undoes it. Returns (action, score) pairs in getLegalActions() order;
+     * the game is left unchanged.
+     */
+    std::vector<std::pair<Action, double>> scoreChildren(Game& game, int player, const HeuristicParams& params);
+
+}
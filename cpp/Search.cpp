@@ -0,0 +1,342 @@
+#include "Search.h"
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <limits>
+#include <tuple>
+#include <utility>
+#include <vector>
+
+namespace {
+
+using Clock = std::chrono::steady_clock;
+
+constexpr double INF = std::numeric_limits<double>::infinity();
+constexpr double NULL_WINDOW = 1e-6;  // PVS scout window width, as in Python
+
+struct SearchTimeout {};
+
+// ============= Budget =============
+
+class Budget {
+public:
+    Budget(std::optional<double> time_budget_ms, std::optional<long> node_budget)
+        : time_budget_ms_(time_budget_ms), node_budget_(node_budget) {
+        if (time_budget_ms_ && *time_budget_ms_ > 0)
+            deadline_ = Clock::now() + std::chrono::duration_cast<Clock::duration>(
+                                           std::chrono::duration<double, std::milli>(*time_budget_ms_));
+    }
+
+    void check() {
+        nodes_++;
+        if (node_budget_ && *node_budget_ > 0 && nodes_ > *node_budget_) throw SearchTimeout{};
+        if (deadline_ && Clock::now() > *deadline_) throw SearchTimeout{};
+    }
+
+    // Fraction of the budget left - the smaller of time and nodes
+    double remaining() const {
+        double fraction = 1.0;
+        if (deadline_) {
+            double left_ms = std::chrono::duration<double, std::milli>(*deadline_ - Clock::now()).count();
+            fraction = std::min(fraction, left_ms / *time_budget_ms_);
+        }
+        if (node_budget_ && *node_budget_ > 0)
+            fraction = std::min(fraction, 1.0 - static_cast<double>(nodes_) / *node_budget_);
+        return std::max(fraction, 0.0);
+    }
+
+private:
+    std::optional<double> time_budget_ms_;
+    std::optional<long> node_budget_;
+    std::optional<Clock::time_point> deadline_;
+    long nodes_ = 0;
+};
+
+// ============= Transposition Table =============
+
+enum class Bound { EXACT, LOWER, UPPER };
+
+struct TTEntry {
+    std::uint64_t key = 0;
+    int depth = -1;  // -1: empty slot
+    double score = 0.0;
+    Bound bound = Bound::EXACT;
+    std::optional<Action> best_move;
+};
+
+/**
+ * Direct-mapped table with the replacement rule of py2/agents/transposition.py
+ * for a single search: a slot holding another position is only kept if it
+ * was searched deeper.
+ */
+class TranspositionTable {
+public:
+    explicit TranspositionTable(std::size_t size) : entries_(size) {}
+
+    const TTEntry* probe(std::uint64_t key, SearchResult& stats) const {
+        stats.tt_probes++;
+        const TTEntry& entry = entries_[key % entries_.size()];
+        if (entry.depth < 0 || entry.key != key) return nullptr;
+        stats.tt_hits++;
+        return &entry;
+    }
+
+    void store(std::uint64_t key, int depth, double score, double alpha, double beta,
+               std::optional<Action> best_move) {
+        TTEntry& entry = entries_[key % entries_.size()];
+        if (entry.depth >= 0 && entry.key != key && entry.depth > depth) return;
+        Bound bound = score <= alpha ? Bound::UPPER : score >= beta ? Bound::LOWER : Bound::EXACT;
+        if (entry.depth >= 0 && entry.key == key && !best_move) best_move = entry.best_move;
+        entry = TTEntry{key, depth, score, bound, best_move};
+    }
+
+private:
+    std::vector<TTEntry> entries_;
+};
+
+// Undoes an applied action (or a pass) when it goes out of scope, including
+// while a SearchTimeout unwinds the stack
+class AppliedAction {
+public:
+    AppliedAction(Game& game, const Action& action) : game_(game), action_(action) {
+        original_ = game_.apply_action(action);
+    }
+    ~AppliedAction() { game_.undo(action_, original_); }
+
+private:
+    Game& game_;
+    Action action_;
+    std::optional<Position> original_;
+};
+
+class PassedTurn {
+public:
+    explicit PassedTurn(Game& game) : game_(game) { game_.pass_turn(); }
+    ~PassedTurn() { game_.undo_pass(); }
+
+private:
+    Game& game_;
+};
+
+// ============= Negamax =============
+
+class Searcher {
+public:
+    Searcher(Game& game, const SearchParams& params, int player, std::size_t tt_size, SearchResult& stats)
+        : game_(game), params_(params), player_(player), stats_(stats) {
+        if (tt_size > 0) tt_.emplace(tt_size);
+    }
+
+    Budget* budget = nullptr;  // nullptr: unlimited (the first iteration always completes)
+
+    /**
+     * Beam-search negamax with fail-soft alpha-beta and PVS - see _negamax in
+     * py2/agents/minimax_agent_py.py, which this follows line for line.
+     */
+    std::pair<double, std::optional<Action>> negamax(int depth, double alpha, double beta, int ply,
+                                                     bool after_null = false) {
+        if (budget) budget->check();
+        stats_.nodes++;
+        stats_.depth_nodes[depth]++;
+
+        double sign = game_.getCurrentPlayer() == player_ ? 1.0 : -1.0;
+
+        if (game_.checkGameOver() != 0 || depth == 0) return {sign * leafEvaluate(), std::nullopt};
+
+        std::uint64_t key = 0;
+        double alpha_orig = alpha, beta_orig = beta;
+        std::optional<Action> tt_move;
+        if (tt_) {
+            key = game_.getHash();
+            if (const TTEntry* entry = tt_->probe(key, stats_)) {
+                tt_move = entry->best_move;
+                if (entry->depth >= depth &&
+                    (entry->bound == Bound::EXACT
+                     || (entry->bound == Bound::LOWER && entry->score >= beta)
+                     || (entry->bound == Bound::UPPER && entry->score <= alpha)))
+                    return {entry->score, entry->best_move};
+            }
+        }
+
+        // ── Selective pruning from the static evaluation (never at the root) ──
+        bool futile = ply > 0 && params_.futility_margin && depth <= params_.futility_depth;
+        bool try_null = ply > 0 && params_.null_move && !after_null
+                        && depth >= params_.null_move_min_depth && beta < INF;
+        if (futile || try_null) {
+            double static_score = sign * Heuristic::evaluate(game_, player_, params_.heuristic);
+            if (futile && static_score + *params_.futility_margin * depth <= alpha) {
+                stats_.futility_prunes++;
+                return {static_score + *params_.futility_margin * depth, std::nullopt};
+            }
+            if (try_null && static_score >= beta) {
+                stats_.null_move_tries++;
+                double val;
+                {
+                    PassedTurn pass(game_);
+                    val = -negamax(std::max(depth - 1 - params_.null_move_reduction, 0),
+                                   -beta, -beta + NULL_WINDOW, ply + 1, true).first;
+                }
+                if (val >= beta) {
+                    stats_.null_move_cutoffs++;
+                    return {val, std::nullopt};
+                }
+            }
+        }
+
+        // ── Phase 1: shallow evaluation of all moves ───────────────────────
+        auto scored = Heuristic::scoreChildren(game_, player_, params_.heuristic);
+        if (scored.empty()) return {sign * leafEvaluate(), std::nullopt};
+        for (auto& [action, score] : scored) score *= sign;
+
+        // ── Phase 2: select top-k candidates ──────────────────────────────
+        // Ties broken by the action itself, as in Python: legal-action order depends on the game's history
+        std::sort(scored.begin(), scored.end(), [](const auto& a, const auto& b) {
+            if (a.second != b.second) return a.second > b.second;
+            return std::tie(a.first.tile_idx, a.first.to.q, a.first.to.r)
+                 < std::tie(b.first.tile_idx, b.first.to.q, b.first.to.r);
+        });
+        std::size_t width = std::min(beamWidth(scored), scored.size());
+        std::vector<Action> candidates;
+        candidates.reserve(width + 1);
+        for (std::size_t i = 0; i < width; ++i) candidates.push_back(scored[i].first);
+        stats_.beam_widths[static_cast<int>(candidates.size())]++;
+
+        // The stored best move is searched first, even if it fell outside the beam
+        if (tt_move && std::any_of(scored.begin(), scored.end(),
+                                   [&](const auto& s) { return s.first == *tt_move; })) {
+            candidates.erase(std::remove(candidates.begin(), candidates.end(), *tt_move), candidates.end());
+            candidates.insert(candidates.begin(), *tt_move);
+        }
+
+        // ── Phase 3: recursive PVS on candidates ──────────────────────────
+        double best_val = -INF;
+        std::optional<Action> best_action;
+
+        for (std::size_t i = 0; i < candidates.size(); ++i) {
+            const Action& action = candidates[i];
+            double val;
+            {
+                AppliedAction applied(game_, action);
+                if (i == 0 || alpha == -INF) {
+                    val = -negamax(depth - 1, -beta, -alpha, ply + 1).first;
+                } else {
+                    val = INF;
+                    if (params_.lmr && static_cast<int>(i) >= params_.lmr_min_moves
+                        && depth >= params_.lmr_min_depth) {
+                        stats_.lmr_reductions++;
+                        val = -negamax(depth - 1 - params_.lmr_reduction, -alpha - NULL_WINDOW, -alpha,
+                                       ply + 1).first;
+                        if (val > alpha) stats_.lmr_researches++;
+                    }
+                    if (val > alpha) {  // not reduced, or the reduced search beat alpha
+                        if (!params_.pvs) {
+                            val = -negamax(depth - 1, -beta, -alpha, ply + 1).first;
+                        } else {
+                            val = -negamax(depth - 1, -alpha - NULL_WINDOW, -alpha, ply + 1).first;
+                            if (alpha < val && val < beta && depth > 1)  // beat alpha - re-search
+                                val = -negamax(depth - 1, -beta, -val, ply + 1).first;
+                        }
+                    }
+                }
+            }
+            if (val > best_val) {
+                best_val = val;
+                best_action = action;
+            }
+            alpha = std::max(alpha, val);
+            if (alpha >= beta) {
+                stats_.cutoffs++;
+                if (i == 0) stats_.first_move_cutoffs++;
+                break;
+            }
+        }
+
+        if (tt_) tt_->store(key, depth, best_val, alpha_orig, beta_orig, best_action);
+        return {best_val, best_action};
+    }
+
+private:
+    Game& game_;
+    const SearchParams& params_;
+    int player_;
+    SearchResult& stats_;
+    std::optional<TranspositionTable> tt_;
+
+    double leafEvaluate() {
+        stats_.leaf_evals++;
+        return Heuristic::evaluate(game_, player_, params_.heuristic);
+    }
+
+    // Candidates to keep at a node given its sorted phase-1 scores (_beam_width)
+    std::size_t beamWidth(const std::vector<std::pair<Action, double>>& scored) const {
+        if (!params_.adaptive_beam) return static_cast<std::size_t>(std::max(params_.beam_width, 0));
+        int n = static_cast<int>(scored.size());
+        if (n <= params_.full_width_below) return n;
+        double remaining = budget ? budget->remaining() : 1.0;
+        int upper = std::max(params_.beam_min,
+                             static_cast<int>(std::nearbyint(params_.beam_max * std::min(remaining * 2, 1.0))));
+        int within = static_cast<int>(std::count_if(scored.begin(), scored.end(), [&](const auto& s) {
+            return s.second >= scored.front().second - params_.beam_epsilon;
+        }));
+        return std::min(std::max(within, params_.beam_min), upper);
+    }
+};
+
+}  // namespace
+
+namespace Search {
+
+SearchResult search(Game& game, const SearchParams& params,
+                    std::optional<double> time_budget_ms, std::optional<long> node_budget) {
+    auto t0 = Clock::now();
+    SearchResult result;
+    int player = game.getCurrentPlayer();
+    bool iterative = (time_budget_ms && *time_budget_ms > 0) || (node_budget && *node_budget > 0);
+
+    // The iterative search always has a table: it carries the PV between iterations
+    std::size_t tt_size = params.tt_size > 0 ? params.tt_size : iterative ? std::size_t{1} << 16 : 0;
+    Searcher searcher(game, params, player, tt_size, result);
+
+    if (!iterative) {
+        auto [score, action] = searcher.negamax(params.depth, -INF, INF, 0);
+        result.score = score;
+        result.action = action;
+        result.depth = params.depth;
+    } else {
+        // _iterative_deepening: aspiration windows around the score from two depths back
+        Budget budget(time_budget_ms, node_budget);
+        std::vector<double> scores;
+        for (int depth = 1; depth <= params.depth; ++depth) {
+            double alpha = -INF, beta = INF;
+            if (result.depth > 0 && params.aspiration_window) {
+                double centre = scores.size() > 1 ? scores[scores.size() - 2] : result.score;
+                alpha = centre - *params.aspiration_window;
+                beta = centre + *params.aspiration_window;
+            }
+            searcher.budget = result.depth > 0 ? &budget : nullptr;
+            long nodes_before = result.nodes;
+            std::pair<double, std::optional<Action>> found;
+            try {
+                while (true) {
+                    found = searcher.negamax(depth, alpha, beta, 0);
+                    if (found.first <= alpha) alpha = -INF;
+                    else if (found.first >= beta) beta = INF;
+                    else break;
+                }
+            } catch (const SearchTimeout&) {
+                break;
+            }
+            result.score = found.first;
+            result.action = found.second;
+            scores.push_back(found.first);
+            result.depth = depth;
+            result.iteration_nodes[depth] = result.nodes - nodes_before;
+            if (!result.action || std::abs(result.score) >= params.heuristic.win_reward / 2) break;
+        }
+    }
+
+    result.elapsed_s = std::chrono::duration<double>(Clock::now() - t0).count();
+    return result;
+}
+
+}  // namespace Search
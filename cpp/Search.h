@@ -0,0 +1,84 @@
+#pragma once
+#include "Game.h"
+#include "Heuristic.h"
+#include <cstddef>
+#include <map>
+#include <optional>
+
+/**
+ * Configuration of the native beam search. Field names and defaults match
+ * MinimaxParams in py2/agents/minimax_agent_py.py; a disabled Python option
+ * (None) is std::nullopt here.
+ */
+struct SearchParams {
+    int depth = 3;
+    int beam_width = 3;
+    HeuristicParams heuristic;
+    std::size_t tt_size = 1 << 16;                  // 0: no table for a fixed-depth search
+    bool pvs = true;
+    std::optional<double> aspiration_window = 1.0;
+    bool lmr = false;
+    int lmr_min_moves = 2;
+    int lmr_min_depth = 3;
+    int lmr_reduction = 1;
+    std::optional<double> futility_margin;
+    int futility_depth = 2;
+    bool null_move = false;
+    int null_move_reduction = 2;
+    int null_move_min_depth = 3;
+    bool adaptive_beam = true;
+    int beam_min = 2;
+    int beam_max = 6;
+    double beam_epsilon = 0.25;
+    int full_width_below = 6;
+};
+
+/**
+ * Best action, score and counters of one search. The counters mean the same
+ * as the fields of the same name in py2/agents/search_stats.py.
+ */
+struct SearchResult {
+    std::optional<Action> action;  // nullopt: no legal action at the root
+    double score = 0.0;            // from the side to move's perspective
+    int depth = 0;                 // deepest completed iteration
+
+    long nodes = 0;
+    long leaf_evals = 0;
+    long cutoffs = 0;
+    long first_move_cutoffs = 0;
+    std::map<int, long> depth_nodes;      // remaining depth -> nodes
+    std::map<int, long> iteration_nodes;  // iterative deepening: depth -> nodes
+    std::map<int, long> beam_widths;      // beam width -> nodes searched with it
+    long tt_probes = 0;
+    long tt_hits = 0;
+    long lmr_reductions = 0;
+    long lmr_researches = 0;
+    long futility_prunes = 0;
+    long null_move_tries = 0;
+    long null_move_cutoffs = 0;
+    double elapsed_s = 0.0;
+};
+
+/**
+ * Search: native port of the py2 beam-search negamax (_negamax and
+ * _iterative_deepening in py2/agents/minimax_agent_py.py).
+ *
+ * Same semantics node for node: phase-1 scoring of every legal action with
+ * Heuristic::scoreChildren, ties ordered by (tile_idx, q, r), a fixed or
+ * adaptive beam, the table move searched first, fail-soft PVS, and the
+ * optional futility pruning, null move and late-move reductions. With the
+ * same parameters and a fresh table it searches the same tree as Python and
+ * returns the same move.
+ *
+ * With a time or node budget params.depth is the maximum depth of an
+ * iterative-deepening search with aspiration windows; otherwise one search
+ * to params.depth is run. The transposition table lives for one call.
+ * The game is searched in place and left unchanged.
+ */
+namespace Search {
+
+    SearchResult search(Game& game, const SearchParams& params,
+                        std::optional<double> time_budget_ms = std::nullopt,
+                        std::optional<long> node_budget = std::nullopt);
+
+}
@@ -0,0 +1,118 @@
+#include "VecGame.h"
+#include <stdexcept>
+#include <string>
+
+// ============= Constructor =============
+
+VecGame::VecGame(int n, int max_turns, bool simplified_game, int radius, bool auto_reset)
+    : max_turns_(max_turns)
+    , simplified_game_(simplified_game)
+    , radius_(radius)
+    , width_(2 * radius + 1)
+    , auto_reset_(auto_reset)
+{
+    if (n < 0) throw std::invalid_argument("n must be non-negative");
+    if (radius < 0) throw std::invalid_argument("radius must be non-negative");
+
+    games_.assign(n, Game(max_turns_, simplified_game_));
+    masks_.assign(static_cast<std::size_t>(n) * numActions(), 0);
+    mask_indices_.resize(n);
+    has_legal_.assign(n, 0);
+    finished_.assign(n, 0);
+    results_.assign(n, {0, 0, 0});
+    for (int i = 0; i < n; ++i) refresh(i);
+}
+
+// ============= Action Indexing =============
+
+int VecGame::actionIndex(const Action& action) const {
+    int col = action.to.q + radius_;
+    int row = action.to.r + radius_;
+    if (col < 0 || col >= width_ || row < 0 || row >= width_) return -1;
+    return (row * width_ + col) * NUM_TILES + action.tile_idx;
+}
+
+Action VecGame::actionAt(int index) const {
+    int cell = index / NUM_TILES;
+    return Action{index % NUM_TILES, Position{cell % width_ - radius_, cell / width_ - radius_}};
+}
+
+// ============= Stepping =============
+
+std::vector<int> VecGame::step(const std::vector<int>& actions) {
+    int n = size();
+    if (static_cast<int>(actions.size()) != n)
+        throw std::invalid_argument("expected " + std::to_string(n) + " actions, got "
+                                    + std::to_string(actions.size()));
+
+    // Check everything first so an illegal action leaves every game unchanged
+    for (int i = 0; i < n; ++i) {
+        if (finished_[i]) continue;
+        int a = actions[i];
+        bool legal = a == PASS ? mask_indices_[i].empty()
+                               : a >= 0 && a < numActions() && masks_[static_cast<std::size_t>(i) * numActions() + a];
+        if (!legal)
+            throw std::invalid_argument("game " + std::to_string(i) + ": action " + std::to_string(a)
+                                        + " is not legal");
+    }
+
+    std::vector<int> outcomes(n, -1);
+    for (int i = 0; i < n; ++i) {
+        if (finished_[i]) continue;
+        Game& game = games_[i];
+        if (actions[i] == PASS)
+            game.pass_turn();
+        else
+            game.apply_action(actionAt(actions[i]));
+
+        if (game.isOver()) {
+            outcomes[i] = game.checkGameOver();
+        } else {
+            refresh(i);
+            if (has_legal_[i] && mask_indices_[i].empty())  // every legal action is outside the window
+                outcomes[i] = game.surroundWinner();
+        }
+        if (outcomes[i] >= 0) finish(i, outcomes[i]);
+    }
+    return outcomes;
+}
+
+void VecGame::reset() {
+    for (int i = 0; i < size(); ++i) reset(i);
+}
+
+void VecGame::reset(int i) {
+    games_.at(i) = Game(max_turns_, simplified_game_);
+    finished_[i] = 0;
+    refresh(i);
+}
+
+// ============= Private Helpers =============
+
+void VecGame::refresh(int i) {
+    std::uint8_t* row = masks_.data() + static_cast<std::size_t>(i) * numActions();
+    for (int a : mask_indices_[i]) row[a] = 0;
+    mask_indices_[i].clear();
+    has_legal_[i] = 0;
+    if (finished_[i]) return;
+
+    std::vector<Action> actions = games_[i].getLegalActions();
+    has_legal_[i] = !actions.empty();
+    for (const auto& action : actions) {
+        int a = actionIndex(action);
+        if (a >= 0 && !row[a]) {
+            row[a] = 1;
+            mask_indices_[i].push_back(a);
+        }
+    }
+}
+
+void VecGame::finish(int i, int winner) {
+    results_[i][winner == 0 ? 2 : winner - 1]++;
+    if (auto_reset_) {
+        games_[i] = Game(max_turns_, simplified_game_);
+    } else {
+        finished_[i] = 1;
+    }
+    refresh(i);
+}
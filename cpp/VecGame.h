@@ -0,0 +1,113 @@
+#pragma once
+#include "Game.h"
+#include <array>
+#include <cstdint>
+#include <vector>
+
+/**
+ * VecGame: n independent games stepped together, so self-play and training
+ * cost one call per ply for the whole batch instead of one per game.
+ *
+ * Actions are flat indices over a fixed window of the unbounded board: the
+ * cells with |q| <= radius and |r| <= radius, numbered
+ * cell = (r + radius) * width + (q + radius) with width = 2 * radius + 1, and
+ * action = cell * 11 + tile_idx. Legal actions outside the window cannot be
+ * expressed; a game whose legal actions all lie outside it is ended and
+ * scored like the max-turns rule (see step). The first piece is placed at the
+ * origin, so with the default radius this only happens to a hive that has
+ * crawled a long way from it.
+ *
+ * The masks of legal actions are kept up to date by step and reset, so each
+ * game's move generation runs once per ply.
+ */
+class VecGame {
+public:
+    static constexpr int NUM_TILES = static_cast<int>(TILE_IDX_MAP.size());
+    static constexpr int PASS = -1;  // action of a game with no legal action
+
+    /**
+     * n games of Game(max_turns, simplified_game). With auto_reset a game is
+     * restarted as soon as it ends; otherwise it keeps its final position
+     * until reset.
+     */
+    VecGame(int n, int max_turns = 50, bool simplified_game = false, int radius = 12, bool auto_reset = true);
+
+    // ============= Shape =============
+
+    int size() const { return static_cast<int>(games_.size()); }
+    int radius() const { return radius_; }
+    int numCells() const { return width_ * width_; }
+    int numActions() const { return numCells() * NUM_TILES; }
+
+    /**
+     * Flat index of an action, or -1 if its cell is outside the window.
+     */
+    int actionIndex(const Action& action) const;
+
+    /**
+     * Action of a flat index in [0, numActions()).
+     */
+    Action actionAt(int index) const;
+
+    // ============= Stepping =============
+
+    /**
+     * Legal-action masks, numActions() bytes per game (1 = legal). All zero
+     * for a game with no legal action, which must pass, and for a finished
+     * game waiting for reset.
+     */
+    const std::vector<std::uint8_t>& legalMasks() const { return masks_; }
+
+    /**
+     * Set entries of game i's mask row, in getLegalActions() order.
+     */
+    const std::vector<int>& legalIndices(int i) const { return mask_indices_.at(i); }
+
+    /**
+     * Plays actions[i] in game i: a legal flat index, or PASS for a game
+     * whose mask is empty (finished games ignore their action). Every action
+     * is checked before any game is changed; throws std::invalid_argument on
+     * an illegal one.
+     *
+     * Returns per game -1 if it is still running, or the result of the game
+     * this step ended: 1 or 2 for the winner, 0 for a draw. A game ends when
+     * a queen is surrounded, at the max-turns limit (checkGameOver) or when
+     * every legal action is outside the window (scored by surroundWinner).
+     */
+    std::vector<int> step(const std::vector<int>& actions);
+
+    /**
+     * Restarts every game / game i. Results are kept.
+     */
+    void reset();
+    void reset(int i);
+
+    // ============= State Access =============
+
+    /**
+     * Finished games per game: {player 1 wins, player 2 wins, draws}.
+     */
+    const std::vector<std::array<long, 3>>& results() const { return results_; }
+
+    const Game& game(int i) const { return games_.at(i); }
+    bool finished(int i) const { return finished_.at(i); }
+
+private:
+    int max_turns_;
+    bool simplified_game_;
+    int radius_;
+    int width_;
+    bool auto_reset_;
+
+    std::vector<Game> games_;
+    std::vector<std::uint8_t> masks_;              // size() * numActions()
+    std::vector<std::vector<int>> mask_indices_;   // set entries of each game's mask row
+    std::vector<std::uint8_t> has_legal_;          // any legal action, in the window or not
+    std::vector<std::uint8_t> finished_;
+    std::vector<std::array<long, 3>> results_;
+
+    // Regenerates game i's legal actions and rewrites its mask row
+    void refresh(int i);
+    // Records a finished game and restarts it (auto_reset) or freezes it
+    void finish(int i, int winner);
+};
@@ -1,14 +1,36 @@
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
 #include <pybind11/operators.h>
+#include <pybind11/numpy.h>
 
 #include "Game.h"
+#include "Heuristic.h"
+#include "Search.h"
+#include "VecGame.h"
 #include "Position.h"
 #include "Pieces.h"
 
+#include <cstring>
+
 namespace py = pybind11;
 
-PYBIND11_MODULE(hive_engine, m) {
+// Read-only NumPy view of memory owned by a Game; `owner` (the Python Game)
+// is kept alive by the view. Strides are in bytes.
+template <typename T>
+static py::array readonlyView(py::handle owner, std::vector<py::ssize_t> shape,
+                              std::vector<py::ssize_t> strides, const T* data) {
+    py::array_t<T> view(std::move(shape), std::move(strides), data, owner);
+    view.attr("setflags")(py::arg("write") = false);
+    return view;
+}
+
+// Every Game method that does real work releases the GIL, so separate Game
+// instances can be driven from separate threads in parallel. The engine has no
+// global mutable state, which also makes the module safe to load without the
+// GIL on free-threaded CPython builds. As with NumPy arrays, a single Game is
+// not synchronised: concurrent const queries are fine, but a mutation must not
+// overlap any other call on the same Game (one mutating thread per Game).
+PYBIND11_MODULE(hive_engine, m, py::mod_gil_not_used()) {
     m.doc() = "HIVE game engine — C++ backend exposed via pybind11";
 
     // ── Position ──────────────────────────────────────────────────────────
@@ -62,34 +84,213 @@ PYBIND11_MODULE(hive_engine, m) {
                    ", " + std::to_string(a.to.r) + "))";
         });
 
+    // ── HeuristicParams ───────────────────────────────────────────────────
+    py::class_<HeuristicParams>(m, "HeuristicParams")
+        .def(py::init([](double queen_surrounding_reward, double ownership_reward,
+                         double win_reward, double mp_reward) {
+                 return HeuristicParams{queen_surrounding_reward, ownership_reward, win_reward, mp_reward};
+             }),
+             py::arg("queen_surrounding_reward") = 1.0, py::arg("ownership_reward") = 3.0,
+             py::arg("win_reward") = 100.0, py::arg("mp_reward") = 0.5)
+        .def_readwrite("queen_surrounding_reward", &HeuristicParams::queen_surrounding_reward)
+        .def_readwrite("ownership_reward",         &HeuristicParams::ownership_reward)
+        .def_readwrite("win_reward",               &HeuristicParams::win_reward)
+        .def_readwrite("mp_reward",                &HeuristicParams::mp_reward)
+        .def("__repr__", [](const HeuristicParams& p) {
+            return "HeuristicParams(queen_surrounding_reward=" + std::to_string(p.queen_surrounding_reward) +
+                   ", ownership_reward=" + std::to_string(p.ownership_reward) +
+                   ", win_reward=" + std::to_string(p.win_reward) +
+                   ", mp_reward=" + std::to_string(p.mp_reward) + ")";
+        });
+
+    // ── SearchParams / SearchResult ───────────────────────────────────────
+    py::class_<SearchParams>(m, "SearchParams")
+        .def(py::init<>())
+        .def_readwrite("depth",               &SearchParams::depth)
+        .def_readwrite("beam_width",          &SearchParams::beam_width)
+        .def_readwrite("heuristic",           &SearchParams::heuristic)
+        .def_readwrite("tt_size",             &SearchParams::tt_size)
+        .def_readwrite("pvs",                 &SearchParams::pvs)
+        .def_readwrite("aspiration_window",   &SearchParams::aspiration_window)
+        .def_readwrite("lmr",                 &SearchParams::lmr)
+        .def_readwrite("lmr_min_moves",       &SearchParams::lmr_min_moves)
+        .def_readwrite("lmr_min_depth",       &SearchParams::lmr_min_depth)
+        .def_readwrite("lmr_reduction",       &SearchParams::lmr_reduction)
+        .def_readwrite("futility_margin",     &SearchParams::futility_margin)
+        .def_readwrite("futility_depth",      &SearchParams::futility_depth)
+        .def_readwrite("null_move",           &SearchParams::null_move)
+        .def_readwrite("null_move_reduction", &SearchParams::null_move_reduction)
+        .def_readwrite("null_move_min_depth", &SearchParams::null_move_min_depth)
+        .def_readwrite("adaptive_beam",       &SearchParams::adaptive_beam)
+        .def_readwrite("beam_min",            &SearchParams::beam_min)
+        .def_readwrite("beam_max",            &SearchParams::beam_max)
+        .def_readwrite("beam_epsilon",        &SearchParams::beam_epsilon)
+        .def_readwrite("full_width_below",    &SearchParams::full_width_below);
+
+    py::class_<SearchResult>(m, "SearchResult")
+        .def_readonly("action",             &SearchResult::action)
+        .def_readonly("score",              &SearchResult::score)
+        .def_readonly("depth",              &SearchResult::depth)
+        .def_readonly("nodes",              &SearchResult::nodes)
+        .def_readonly("leaf_evals",         &SearchResult::leaf_evals)
+        .def_readonly("cutoffs",            &SearchResult::cutoffs)
+        .def_readonly("first_move_cutoffs", &SearchResult::first_move_cutoffs)
+        .def_readonly("depth_nodes",        &SearchResult::depth_nodes)
+        .def_readonly("iteration_nodes",    &SearchResult::iteration_nodes)
+        .def_readonly("beam_widths",        &SearchResult::beam_widths)
+        .def_readonly("tt_probes",          &SearchResult::tt_probes)
+        .def_readonly("tt_hits",            &SearchResult::tt_hits)
+        .def_readonly("lmr_reductions",     &SearchResult::lmr_reductions)
+        .def_readonly("lmr_researches",     &SearchResult::lmr_researches)
+        .def_readonly("futility_prunes",    &SearchResult::futility_prunes)
+        .def_readonly("null_move_tries",    &SearchResult::null_move_tries)
+        .def_readonly("null_move_cutoffs",  &SearchResult::null_move_cutoffs)
+        .def_readonly("elapsed_s",          &SearchResult::elapsed_s);
+
     // ── Game ──────────────────────────────────────────────────────────────
     py::class_<Game>(m, "Game")
         .def(py::init<int, bool>(),
              py::arg("max_turns") = -1,
              py::arg("simplified_game") = false)
 
+        // Copying: a native copy of the whole state, and pickling via toBytes()
+        .def("clone", [](const Game& game) { return Game(game); },
+             "Returns an independent copy of the game.")
+        .def("__copy__", [](const Game& game) { return Game(game); })
+        .def("__deepcopy__", [](const Game& game, py::dict) { return Game(game); }, py::arg("memo"))
+        .def("to_bytes", [](const Game& game) { return py::bytes(game.toBytes()); },
+             "Compact encoding of the position (9 bytes + 6 per piece on the board).")
+        .def_static("from_bytes", [](const py::bytes& data) { return Game::fromBytes(std::string(data)); },
+                    py::arg("data"),
+                    "Rebuilds a game from to_bytes(); raises ValueError on malformed input.")
+        .def(py::pickle(
+            [](const Game& game) { return py::bytes(game.toBytes()); },
+            [](const py::bytes& data) { return Game::fromBytes(std::string(data)); }))
+
         // Queries
         .def("get_valid_placements", &Game::getValidPlacements,
-             py::arg("insect"),
+             py::arg("insect"), py::call_guard<py::gil_scoped_release>(),
              "Returns valid placement positions for the current player and insect type.")
         .def("get_valid_moves", &Game::getValidMoves,
-             py::arg("position"),
+             py::arg("position"), py::call_guard<py::gil_scoped_release>(),
              "Returns valid move destinations for the top tile at position.")
         .def("get_legal_actions", &Game::getLegalActions,
+             py::call_guard<py::gil_scoped_release>(),
              "Returns all legal actions for the current player.")
         .def("check_game_over", &Game::checkGameOver,
+             py::call_guard<py::gil_scoped_release>(),
              "Returns 0 (ongoing), 1 (player 1 wins), or 2 (player 2 wins).")
+        .def("is_over", &Game::isOver,
+             py::call_guard<py::gil_scoped_release>(),
+             "Whether the game has ended (a queen surrounded or max turns reached), including a draw.")
         .def("get_current_player", &Game::getCurrentPlayer,
              "Returns the current player (1 or 2).")
+        .def("get_hash", &Game::getHash,
+             "Returns the Zobrist hash of the position (pieces, stack levels and turn counters).")
 
         // Mutations
         .def("apply_action", &Game::apply_action,
-             py::arg("action"),
+             py::arg("action"), py::call_guard<py::gil_scoped_release>(),
              "Applies action; returns original Position if movement, None if placement.")
         .def("undo", &Game::undo,
-             py::arg("action"), py::arg("original_pos"),
+             py::arg("action"), py::arg("original_pos"), py::call_guard<py::gil_scoped_release>(),
              "Undoes a previously applied action.")
 
+        // Plain-int action API: no Action / Position objects are created
+        .def("legal_actions_array", [](const Game& game) {
+                 std::vector<Action> actions;
+                 {
+                     py::gil_scoped_release release;
+                     actions = game.getLegalActions();
+                 }
+                 py::array_t<std::int32_t> out({static_cast<py::ssize_t>(actions.size()), py::ssize_t{3}});
+                 auto view = out.mutable_unchecked<2>();
+                 for (py::ssize_t i = 0; i < static_cast<py::ssize_t>(actions.size()); ++i) {
+                     view(i, 0) = actions[i].tile_idx;
+                     view(i, 1) = actions[i].to.q;
+                     view(i, 2) = actions[i].to.r;
+                 }
+                 return out;
+             },
+             "Returns all legal actions as an int32 array of shape (N, 3): [tile_idx, q, r] per row, "
+             "in get_legal_actions() order.")
+        .def("apply_action_idx", [](Game& game, int tile_idx, int q, int r) -> std::optional<std::pair<int, int>> {
+                 if (tile_idx < 0 || tile_idx >= static_cast<int>(TILE_IDX_MAP.size()))
+                     throw std::out_of_range("tile_idx must be in 0-10");
+                 auto original = game.apply_action(Action{tile_idx, Position{q, r}});
+                 if (!original) return std::nullopt;
+                 return std::make_pair(original->q, original->r);
+             },
+             py::arg("tile_idx"), py::arg("q"), py::arg("r"), py::call_guard<py::gil_scoped_release>(),
+             "apply_action taking plain ints; returns the original (q, r) if movement, None if placement.")
+        .def("undo_idx", [](Game& game, int tile_idx, int q, int r, std::optional<std::pair<int, int>> original) {
+                 if (tile_idx < 0 || tile_idx >= static_cast<int>(TILE_IDX_MAP.size()))
+                     throw std::out_of_range("tile_idx must be in 0-10");
+                 std::optional<Position> original_pos;
+                 if (original) original_pos = Position{original->first, original->second};
+                 game.undo(Action{tile_idx, Position{q, r}}, original_pos);
+             },
+             py::arg("tile_idx"), py::arg("q"), py::arg("r"), py::arg("original"),
+             py::call_guard<py::gil_scoped_release>(),
+             "Undoes apply_action_idx(tile_idx, q, r); original is the value it returned.")
+        .def("pass_turn", &Game::pass_turn, py::call_guard<py::gil_scoped_release>(),
+             "Passes the turn without moving (for null-move search); revert with undo_pass.")
+        .def("undo_pass", &Game::undo_pass, py::call_guard<py::gil_scoped_release>(),
+             "Reverts the most recent pass_turn.")
+
+        // Playouts
+        .def("playouts", [](const Game& game, int n, int max_plies, std::uint64_t seed) {
+                 std::vector<std::array<int, 2>> results;
+                 {
+                     py::gil_scoped_release release;
+                     results = game.playouts(n, max_plies, seed);
+                 }
+                 py::array_t<std::int32_t> out({static_cast<py::ssize_t>(results.size()), py::ssize_t{2}});
+                 auto view = out.mutable_unchecked<2>();
+                 for (py::ssize_t i = 0; i < static_cast<py::ssize_t>(results.size()); ++i) {
+                     view(i, 0) = results[i][0];
+                     view(i, 1) = results[i][1];
+                 }
+                 return out;
+             },
+             py::arg("n"), py::arg("max_plies") = 200, py::arg("seed") = 0,
+             "Plays n random games from this position natively (the GIL is released) and "
+             "returns an int32 array of shape (n, 2): [winner (0 = draw), plies] per game. "
+             "Games unfinished after max_plies are scored by pieces around each queen.")
+
+        // Heuristic
+        .def("evaluate", [](const Game& game, const HeuristicParams& params, int player) {
+                 return Heuristic::evaluate(game, player, params);
+             },
+             py::arg("params"), py::arg("player"), py::call_guard<py::gil_scoped_release>(),
+             "Heuristic score of the position from player's perspective (the minimax evaluation).")
+        .def("score_children", [](Game& game, const HeuristicParams& params, int player) {
+                 std::vector<std::pair<Action, double>> scored;
+                 {
+                     py::gil_scoped_release release;
+                     scored = Heuristic::scoreChildren(game, player, params);
+                 }
+                 std::vector<Action> actions;
+                 actions.reserve(scored.size());
+                 py::array_t<double> scores(static_cast<py::ssize_t>(scored.size()));
+                 auto view = scores.mutable_unchecked<1>();
+                 for (py::ssize_t i = 0; i < static_cast<py::ssize_t>(scored.size()); ++i) {
+                     actions.push_back(scored[i].first);
+                     view(i) = scored[i].second;
+                 }
+                 return py::make_tuple(actions, scores);
+             },
+             py::arg("params"), py::arg("player"),
+             "Applies, evaluates (for player) and undoes every legal action natively. Returns "
+             "(list[Action], float64 array of scores); the game is left unchanged.")
+
+        .def("search", &Search::search,
+             py::arg("params"), py::arg("time_budget_ms") = py::none(), py::arg("node_budget") = py::none(),
+             py::call_guard<py::gil_scoped_release>(),
+             "Beam-search negamax for the side to move (the native MinimaxAgentPy search). "
+             "With a time or node budget, params.depth is the maximum iterative-deepening depth. "
+             "Returns a SearchResult; the game is left unchanged.")
+
         // State access
         .def("get_tile_positions", &Game::getTilePositions,
              py::return_value_policy::reference_internal,
@@ -102,5 +303,168 @@ PYBIND11_MODULE(hive_engine, m) {
              "Returns [p1_queen_pos, p2_queen_pos], each Optional[Position].")
         .def("get_player_turns", &Game::getPlayerTurns,
              py::return_value_policy::reference_internal,
-             "Returns [p1_turns, p2_turns] — moves made by each player so far.");
+             "Returns [p1_turns, p2_turns] — moves made by each player so far.")
+
+        // Array views: read-only NumPy arrays over the engine's own piece table
+        // and hand counts (no copy). They track the game as it changes.
+        .def("piece_locations", [](py::object self) {
+                 const auto& table = self.cast<const Game&>().getPieceTable();
+                 constexpr py::ssize_t e = sizeof(std::int16_t);
+                 return readonlyView(self, {2, 11, 3}, {11 * 4 * e, 4 * e, e}, &table[0][0][0]);
+             },
+             "int16 view of shape (2, 11, 3): [q, r, level] per [player - 1, tile_idx]; "
+             "level is -1 for a piece in hand.")
+        .def("stack_heights", [](py::object self) {
+                 const auto& table = self.cast<const Game&>().getPieceTable();
+                 constexpr py::ssize_t e = sizeof(std::int16_t);
+                 return readonlyView(self, {2, 11}, {11 * 4 * e, 4 * e}, &table[0][0][3]);
+             },
+             "int16 view of shape (2, 11): height of the stack each piece is in (0 in hand); "
+             "a piece is on top when level == height - 1.")
+        .def("queen_cells", [](py::object self) {
+                 const auto& table = self.cast<const Game&>().getPieceTable();
+                 constexpr py::ssize_t e = sizeof(std::int16_t);
+                 return readonlyView(self, {2, 3}, {11 * 4 * e, e}, &table[0][0][0]);
+             },
+             "int16 view of shape (2, 3): [q, r, level] of each player's queen, level -1 if unplaced.")
+        .def("hand_counts", [](py::object self) {
+                 const auto& counts = self.cast<const Game&>().getHandCounts();
+                 return readonlyView(self, {2, 5}, {5, 1}, &counts[0][0]);
+             },
+             "int8 view of shape (2, 5): pieces in hand per [player - 1, Insect].");
+
+    // ── VecGame ───────────────────────────────────────────────────────────
+    // Batched stepping: every call covers all n games and runs without the GIL;
+    // results come back as NumPy arrays.
+    py::class_<VecGame>(m, "VecGame")
+        .def(py::init<int, int, bool, int, bool>(),
+             py::arg("n"),
+             py::arg("max_turns") = 50,
+             py::arg("simplified_game") = false,
+             py::arg("radius") = 12,
+             py::arg("auto_reset") = true,
+             "n games stepped together. Actions are flat indices cell * 11 + tile_idx over the "
+             "cells |q|, |r| <= radius, cell = (r + radius) * (2 * radius + 1) + (q + radius).")
+        .def("__len__", &VecGame::size)
+        .def_property_readonly("radius", &VecGame::radius)
+        .def_property_readonly("num_cells", &VecGame::numCells)
+        .def_property_readonly("num_actions", &VecGame::numActions)
+        .def_readonly_static("PASS", &VecGame::PASS)
+
+        .def("action_index", [](const VecGame& vec, int tile_idx, int q, int r) {
+                 if (tile_idx < 0 || tile_idx >= VecGame::NUM_TILES)
+                     throw std::out_of_range("tile_idx must be in 0-10");
+                 return vec.actionIndex(Action{tile_idx, Position{q, r}});
+             },
+             py::arg("tile_idx"), py::arg("q"), py::arg("r"),
+             "Flat index of the action, or -1 if (q, r) is outside the window.")
+        .def("action_at", [](const VecGame& vec, int index) {
+                 if (index < 0 || index >= vec.numActions())
+                     throw std::out_of_range("action index out of range");
+                 Action action = vec.actionAt(index);
+                 return std::make_tuple(action.tile_idx, action.to.q, action.to.r);
+             },
+             py::arg("index"),
+             "(tile_idx, q, r) of a flat action index.")
+
+        .def("legal_masks", [](const VecGame& vec) {
+                 py::array_t<bool> out({static_cast<py::ssize_t>(vec.size()),
+                                        static_cast<py::ssize_t>(vec.numCells()),
+                                        static_cast<py::ssize_t>(VecGame::NUM_TILES)});
+                 bool* dst = out.mutable_data();
+                 const auto& masks = vec.legalMasks();
+                 {
+                     py::gil_scoped_release release;
+                     std::memcpy(dst, masks.data(), masks.size());
+                 }
+                 return out;
+             },
+             "bool array of shape (n, num_cells, 11), a copy; reshape(n, -1) gives the flat-index "
+             "mask. An all-False row means the game must pass (VecGame.PASS).")
+        .def("legal_indices", [](const VecGame& vec) {
+                 py::array_t<std::int64_t> offsets(static_cast<py::ssize_t>(vec.size()) + 1);
+                 auto off = offsets.mutable_unchecked<1>();
+                 off(0) = 0;
+                 for (int i = 0; i < vec.size(); ++i)
+                     off(i + 1) = off(i) + static_cast<std::int64_t>(vec.legalIndices(i).size());
+                 py::array_t<std::int32_t> indices(static_cast<py::ssize_t>(off(vec.size())));
+                 std::int32_t* dst = indices.mutable_data();
+                 for (int i = 0; i < vec.size(); ++i) {
+                     const auto& row = vec.legalIndices(i);
+                     std::copy(row.begin(), row.end(), dst + off(i));
+                 }
+                 return py::make_tuple(indices, offsets);
+             },
+             "Sparse form of legal_masks(): (indices, offsets), where indices[offsets[i]:offsets[i + 1]] "
+             "are game i's legal flat actions (int32) and offsets is int64 of shape (n + 1,).")
+        .def("step", [](VecGame& vec, py::object actions_in) {
+                 // Integer dtypes only, widened without wrapping (numpy refuses uint64 -> int64 as unsafe)
+                 py::array given = py::array::ensure(actions_in);
+                 if (!given || (given.dtype().kind() != 'i' && given.dtype().kind() != 'u'))
+                     throw py::type_error("actions must be an integer array");
+                 py::array_t<std::int64_t> actions = given.attr("astype")("int64", py::arg("casting") = "safe");
+                 if (actions.ndim() != 1 || actions.shape(0) != vec.size())
+                     throw std::invalid_argument("actions must have shape (" + std::to_string(vec.size()) + ",)");
+                 auto view = actions.unchecked<1>();
+                 std::vector<int> flat(static_cast<std::size_t>(vec.size()));
+                 for (py::ssize_t i = 0; i < view.shape(0); ++i) {
+                     std::int64_t a = view(i);
+                     if (a != VecGame::PASS && (a < 0 || a >= vec.numActions()))
+                         throw std::out_of_range("game " + std::to_string(i) + ": action " + std::to_string(a)
+                                                 + " is outside [0, num_actions) and not VecGame.PASS");
+                     flat[i] = static_cast<int>(a);
+                 }
+                 std::vector<int> outcomes;
+                 {
+                     py::gil_scoped_release release;
+                     outcomes = vec.step(flat);
+                 }
+                 auto n = static_cast<py::ssize_t>(outcomes.size());
+                 py::array_t<bool> done(n);
+                 py::array_t<std::int8_t> winners(n);
+                 auto d = done.mutable_unchecked<1>();
+                 auto w = winners.mutable_unchecked<1>();
+                 for (py::ssize_t i = 0; i < n; ++i) {
+                     d(i) = outcomes[i] >= 0;
+                     w(i) = static_cast<std::int8_t>(std::max(outcomes[i], 0));
+                 }
+                 return py::make_tuple(done, winners);
+             },
+             py::arg("actions"),
+             "Plays one flat action per game (VecGame.PASS where the mask is empty; finished games "
+             "ignore theirs). Raises IndexError for a value outside [0, num_actions) and ValueError for an "
+             "illegal action, in either case changing nothing. Returns "
+             "(done, winner): bool and int8 arrays of shape (n,), winner 1 / 2 or 0 for a draw where "
+             "done. With auto_reset, games that ended are already restarted.")
+        .def("results", [](const VecGame& vec) {
+                 const auto& results = vec.results();
+                 py::array_t<std::int64_t> out({static_cast<py::ssize_t>(results.size()), py::ssize_t{3}});
+                 auto view = out.mutable_unchecked<2>();
+                 for (py::ssize_t i = 0; i < static_cast<py::ssize_t>(results.size()); ++i)
+                     for (py::ssize_t j = 0; j < 3; ++j) view(i, j) = results[i][j];
+                 return out;
+             },
+             "int64 array of shape (n, 3): [player 1 wins, player 2 wins, draws] over the games "
+             "each slot has finished.")
+        .def("reset", [](VecGame& vec, std::optional<int> i) {
+                 if (!i) return vec.reset();
+                 if (*i < 0 || *i >= vec.size()) throw std::out_of_range("game index out of range");
+                 vec.reset(*i);
+             },
+             py::arg("i") = py::none(), py::call_guard<py::gil_scoped_release>(),
+             "Restarts game i, or every game; results are kept.")
+        .def("current_players", [](const VecGame& vec) {
+                 py::array_t<std::int8_t> out(vec.size());
+                 auto view = out.mutable_unchecked<1>();
+                 for (int i = 0; i < vec.size(); ++i)
+                     view(i) = static_cast<std::int8_t>(vec.game(i).getCurrentPlayer());
+                 return out;
+             },
+             "int8 array of shape (n,): the player to move in each game.")
+        .def("game", [](const VecGame& vec, int i) {
+                 if (i < 0 || i >= vec.size()) throw std::out_of_range("game index out of range");
+                 return Game(vec.game(i));
+             },
+             py::arg("i"),
+             "Returns a copy of game i.");
 }
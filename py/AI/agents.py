@@ -1,10 +1,11 @@
 import random
 import copy
+from time import perf_counter
 from abc import ABC, abstractmethod
 
 from .DQL import DQN, get_graph_from_state
-from game import HiveBoard, ACTIONSPACE_INV
-from .minimax import minimax, beam_minimax, Params
+from game import HiveBoard, ACTIONSPACE_INV, perf
+from .minimax import minimax, beam_minimax, parallel_beam_minimax, iterative_deepening, principal_variation, principal_line, follow_line, Params, TranspositionTable, MoveOrdering, EvalCache, SearchStats, ProofTable, prove_win, queen_neighbours
 
 import torch
 
@@ -74,11 +75,49 @@ class RandomAgent(Agent):
 
 
 class HeuristicAgent(Agent):
-    def __init__(self, player: int, depth: int, params: Params, board=None):
+    def __init__(self, player: int, depth: int, params: Params, board=None,
+                 tt_size: int = 2**16, time_budget: float = None, node_budget: int = None,
+                 workers: int = None, eval_cache_size: int = 2**16, quiescence_nodes: int = 0,
+                 beam_width=3, reuse_tree: bool = True, proof_nodes: int = 0, proof_plies: int = 5,
+                 proof_min_neighbours: int = 4):
         self.player = player
         self.board = board
         self.eval_params = params
-        self.depth = depth
+        self.depth = depth # maximum depth when searching with a budget
+        self.beam_width = beam_width # moves searched per node, or an AdaptiveBeam
+        self.tt_size = tt_size # transposition table slots, 0 disables the table
+        self.tt = None
+        self.ordering = None
+
+        # keep the transposition table between moves, so the subtree under the move
+        # played starts the next search warm, and the expected line in pv
+        self.reuse_tree = reuse_tree
+        self.pv = [] # (move, position hash after it) from the last search
+
+        # df-pn pre-check for a forced win once the opponent's queen has proof_min_neighbours
+        # neighbours, searching proof_plies ahead in at most proof_nodes positions (0 disables it)
+        self.proof_nodes = proof_nodes
+        self.proof_plies = proof_plies
+        self.proof_min_neighbours = proof_min_neighbours
+        self.proof_table = ProofTable() if proof_nodes else None
+
+        # leaf evaluations are kept across moves, 0 disables the cache
+        self.eval_cache = EvalCache(eval_cache_size) if eval_cache_size else None
+
+        # per-move limits (seconds / nodes) - if either is set the agent deepens
+        # iteratively and plays the best move of the last completed depth
+        self.time_budget = time_budget
+        self.node_budget = node_budget
+        self.depth_reached = None
+
+        # number of processes to split the root candidates over, None/1 searches in process
+        self.workers = workers
+
+        # positions searched past each leaf while a queen is under pressure, 0 disables quiescence
+        self.quiescence_nodes = quiescence_nodes
+
+        # statistics of the last search
+        self.stats = None
     
     def set_board(self, board: HiveBoard):
         self.board = board
@@ -88,9 +127,61 @@ class HeuristicAgent(Agent):
         Get possible actions from board and evaluate each action using
         minimax with alpha beta pruning. Returns best action.
         """
+        if perf.enabled: # engine counters are reported per search
+            perf.counters.reset()
+
         board = copy.deepcopy(self.board)
         state = self.board.get_game_state(self.player) 
-        max_eval, best_move = beam_minimax(board, self.depth, True, self.player, self.eval_params, float('-inf'), float('inf'))
+        self.ordering = MoveOrdering()
+        if self.eval_cache is not None:
+            self.eval_cache.reset_stats()
+        self.stats = SearchStats()
+        if self.reuse_tree and self.tt is not None:
+            self.tt.new_search() # earlier entries are kept but replaced first
+            self.stats.pv_hit = follow_line(board, self.tt, self.pv)
+            entry = self.tt.peek(board.position_hash())
+            self.stats.reused_depth = entry.depth if entry is not None else 0
+        else:
+            self.tt = TranspositionTable(self.tt_size) if self.tt_size else None
+        proof_move = self.prove_win(board)
+        if proof_move is not None: # forced win, no need to search
+            best_move, self.depth_reached = proof_move, self.proof_plies
+        elif self.time_budget or self.node_budget:
+            if self.tt is None:
+                self.tt = TranspositionTable() # carries the principal variation between iterations
+            self.stats.start(self.tt, self.eval_cache)
+            max_eval, best_move, self.depth_reached = iterative_deepening(
+                board, self.depth, self.player, self.eval_params, beam_width=self.beam_width, tt=self.tt,
+                time_budget=self.time_budget, node_budget=self.node_budget, ordering=self.ordering,
+                eval_cache=self.eval_cache, quiescence_nodes=self.quiescence_nodes, stats=self.stats)
+        elif self.workers and self.workers > 1:
+            self.stats.start()
+            max_eval, best_move = parallel_beam_minimax(board, self.depth, self.player, self.eval_params,
+                                                        beam_width=self.beam_width, processes=self.workers, tt_size=self.tt_size,
+                                                        quiescence_nodes=self.quiescence_nodes, stats=self.stats)
+            self.depth_reached = self.depth
+        else:
+            self.stats.start(self.tt, self.eval_cache)
+            max_eval, best_move = beam_minimax(board, self.depth, True, self.player, self.eval_params,
+                                               float('-inf'), float('inf'), beam_width=self.beam_width,
+                                               tt=self.tt, ordering=self.ordering,
+                                               eval_cache=self.eval_cache, quiescence_nodes=self.quiescence_nodes,
+                                               stats=self.stats)
+            self.depth_reached = self.depth
+        self.stats.stop()
+        if self.reuse_tree and self.tt is not None and proof_move is None:
+            self.pv = principal_line(self.board, self.tt, self.depth_reached or 0)
+
+        if perf.enabled:
+            print(perf.counters.summary(f'Search counters (player {self.player})'))
+            print(self.stats.summary())
+            print(self.ordering.summary())
+            if self.eval_cache is not None:
+                print(self.eval_cache.summary())
+            if self.tt is not None:
+                print(self.tt.summary())
+                print(f'Depth {self.depth_reached}, PV: {principal_variation(self.board, self.tt, self.depth_reached or 0)}')
+
         if best_move:
             pos, tile_idx = best_move
             piece_id = ACTIONSPACE_INV[tile_idx]
@@ -112,6 +203,21 @@ class HeuristicAgent(Agent):
         return best_move
 
 
+    def prove_win(self, board):
+        """
+        Runs the df-pn solver if the opponent's queen has at least proof_min_neighbours
+        neighbours. Returns the first move of a forced win, or None
+        """
+        if not self.proof_nodes or queen_neighbours(board, 3 - self.player) < self.proof_min_neighbours:
+            return None
+        t0 = perf_counter()
+        proof = prove_win(board, self.proof_plies, self.proof_nodes, self.proof_table)
+        self.stats.proof_nodes = proof.nodes
+        self.stats.proof_time = perf_counter() - t0
+        self.stats.proven_win = proof.proven()
+        return proof.move
+
+
 class DQLAgent(Agent):
     def __init__(self, player: int, q_network: DQN, epsilon: float, 
                  board=None, reduced=False):
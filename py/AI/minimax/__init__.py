@@ -1,2 +1,9 @@
-from .minimax import minimax, beam_minimax
-from .heuristic import Params
\ No newline at end of file
+from .minimax import (negamax, minimax, beam_minimax, parallel_beam_minimax, iterative_deepening, principal_variation,
+                      principal_line, follow_line, quiescence, queen_pressure_moves, SearchBudget, SearchTimeout, close_pool)
+from .heuristic import Params
+from .transposition import TranspositionTable
+from .ordering import MoveOrdering
+from .eval_cache import EvalCache
+from .stats import SearchStats
+from .beam import AdaptiveBeam
+from .proof import prove_win, queen_neighbours, ProofTable, ProofResult
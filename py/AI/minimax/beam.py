@@ -0,0 +1,32 @@
+"""
+Adaptive beam width for beam search.
+
+A fixed beam keeps the same number of moves everywhere, which wastes time in
+the opening (many near-identical placements) and drops critical replies in
+the endgame. An AdaptiveBeam can be passed anywhere a beam_width is accepted
+and picks the width at each node from:
+    - the number of legal moves: small nodes are searched in full
+    - the score gap: moves within epsilon of the best candidate are kept
+    - the remaining budget: the upper limit shrinks as time/nodes run out
+"""
+from dataclasses import dataclass
+
+
+@dataclass
+class AdaptiveBeam:
+    min_width: int = 2
+    max_width: int = 6
+    epsilon: float = 0.25 # keep moves scoring within epsilon of the best
+    full_width_below: int = 6 # nodes with at most this many legal moves are searched in full
+
+    def width(self, scores, remaining=1.0):
+        """
+        Beam width for a node. scores are the candidates' scores from the
+        perspective of the player to move, best first; remaining is the
+        fraction of the search budget left (1.0 without a budget).
+        """
+        if len(scores) <= self.full_width_below:
+            return len(scores)
+        upper = max(self.min_width, round(self.max_width * min(remaining * 2, 1.0))) # shrinks in the second half
+        within = sum(1 for score in scores if score >= scores[0] - self.epsilon)
+        return min(max(within, self.min_width), upper)
@@ -0,0 +1,55 @@
+"""
+Bounded LRU cache of heuristic evaluations.
+
+Keyed by (position hash, player, params fingerprint), so one cache can be
+kept across searches and moves, and shared by agents with different
+evaluation weights, without returning a score computed for other weights.
+"""
+from collections import OrderedDict
+from dataclasses import astuple
+
+
+class EvalCache:
+    def __init__(self, size=2**16):
+        self.size = size
+        self.entries = OrderedDict()
+
+        # statistics
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self.entries.clear()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        """Returns the cached score for key, or None"""
+        score = self.entries.get(key)
+        if score is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return score
+
+    def put(self, key, score):
+        self.entries[key] = score
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False) # evict least recently used
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def summary(self):
+        return (f'Eval cache lookups: {self.hits + self.misses}, hit rate: {100 * self.hit_rate():.1f}%, '
+                f'entries: {len(self.entries)}/{self.size}')
+
+
+def params_fingerprint(params):
+    """Hashable summary of the evaluation weights"""
+    return astuple(params)
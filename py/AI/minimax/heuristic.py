@@ -1,5 +1,7 @@
 from AI.DQL.rl_helper import RewardCalculator
 from dataclasses import dataclass
+from game import HiveBoard
+from .eval_cache import EvalCache, params_fingerprint
 
 
 @dataclass
@@ -8,6 +10,7 @@ class Params:
     ownership_reward: float
     win_reward: float
     mp_reward: float
+    incremental: bool = False # score leaves from the board's maintained features (see incremental_evaluate)
 
 
 def evaluate(state: dict, player: int, params: Params, ran_test=True) -> float:
@@ -44,4 +47,88 @@ def evaluate(state: dict, player: int, params: Params, ran_test=True) -> float:
     net_mp = nmp_self - nmp_opp
     value += net_mp * mp_reward
 
-    return value
\ No newline at end of file
+    return value
+
+
+def cached_evaluate(board: HiveBoard, player: int, params: Params, cache: EvalCache = None) -> float:
+    """
+    evaluate for the current board position, looked up in cache first if given.
+    Uses incremental_evaluate instead if params.incremental is set.
+    """
+    if params.incremental: # cheaper than a cache lookup
+        return incremental_evaluate(board, player, params)
+    if cache is None:
+        return evaluate(board.get_game_state(player), player, params)
+
+    key = (board.position_hash(), player, params_fingerprint(params))
+    value = cache.get(key)
+    if value is None:
+        value = evaluate(board.get_game_state(player), player, params)
+        cache.put(key, value)
+    return value
+
+
+def incremental_evaluate(board: HiveBoard, player: int, params: Params) -> float:
+    """
+    evaluate computed from the features the board maintains as tiles are
+    placed and moved (game/features.py) rather than from a fresh game state.
+    The mobility term uses the features' estimate of mobile pieces plus the
+    pieces in hand, instead of generating legal actions.
+    """
+    features = board.features
+    value = 0
+    opp = 3 - player
+
+    winner = board.game_over()
+    if winner == player:
+        value += params.win_reward
+    elif winner == opp:
+        value -= params.win_reward
+
+    # Queen surrounding and ownership
+    owned = [1, 1] # 0 if the queen is covered by an opposing piece, as RewardCalculator.queen_ownership
+    for p, sign in ((player, -1), (opp, 1)):
+        queen_pos = board.queen_positions[p - 1]
+        if queen_pos is not None:
+            value += sign * features.queen_neighbours(queen_pos) * params.queen_surrounding_reward
+            owned[p - 1] = int(board.tile_positions[queen_pos][-1].player == p)
+    value += (owned[player - 1] - owned[opp - 1]) * params.ownership_reward
+
+    # Mobility estimate
+    hands = (board.player1_hand, board.player2_hand)
+    mobility = [features.mobile_counts[i] + len(hands[i]) for i in range(2)]
+    value += (mobility[player - 1] - mobility[opp - 1]) * params.mp_reward
+
+    return value
+
+
+def quick_evaluate(board: HiveBoard, player: int, params: Params) -> float:
+    """
+    Cheap approximation of evaluate for ordering and beam selection. Reads the
+    board directly instead of building a game state, so no legal actions are
+    generated and nothing is copied. Mobility is replaced by the number of
+    pieces pinned by the one-hive rule.
+    """
+    value = 0
+    opp = 3 - player
+
+    winner = board.game_over()
+    if winner == player:
+        value += params.win_reward
+    elif winner == opp:
+        value -= params.win_reward
+
+    # Queen surrounding and ownership
+    for p, sign in ((player, -1), (opp, 1)):
+        queen_pos = board.queen_positions[p - 1]
+        if queen_pos is None:
+            continue
+        value += sign * board.features.queen_neighbours(queen_pos) * params.queen_surrounding_reward
+        if board.tile_positions[queen_pos][-1].player != p: # queen covered by opposing beetle
+            value += sign * params.ownership_reward
+
+    # Pinned pieces - a pinned piece cannot move
+    for pos in board.pinned_positions():
+        value += (1 if board.tile_positions[pos][-1].player == opp else -1) * params.mp_reward
+
+    return value
@@ -1,155 +1,570 @@
-from .heuristic import evaluate
+from .heuristic import cached_evaluate, quick_evaluate
+from .eval_cache import EvalCache
+from .transposition import TranspositionTable
+from .ordering import MoveOrdering, surrounds_queen, is_adjacent
+from .stats import SearchStats
+from .beam import AdaptiveBeam
 import heapq
-from multiprocessing import Pool
+from time import perf_counter
+from multiprocessing import Pool, Value
 from game import ACTIONSPACE_INV, HiveBoard
 
-states_count = 0
 
-def minimax(board: HiveBoard, depth, is_maximizing, player, eval_params,
-            alpha=-float('inf'), beta=float('inf')):
+class SearchTimeout(Exception):
+    """Raised from inside the search when its time or node budget runs out"""
+
+
+class SearchBudget:
+    """
+    Wall-clock and node limits for a search. check() is called once per node
+    and raises SearchTimeout when either limit is exceeded.
+    """
+    def __init__(self, time_budget=None, node_budget=None):
+        self.time_budget = time_budget
+        self.deadline = perf_counter() + time_budget if time_budget else None
+        self.node_budget = node_budget
+        self.nodes = 0
+
+    def check(self):
+        self.nodes += 1
+        if self.node_budget and self.nodes > self.node_budget:
+            raise SearchTimeout
+        if self.deadline and perf_counter() > self.deadline:
+            raise SearchTimeout
+
+    def remaining(self):
+        """Fraction of the budget left, the smaller of time and nodes"""
+        fraction = 1.0
+        if self.deadline:
+            fraction = min(fraction, (self.deadline - perf_counter()) / self.time_budget)
+        if self.node_budget:
+            fraction = min(fraction, 1 - self.nodes / self.node_budget)
+        return max(fraction, 0.0)
+
+
+NULL_WINDOW = 1e-6 # width of the PVS scout window, well below any difference between evaluations
+QUEEN_PRESSURE = 5 # occupied neighbours at which a queen is under attack, one short of capture
+
+
+def quiescence(board: HiveBoard, player, eval_params, alpha, beta, max_nodes,
+               budget: SearchBudget = None, eval_cache: EvalCache = None, pressure=QUEEN_PRESSURE,
+               stats: SearchStats = None):
+    """
+    Tactical extension at the leaves of negamax. While some queen has at least
+    pressure occupied neighbours, only queen-pressure moves are searched
+    (see queen_pressure_moves) until the position is quiet again; the player
+    to move may also stand pat on the static evaluation. At most max_nodes
+    positions are visited, after which the static evaluation is used.
+
+    Scores are from the perspective of the player to move, as in negamax.
+    """
+    nodes = 0
+
+    def search(alpha, beta):
+        nonlocal nodes
+        if nodes: # the first position is the negamax leaf, already counted
+            if stats is not None:
+                stats.node(0)
+                stats.quiescence_nodes += 1
+            if budget is not None:
+                budget.check()
+        nodes += 1
+
+        sign = 1 if board.get_player_turn() == player else -1
+        stand_pat = sign * evaluate_leaf(board, player, eval_params, eval_cache, stats)
+        if stand_pat >= beta or nodes >= max_nodes or board.game_over():
+            return stand_pat
+
+        best_score = stand_pat
+        alpha = max(alpha, stand_pat)
+        for move in queen_pressure_moves(board, pressure, stats):
+            if nodes >= max_nodes:
+                break
+            og_pos = make_move(board, move)
+            try:
+                score = -search(-beta, -alpha)
+            finally:
+                undo_move(board, move, og_pos)
+            best_score = max(best_score, score)
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+        return best_score
+
+    return search(alpha, beta)
+
+
+def queen_pressure_moves(board: HiveBoard, pressure=QUEEN_PRESSURE, stats: SearchStats = None):
+    """
+    Moves for the player to move that change the surrounding of a queen with
+    at least pressure occupied neighbours: filling a cell next to it, beetles
+    climbing onto it, pieces stepping away from it and the queen moving.
+    Empty if no queen is under pressure, without generating legal actions.
+    """
+    queens = [pos for pos in board.queen_positions
+              if pos is not None and board.features.queen_neighbours(pos) >= pressure]
+    if not queens:
+        return []
+
+    moves = []
+    for move in legal_moves(board, stats):
+        pos, tile_idx = move
+        tile = board.name_obj_mapping[ACTIONSPACE_INV[tile_idx] + '_p' + str(board.get_player_turn())]
+        for queen_pos in queens:
+            if pos == queen_pos or surrounds_queen(board, move, queen_pos):
+                moves.append(move) # attack
+                break
+            if tile.position is not None and not is_adjacent(pos, queen_pos) and (
+                    tile.position == queen_pos
+                    or (is_adjacent(tile.position, queen_pos) and len(board.get_tile_stack(tile.position)) == 1)):
+                moves.append(move) # defence - the queen or one of its neighbours steps away
+                break
+    return moves
+
+
+def evaluate_leaf(board: HiveBoard, player, eval_params, eval_cache: EvalCache = None, stats: SearchStats = None):
+    """cached_evaluate, counted and timed in stats if given"""
+    if stats is None:
+        return cached_evaluate(board, player, eval_params, eval_cache)
+    t0 = perf_counter()
+    value = cached_evaluate(board, player, eval_params, eval_cache)
+    stats.eval_time += perf_counter() - t0
+    stats.leaf_evals += 1
+    return value
+
+
+def legal_moves(board: HiveBoard, stats: SearchStats = None):
+    """Legal moves for the player to move as (pos, tile_idx) tuples, timed in stats if given"""
+    if stats is None:
+        return create_action_list(board.get_legal_actions(board.get_player_turn()))
+    t0 = perf_counter()
+    moves = create_action_list(board.get_legal_actions(board.get_player_turn()))
+    stats.movegen_time += perf_counter() - t0
+    return moves
+
+
+def negamax(board: HiveBoard, depth, player, eval_params, alpha=-float('inf'), beta=float('inf'),
+            beam_width=None, tt: TranspositionTable = None, budget: SearchBudget = None,
+            ordering: MoveOrdering = None, eval_cache: EvalCache = None, pvs=True, quiescence_nodes=0,
+            stats: SearchStats = None):
     """
-    Minimax algorithm with alpha-beta pruning.
+    Negamax search with fail-soft alpha-beta pruning and principal variation
+    search. Shared by minimax and beam_minimax.
+
+    Scores are from the perspective of the player to move; evaluations are
+    computed for player (the root player) and negated on the opponent's turns.
+    After the first move, each move is searched with a null window around alpha
+    to prove it is no better, and only re-searched with the full window if the
+    proof fails. Returned scores may fall outside (alpha, beta) (fail-soft),
+    in which case they are bounds on the true score.
 
     Parameters:
-    state: current game state.
+    board: current game state (HiveBoard).
     depth: how deep we want to search in the game tree.
-    is_maximizing: boolean indicating if it's the maximizing player's turn.
-    alpha: best score the maximizing player can guarantee so far (for pruning).
-    beta: best score the minimizing player can guarantee so far (for pruning).
-    
+    player: the player evaluations are computed for.
+    eval_params: parameters for the evaluation function.
+    alpha, beta: search window, from the perspective of the player to move.
+    beam_width: if given, only the beam_width best moves by quick_evaluate are searched (beam search).
+                An AdaptiveBeam chooses the width at each node instead.
+    tt: optional transposition table shared across the search.
+    budget: optional SearchBudget, SearchTimeout is raised when it runs out.
+    ordering: optional MoveOrdering. Orders moves in full-width search; with a beam
+              the moves are already searched best-evaluation first, so it only
+              records cutoffs (statistics, killers and history).
+    eval_cache: optional EvalCache for leaf evaluations.
+    pvs: use null-window searches after the first move.
+    quiescence_nodes: if non-zero, leaves are extended by a quiescence search of at
+                      most this many positions while a queen is under pressure.
+    stats: optional SearchStats the search adds its counters and phase times to.
+
     Returns:
-    score: The best score the current player can achieve.
+    score: The best score the player to move can achieve.
     best_move: The best move to play from this state (optional).
     """
-    global states_count
-    states_count += 1 
+    if stats is not None:
+        stats.node(depth)
+    if budget is not None:
+        budget.check()
+
+    sign = 1 if board.get_player_turn() == player else -1
 
     # Base case: check if the game is over or depth limit reached
+    if depth == 0 and quiescence_nodes and not board.game_over():
+        return quiescence(board, player, eval_params, alpha, beta, quiescence_nodes, budget, eval_cache,
+                          stats=stats), None
     if board.game_over() or depth == 0:
-        return evaluate(board.get_game_state(player), player, eval_params), None
+        return sign * evaluate_leaf(board, player, eval_params, eval_cache, stats), None
 
-    actions = board.get_legal_actions(board.get_player_turn())
-    valid_moves = create_action_list(actions)
-    best_move = None
+    # Transposition table: return stored result if good enough, else try its move first
+    tt_move = None
+    if tt is not None:
+        key = board.position_hash()
+        alpha_orig, beta_orig = alpha, beta
+        tt_score, tt_move = tt.lookup(key, depth, alpha, beta)
+        if tt_score is not None:
+            return tt_score, tt_move
 
-    if is_maximizing:
-        max_eval = -float('inf')  # Maximizer wants to maximize this
-        for move in valid_moves:
-            og_pos = make_move(board, move) # Apply move
-            eval_, _ = minimax(board, depth - 1, False, player, eval_params, alpha, beta)
-            undo_move(board, move, og_pos)
-            
-            # Update max evaluation and best move
-            if eval_ > max_eval:
-                max_eval = eval_
-                best_move = move
-            
-            alpha = max(alpha, eval_)
-            if beta <= alpha:
-                break  # Beta cutoff
-            
-        return max_eval, best_move
+    valid_moves = legal_moves(board, stats)
+    if not valid_moves:
+        return sign * evaluate_leaf(board, player, eval_params, eval_cache, stats), None
 
+    if beam_width is not None:
+        t0 = perf_counter()
+        moves = [move for _, move in select_beam(board, valid_moves, sign == 1, player, eval_params, beam_width,
+                                                 budget)]
+        if stats is not None:
+            stats.eval_time += perf_counter() - t0
+            stats.beam(len(moves))
+        # The stored best move is searched first, even if it fell outside the beam
+        if tt_move is not None and tt_move in valid_moves:
+            moves = [tt_move] + [move for move in moves if move != tt_move]
+    elif ordering is not None:
+        moves = ordering.order(board, valid_moves, depth, tt_move)
     else:
-        min_eval = float('inf')
-        for move in valid_moves:
-            og_pos = make_move(board, move) # Apply move
-            eval_, _ = minimax(board, depth - 1, True, player, eval_params, alpha, beta)
-            undo_move(board, move, og_pos)
-            
-            # Update min evaluation and best move
-            if eval_ < min_eval:
-                min_eval = eval_
-                best_move = move
-            
-            beta = min(beta, eval_)
-            if beta <= alpha:
-                break  # Alpha cutoff
-        
-        return min_eval, best_move
+        moves = move_to_front(valid_moves, tt_move)
+
+    best_score, best_move = -float('inf'), None
+    for i, move in enumerate(moves):
+        og_pos = make_move(board, move)  # Apply move
+        if i == 0 or not pvs or alpha == -float('inf'):
+            score = -negamax(board, depth - 1, player, eval_params, -beta, -alpha, beam_width,
+                             tt, budget, ordering, eval_cache, pvs, quiescence_nodes, stats)[0]
+        else:
+            # Scout with a null window: only prove the move is no better than alpha
+            score = -negamax(board, depth - 1, player, eval_params, -alpha - NULL_WINDOW, -alpha, beam_width,
+                             tt, budget, ordering, eval_cache, pvs, quiescence_nodes, stats)[0]
+            if alpha < score < beta and (depth > 1 or quiescence_nodes):
+                # proof failed - re-search, the scout score is a lower bound
+                # (static leaf scores are exact, so without quiescence moves at depth 1 never need it)
+                score = -negamax(board, depth - 1, player, eval_params, -beta, -score, beam_width,
+                                 tt, budget, ordering, eval_cache, pvs, quiescence_nodes, stats)[0]
+        undo_move(board, move, og_pos)  # Undo move
+
+        if score > best_score:
+            best_score, best_move = score, move
+        alpha = max(alpha, score)
+        if alpha >= beta:
+            if ordering is not None:
+                ordering.record_cutoff(board, move, depth, i)
+            if stats is not None:
+                stats.cutoff(i)
+            break  # cutoff
+
+    if tt is not None:
+        tt.store(key, depth, best_score, alpha_orig, beta_orig, best_move)
+    return best_score, best_move
+
+
+def minimax(board: HiveBoard, depth, is_maximizing, player, eval_params,
+            alpha=-float('inf'), beta=float('inf'), tt: TranspositionTable = None,
+            budget: SearchBudget = None, ordering: MoveOrdering = None, eval_cache: EvalCache = None,
+            stats: SearchStats = None):
+    """
+    Minimax algorithm with alpha-beta pruning, run as a full-width negamax search.
+
+    Parameters:
+    board: current game state (HiveBoard).
+    depth: how deep we want to search in the game tree.
+    is_maximizing: boolean indicating if it's the maximizing player's turn,
+                   i.e. if player is to move.
+    player: the player scores are given for.
+    alpha: best score the maximizing player can guarantee so far (for pruning).
+    beta: best score the minimizing player can guarantee so far (for pruning).
+    tt: optional transposition table shared across the search.
+    budget: optional SearchBudget, SearchTimeout is raised when it runs out.
+    ordering: optional MoveOrdering (killer/history heuristics) shared across the search,
+              otherwise moves are searched in generation order after the TT move.
+    eval_cache: optional EvalCache for leaf evaluations.
+    stats: optional SearchStats the search adds its counters and phase times to.
+    
+    Returns:
+    score: The best score the current player can achieve.
+    best_move: The best move to play from this state (optional).
+    """
+    if is_maximizing:
+        return negamax(board, depth, player, eval_params, alpha, beta, None, tt, budget, ordering, eval_cache,
+                       stats=stats)
+    score, best_move = negamax(board, depth, player, eval_params, -beta, -alpha, None, tt, budget, ordering,
+                               eval_cache, stats=stats)
+    return -score, best_move
 
 
 def beam_minimax(board: HiveBoard, depth, is_maximizing, player, eval_params,
-                 alpha=-float('inf'), beta=float('inf'), beam_width=3):
+                 alpha=-float('inf'), beta=float('inf'), beam_width=3,
+                 tt: TranspositionTable = None, budget: SearchBudget = None,
+                 ordering: MoveOrdering = None, eval_cache: EvalCache = None, quiescence_nodes=0,
+                 stats: SearchStats = None):
     """
-    Minimax algorithm with alpha-beta pruning and beam search.
+    Minimax algorithm with alpha-beta pruning and beam search, run as a
+    negamax search.
 
     Parameters:
     board: current game state (HiveBoard).
     depth: how deep we want to search in the game tree.
-    is_maximizing: boolean indicating if it's the maximizing player's turn.
-    player: the current player.
+    is_maximizing: boolean indicating if it's the maximizing player's turn,
+                   i.e. if player is to move.
+    player: the player scores are given for.
     eval_params: parameters for the evaluation function.
     alpha: best score the maximizing player can guarantee so far (for pruning).
     beta: best score the minimizing player can guarantee so far (for pruning).
-    beam_width: number of best moves to explore at each level of the tree (beam search).
+    beam_width: number of best moves to explore at each level of the tree (beam search),
+                or an AdaptiveBeam to choose it per node.
+    tt: optional transposition table shared across the search.
+    budget: optional SearchBudget, SearchTimeout is raised when it runs out.
+    ordering: optional MoveOrdering. The beam is already searched best-evaluation
+              first, so here it only records cutoffs (statistics, killers and history).
+    eval_cache: optional EvalCache for leaf evaluations.
+    quiescence_nodes: if non-zero, leaves where a queen is under pressure are extended
+                      by a quiescence search of at most this many positions.
+    stats: optional SearchStats the search adds its counters and phase times to.
 
     Returns:
     score: The best score the current player can achieve.
     best_move: The best move to play from this state (optional).
     """
-    global states_count
-    states_count += 1
-
-    # Base case: check if the game is over or depth limit reached
-    if board.game_over() or depth == 0:
-        return evaluate(board.get_game_state(player), player, eval_params), None
+    if is_maximizing:
+        return negamax(board, depth, player, eval_params, alpha, beta, beam_width, tt, budget, ordering,
+                       eval_cache, quiescence_nodes=quiescence_nodes, stats=stats)
+    score, best_move = negamax(board, depth, player, eval_params, -beta, -alpha, beam_width, tt, budget,
+                               ordering, eval_cache, quiescence_nodes=quiescence_nodes, stats=stats)
+    return -score, best_move
 
-    actions = board.get_legal_actions(board.get_player_turn())
-    valid_moves = create_action_list(actions)
-    best_move = None
 
-    # Evaluate all moves at this level
+def select_beam(board: HiveBoard, valid_moves, is_maximizing, player, eval_params, beam_width,
+                budget: SearchBudget = None):
+    """
+    Scores every move one ply deep with quick_evaluate and returns the
+    beam_width best as (eval, move) pairs, best first for the player to move.
+    The full evaluate is only used at leaves. If beam_width is an AdaptiveBeam
+    the width is chosen from the scores and the fraction of budget left.
+    """
     move_evaluations = []
-
     for move in valid_moves:
         og_pos = make_move(board, move)  # Apply move
-        eval_ = evaluate(board.get_game_state(player), player, eval_params)
+        eval_ = quick_evaluate(board, player, eval_params)
         undo_move(board, move, og_pos)  # Undo move
-        
-        # Store the evaluated move (negative eval for heapq for maximizer)
         move_evaluations.append((eval_, move))
 
+    if isinstance(beam_width, AdaptiveBeam):
+        scores = sorted((eval_ if is_maximizing else -eval_ for eval_, _ in move_evaluations), reverse=True)
+        beam_width = beam_width.width(scores, budget.remaining() if budget is not None else 1.0)
+
     # Sort moves based on evaluation (maximizer sorts in descending order, minimizer ascending)
     if is_maximizing:
-        best_moves = heapq.nlargest(beam_width, move_evaluations, key=lambda x: x[0])
-    else:
-        best_moves = heapq.nsmallest(beam_width, move_evaluations, key=lambda x: x[0])
+        return heapq.nlargest(beam_width, move_evaluations, key=lambda x: x[0])
+    return heapq.nsmallest(beam_width, move_evaluations, key=lambda x: x[0])
 
-    # Now run minimax on the selected top-k moves (beam search)
-    if is_maximizing:
-        max_eval = -float('inf')
-        for eval_, move in best_moves:
-            og_pos = make_move(board, move)  # Apply move
-            eval_, _ = beam_minimax(board, depth - 1, False, player, eval_params, alpha, beta, beam_width)
-            undo_move(board, move, og_pos)  # Undo move
 
-            if eval_ > max_eval:
-                max_eval = eval_
-                best_move = move
+# Persistent worker pool for parallel_beam_minimax. Workers share one alpha bound,
+# the best root score found so far, and start each root candidate from it.
+_pool = None
+_pool_size = None
+_shared_alpha = None
+_worker_eval_cache = None # kept for the life of the worker, entries are keyed by params
 
-            alpha = max(alpha, eval_)
-            if beta <= alpha:
-                break  # Beta cutoff
 
-        return max_eval, best_move
+def _init_worker(shared_alpha):
+    global _shared_alpha, _worker_eval_cache
+    _shared_alpha = shared_alpha
+    _worker_eval_cache = EvalCache()
 
-    else:
-        min_eval = float('inf')
-        for eval_, move in best_moves:
-            og_pos = make_move(board, move)  # Apply move
-            eval_, _ = beam_minimax(board, depth - 1, True, player, eval_params, alpha, beta, beam_width)
-            undo_move(board, move, og_pos)  # Undo move
 
-            if eval_ < min_eval:
-                min_eval = eval_
-                best_move = move
+def get_pool(processes=None):
+    """Returns the worker pool, starting it on first use or if the size changes"""
+    global _pool, _pool_size, _shared_alpha
+    if _pool is None or _pool_size != processes:
+        close_pool()
+        _shared_alpha = Value('d', -float('inf'))
+        _pool = Pool(processes, initializer=_init_worker, initargs=(_shared_alpha,))
+        _pool_size = processes
+    return _pool
+
+
+def close_pool():
+    global _pool, _pool_size
+    if _pool is not None:
+        _pool.terminate()
+        _pool.join()
+    _pool = _pool_size = None
+
+
+def _search_root_move(args):
+    """
+    Worker task: searches one root candidate against the shared alpha bound.
+    Returns (score, move, stats, failed_low) - failed_low means the score is
+    only an upper bound, the move being no better than one already found
+    """
+    compact, move, depth, player, eval_params, beam_width, tt_size, quiescence_nodes = args
+    stats = SearchStats()
+
+    board = HiveBoard.from_compact_state(compact)
+    tt = TranspositionTable(tt_size) if tt_size else None
+    make_move(board, move)
+    alpha = _shared_alpha.value
+    stats.start(tt, _worker_eval_cache)
+    eval_, _ = beam_minimax(board, depth - 1, False, player, eval_params,
+                            alpha, float('inf'), beam_width, tt, eval_cache=_worker_eval_cache,
+                            quiescence_nodes=quiescence_nodes, stats=stats)
+    stats.stop()
+
+    with _shared_alpha.get_lock():
+        if eval_ > _shared_alpha.value:
+            _shared_alpha.value = eval_
+    return eval_, move, stats, eval_ <= alpha
+
+
+def parallel_beam_minimax(board: HiveBoard, depth, player, eval_params, beam_width=3,
+                          processes=None, tt_size=2**16, quiescence_nodes=0, stats: SearchStats = None):
+    """
+    beam_minimax for the player to move with the root candidates searched in
+    parallel on a persistent process pool. Each worker rebuilds the board from
+    a compact snapshot and searches with its own transposition table; a shared
+    alpha bound lets candidates started after a good result returns prune
+    against it. Speed-up is limited by the number of root candidates, i.e. the
+    beam width. Each worker keeps an evaluation cache for its lifetime.
+
+    If stats is given, the workers' counters are merged into it.
+
+    Returns:
+    score: The best score the current player can achieve.
+    best_move: The best move to play from this state.
+    """
+    if stats is not None:
+        stats.node(depth)
+    if board.game_over() or depth == 0:
+        return evaluate_leaf(board, player, eval_params, stats=stats), None
+
+    valid_moves = legal_moves(board, stats)
+    candidates = select_beam(board, valid_moves, True, player, eval_params, beam_width)
+    if not candidates:
+        return evaluate_leaf(board, player, eval_params, stats=stats), None
+
+    pool = get_pool(processes)
+    _shared_alpha.value = -float('inf')
+    compact = board.compact_state()
+    tasks = [(compact, move, depth, player, eval_params, beam_width, tt_size, quiescence_nodes)
+             for _, move in candidates]
+
+    max_eval, best_move = -float('inf'), None
+    for eval_, move, worker_stats, failed_low in pool.imap(_search_root_move, tasks): # in beam order like beam_minimax
+        if stats is not None:
+            stats.merge(worker_stats)
+        if not failed_low and eval_ > max_eval:
+            max_eval, best_move = eval_, move
+    return max_eval, best_move
 
-            beta = min(beta, eval_)
-            if beta <= alpha:
-                break  # Alpha cutoff
 
-        return min_eval, best_move
+def iterative_deepening(board: HiveBoard, max_depth, player, eval_params, beam_width=3,
+                        tt: TranspositionTable = None, time_budget=None, node_budget=None,
+                        ordering: MoveOrdering = None, eval_cache: EvalCache = None,
+                        aspiration_window=1.0, quiescence_nodes=0, stats: SearchStats = None):
+    """
+    Runs a beam negamax search at depth 1, 2, ... max_depth until the time
+    budget (seconds) or node budget runs out, and returns the result of the last
+    completed depth. player must be the player to move.
+
+    Each iteration shares the transposition table, so the best moves stored by
+    the previous iteration (its principal variation) are searched first. Depth 1
+    always runs to completion so a move is available however small the budget.
+    If the budget runs out mid-iteration the board is left part way through the
+    search, so pass a copy.
+
+    From depth 2 each iteration is searched with an aspiration window of
+    +/- aspiration_window around an earlier score; if the result falls
+    outside it the window is opened on that side and the depth re-searched.
+    The window is centred on the score from two depths back when there is one,
+    as scores tend to alternate between odd and even depths. None searches
+    every depth with the full window.
+
+    quiescence_nodes is passed on to negamax. If stats is given, the nodes
+    searched by each completed iteration are recorded in its iteration_nodes.
+
+    Returns:
+    score, best_move, depth: result of the deepest completed iteration.
+    """
+    if tt is None:
+        tt = TranspositionTable()
+    budget = SearchBudget(time_budget, node_budget)
+    score, best_move, completed = None, None, 0
+    scores = []
+
+    for depth in range(1, max_depth + 1):
+        alpha, beta = -float('inf'), float('inf')
+        if completed and aspiration_window is not None:
+            centre = scores[-2] if len(scores) > 1 else score
+            alpha, beta = centre - aspiration_window, centre + aspiration_window
+        nodes_before = stats.nodes if stats is not None else 0
+        try:
+            while True:
+                result, move = negamax(board, depth, player, eval_params, alpha, beta, beam_width, tt,
+                                       budget if completed else None, ordering, eval_cache,
+                                       quiescence_nodes=quiescence_nodes, stats=stats)
+                if result <= alpha: # failed low - open the window downwards
+                    alpha = -float('inf')
+                elif result >= beta: # failed high - open the window upwards
+                    beta = float('inf')
+                else:
+                    break
+        except SearchTimeout:
+            break
+        score, best_move = result, move
+        scores.append(score)
+        completed = depth
+        if stats is not None:
+            stats.iteration_nodes[depth] = stats.nodes - nodes_before
+        if best_move is None or abs(score) >= eval_params.win_reward / 2: # no moves or result decided
+            break
+
+    return score, best_move, completed
+
+
+def principal_variation(board: HiveBoard, tt: TranspositionTable, max_length):
+    """
+    Follows best moves stored in the transposition table from the current position
+    """
+    return [move for move, _ in principal_line(board, tt, max_length)]
+
+
+def principal_line(board: HiveBoard, tt: TranspositionTable, max_length):
+    """
+    Like principal_variation, but returns (move, position hash after the move)
+    pairs so a later search can tell whether the game followed the line.
+    """
+    line = []
+    applied = []
+    while len(line) < max_length:
+        entry = tt.peek(board.position_hash())
+        if entry is None or entry.best_move is None:
+            break
+        if entry.best_move not in create_action_list(board.get_legal_actions(board.get_player_turn())):
+            break
+        applied.append((entry.best_move, make_move(board, entry.best_move)))
+        line.append((entry.best_move, board.position_hash()))
+    for move, og_pos in reversed(applied):
+        undo_move(board, move, og_pos)
+    return line
+
+
+def follow_line(board: HiveBoard, tt: TranspositionTable, line):
+    """
+    If the current position is on a line returned by principal_line, stores
+    the rest of the line in the table as best moves (TranspositionTable.store_move)
+    so the next search tries it first even if its entries were replaced.
+    Returns whether the position was on the line.
+    """
+    keys = [key for _, key in line]
+    key = board.position_hash()
+    if key not in keys:
+        return False
+    applied = []
+    for move, _ in line[keys.index(key) + 1:]:
+        if move not in create_action_list(board.get_legal_actions(board.get_player_turn())):
+            break
+        tt.store_move(board.position_hash(), move)
+        applied.append((move, make_move(board, move)))
+    for move, og_pos in reversed(applied):
+        undo_move(board, move, og_pos)
+    return True
 
 
 def create_action_list(actions):
@@ -164,6 +579,15 @@ def create_action_list(actions):
     return action_list
 
 
+def move_to_front(moves, move):
+    """
+    Reorder moves so that move (e.g. from the transposition table) is searched first
+    """
+    if move is None or move not in moves:
+        return moves
+    return [move] + [m for m in moves if m != move]
+
+
 def make_move(board: HiveBoard, action: tuple):
     """
     Apply move to board. Returns original position of piece.
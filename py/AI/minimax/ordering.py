@@ -0,0 +1,107 @@
+"""
+Move ordering for alpha-beta search.
+
+Alpha-beta prunes most when the move that causes a cutoff is searched first,
+so moves are tried in the order:
+    1. transposition table move
+    2. moves adding a piece next to the opponent's queen
+    3. killer moves - moves that caused a cutoff at the same depth elsewhere
+    4. the rest, by history score
+
+The history table is keyed by (tile_idx, destination relative to the
+opponent's queen) rather than the absolute destination, so that what is
+learned carries over as the hive shifts around the board.
+"""
+from game import ACTIONSPACE_INV, HiveBoard
+
+NEIGHBOUR_OFFSETS = [(0, 1), (1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1)]
+
+
+class MoveOrdering:
+    def __init__(self, n_killers=2):
+        self.n_killers = n_killers
+        self.killers = {} # depth remaining -> most recent cutoff moves at that depth
+        self.history = {} # (tile_idx, relative destination) -> score
+
+        # statistics
+        self.cutoff_nodes = 0 # nodes where some move caused a cutoff
+        self.first_move_cutoffs = 0 # ... where it was the first move searched
+
+    def clear(self):
+        self.killers = {}
+        self.history = {}
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.cutoff_nodes = self.first_move_cutoffs = 0
+
+    def order(self, board: HiveBoard, moves, depth, tt_move=None):
+        """
+        Returns moves sorted best-first for the player to move. depth is the
+        remaining search depth, which identifies the ply within one search.
+        """
+        player = board.get_player_turn()
+        opp_queen = board.queen_positions[2 - player]
+        killers = self.killers.get(depth, ())
+
+        def rank(move):
+            if move == tt_move:
+                return (0, 0)
+            if opp_queen is not None and surrounds_queen(board, move, opp_queen):
+                return (1, 0)
+            if move in killers:
+                return (2, killers.index(move))
+            return (3, -self.history.get(self._history_key(move, opp_queen), 0))
+
+        return sorted(moves, key=rank)
+
+    def record_cutoff(self, board: HiveBoard, move, depth, move_number):
+        """
+        Records that move caused a cutoff at a node with the given remaining
+        depth. Call with the board in the position the move was played from.
+        """
+        self.cutoff_nodes += 1
+        if move_number == 0:
+            self.first_move_cutoffs += 1
+
+        killers = self.killers.setdefault(depth, [])
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[self.n_killers:]
+
+        opp_queen = board.queen_positions[2 - board.get_player_turn()]
+        key = self._history_key(move, opp_queen)
+        self.history[key] = self.history.get(key, 0) + depth * depth # deep cutoffs count for more
+
+    def first_move_cutoff_rate(self):
+        return self.first_move_cutoffs / self.cutoff_nodes if self.cutoff_nodes else 0.0
+
+    def summary(self):
+        return (f'Cutoff nodes: {self.cutoff_nodes}, '
+                f'cutoff at first move: {100 * self.first_move_cutoff_rate():.1f}%')
+
+    @staticmethod
+    def _history_key(move, queen_pos):
+        pos, tile_idx = move
+        if queen_pos is None:
+            return tile_idx, None
+        return tile_idx, (pos[0] - queen_pos[0], pos[1] - queen_pos[1])
+
+
+def surrounds_queen(board: HiveBoard, move, queen_pos):
+    """
+    Returns True if move puts a piece on an empty cell next to the queen at
+    queen_pos without leaving another cell next to it empty
+    """
+    pos, tile_idx = move
+    if not is_adjacent(pos, queen_pos) or board.get_tile_stack(pos) is not None:
+        return False
+
+    tile = board.name_obj_mapping[ACTIONSPACE_INV[tile_idx] + '_p' + str(board.get_player_turn())]
+    if tile.position is None or tile.position == queen_pos:
+        return tile.position is None # placements only add pieces, the queen itself never surrounds
+    return not is_adjacent(tile.position, queen_pos) or len(board.get_tile_stack(tile.position)) > 1
+
+
+def is_adjacent(pos, other):
+    return (pos[0] - other[0], pos[1] - other[1]) in NEIGHBOUR_OFFSETS
@@ -0,0 +1,162 @@
+"""
+Depth-first proof-number search (df-pn) for forced wins.
+
+Answers one question exactly: can the player to move force a win within
+max_plies? The heuristic search can only estimate this, and either misses a
+forced queen surround a few plies deep or burns its budget reaching it.
+
+Each node holds a proof number phi and a disproof number delta from the
+perspective of the player to move there (phi = 0: that player wins). The
+player to move at the root is the attacker; draws, running out of plies and
+every other outcome count as wins for the defender, so a proof is a forced
+win and a disproof only means there is none within the horizon. The search
+has its own ProofTable, separate from the minimax transposition table. A
+player without legal moves passes.
+"""
+from dataclasses import dataclass
+
+from game import HiveBoard
+from .minimax import make_move, undo_move, create_action_list
+
+INF = 10**9 # phi/delta of a solved node
+
+UNKNOWN = 0 # node budget ran out
+PROVEN = 1 # the player to move forces a win
+DISPROVEN = 2 # no forced win within the horizon
+
+
+@dataclass
+class ProofResult:
+    status: int
+    move: tuple = None # first move of the proof if proven
+    nodes: int = 0
+
+    def proven(self):
+        return self.status == PROVEN
+
+
+class ProofTable:
+    """
+    Direct-mapped table of (phi, delta) keyed by position hash and plies
+    left - a disproof only holds for the horizon it was searched with.
+    Entries are always overwritten.
+    """
+    def __init__(self, size=2**16):
+        self.size = size
+        self.entries = [None] * size
+
+    def get(self, key, plies):
+        key = hash((key, plies))
+        entry = self.entries[key % self.size]
+        if entry is not None and entry[0] == key:
+            return entry[1], entry[2]
+        return 1, 1
+
+    def put(self, key, plies, phi, delta):
+        key = hash((key, plies))
+        self.entries[key % self.size] = (key, phi, delta)
+
+    def clear(self):
+        self.entries = [None] * self.size
+
+
+class OutOfBudget(Exception):
+    """Raised from inside prove_win when its node budget runs out"""
+
+
+def queen_neighbours(board: HiveBoard, player):
+    """Occupied positions around player's queen, 0 if it has not been placed"""
+    pos = board.queen_positions[player - 1]
+    return board.features.queen_neighbours(pos) if pos is not None else 0
+
+
+def prove_win(board: HiveBoard, max_plies=5, node_budget=2000, table: ProofTable = None):
+    """
+    df-pn from the current position: can the player to move force a win
+    within max_plies (both players' moves, so 5 is three of its own)?
+
+    Parameters:
+    board: current game state, left unchanged.
+    max_plies: horizon of the proof.
+    node_budget: positions expanded before giving up with UNKNOWN.
+    table: optional ProofTable, e.g. kept across moves.
+
+    Returns:
+    ProofResult with status PROVEN (and the first move of the win), DISPROVEN or UNKNOWN.
+    """
+    attacker = board.get_player_turn()
+    table = table if table is not None else ProofTable()
+    nodes = 0
+    root_move = None
+
+    def apply(move):
+        if move is None: # pass
+            board.player_turns[board.get_player_turn() - 1] += 1
+            return None
+        return make_move(board, move)
+
+    def undo(move, og_pos):
+        if move is None:
+            board.player_turns[2 - board.get_player_turn()] -= 1
+        else:
+            undo_move(board, move, og_pos)
+
+    def children(plies):
+        """[move, phi, delta] per child from its mover's view, with finished games
+        and children at the horizon already solved. move None is a pass"""
+        moves = create_action_list(board.get_legal_actions(board.get_player_turn())) or [None]
+        result = []
+        for move in moves:
+            og_pos = apply(move)
+            winner = board.game_over()
+            attacker_to_move = board.get_player_turn() == attacker
+            if winner is not False:
+                phi, delta = (0, INF) if (winner == attacker) == attacker_to_move else (INF, 0)
+            elif plies == 1: # the attacker can no longer win
+                phi, delta = (INF, 0) if attacker_to_move else (0, INF)
+            else:
+                phi, delta = table.get(board.position_hash(), plies - 1)
+            result.append([move, phi, delta])
+            undo(move, og_pos)
+        return result
+
+    def mid(plies, th_phi, th_delta):
+        nonlocal nodes, root_move
+        nodes += 1
+        if nodes > node_budget:
+            raise OutOfBudget
+        key = board.position_hash()
+        moves = children(plies)
+
+        while True:
+            phi = min(child[2] for child in moves)
+            delta = min(sum(child[1] for child in moves), INF)
+            if phi >= th_phi or delta >= th_delta:
+                break
+            # most-proving child and the runner-up's delta for its threshold
+            best = second = None
+            for child in moves:
+                if best is None or child[2] < best[2]:
+                    best, second = child, best
+                elif second is None or child[2] < second[2]:
+                    second = child
+            delta2 = second[2] if second is not None else INF
+
+            og_pos = apply(best[0])
+            try:
+                best[1], best[2] = mid(plies - 1, min(th_delta - delta + best[1], INF), min(th_phi, delta2 + 1))
+            finally:
+                undo(best[0], og_pos)
+
+        table.put(key, plies, phi, delta)
+        if plies == max_plies and phi == 0:
+            root_move = next(child[0] for child in moves if child[2] == 0)
+        return phi, delta
+
+    try:
+        phi, _ = mid(max_plies, INF, INF)
+    except OutOfBudget:
+        return ProofResult(UNKNOWN, None, nodes)
+    if phi == 0:
+        return ProofResult(PROVEN, root_move, nodes)
+    return ProofResult(DISPROVEN, None, nodes)
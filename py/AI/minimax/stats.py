@@ -0,0 +1,163 @@
+"""
+Statistics for one search.
+
+Every search entry point takes an optional SearchStats and adds to it, so
+the caller owns the counters - one object per move, per worker or per
+benchmark run - instead of sharing a module-level global between searches,
+processes and threads.
+
+Phase times split the search into move generation (get_legal_actions),
+evaluation (leaf evaluations and beam scoring) and recursion, which is
+everything else: making and undoing moves, table lookups and bookkeeping.
+"""
+from time import perf_counter
+
+
+class SearchStats:
+    def __init__(self):
+        self.nodes = 0
+        self.leaf_evals = 0 # static evaluations of leaves (beam scoring not included)
+        self.quiescence_nodes = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0 # cutoffs caused by the first move searched
+        self.depth_nodes = {} # remaining depth -> nodes
+        self.iteration_nodes = {} # iterative deepening: depth -> nodes searched by that iteration
+        self.beam_widths = {} # beam width -> number of nodes searched with it
+        self.tt_probes = self.tt_hits = 0
+        self.cache_lookups = self.cache_hits = 0
+        self.reused_depth = 0 # depth the root was already searched to by the previous move's search
+        self.pv_hit = False # the game followed the previous search's principal variation
+        self.proof_nodes = 0 # positions searched by the df-pn forced-win pre-check, 0 if it did not run
+        self.proven_win = False # the pre-check proved a win and the search was skipped
+
+        # seconds
+        self.movegen_time = 0.0
+        self.eval_time = 0.0
+        self.proof_time = 0.0
+        self.elapsed = 0.0
+
+        self._start = None
+        self._tables = (None, None, 0, 0, 0, 0) # tt, eval cache and their counters at start()
+
+    def start(self, tt=None, eval_cache=None):
+        """
+        Starts the clock. TT and eval cache hit rates are measured from the
+        tables' own counters between start() and stop()
+        """
+        self._start = perf_counter()
+        self._tables = (tt, eval_cache,
+                        tt.probes if tt else 0, tt.hits if tt else 0,
+                        eval_cache.hits + eval_cache.misses if eval_cache else 0,
+                        eval_cache.hits if eval_cache else 0)
+
+    def stop(self):
+        if self._start is not None:
+            self.elapsed += perf_counter() - self._start
+            self._start = None
+        tt, eval_cache, tt_probes, tt_hits, cache_lookups, cache_hits = self._tables
+        if tt is not None:
+            self.tt_probes += tt.probes - tt_probes
+            self.tt_hits += tt.hits - tt_hits
+        if eval_cache is not None:
+            self.cache_lookups += eval_cache.hits + eval_cache.misses - cache_lookups
+            self.cache_hits += eval_cache.hits - cache_hits
+        self._tables = (None, None, 0, 0, 0, 0)
+
+    def merge(self, other):
+        """Adds the counters of other, e.g. from a worker process"""
+        for name in ('nodes', 'leaf_evals', 'quiescence_nodes', 'cutoffs', 'first_move_cutoffs',
+                     'tt_probes', 'tt_hits', 'cache_lookups', 'cache_hits', 'movegen_time', 'eval_time'):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for depth, nodes in other.depth_nodes.items():
+            self.depth_nodes[depth] = self.depth_nodes.get(depth, 0) + nodes
+        for width, nodes in other.beam_widths.items():
+            self.beam_widths[width] = self.beam_widths.get(width, 0) + nodes
+
+    def node(self, depth):
+        self.nodes += 1
+        self.depth_nodes[depth] = self.depth_nodes.get(depth, 0) + 1
+
+    def beam(self, width):
+        self.beam_widths[width] = self.beam_widths.get(width, 0) + 1
+
+    def mean_beam_width(self):
+        nodes = sum(self.beam_widths.values())
+        return sum(width * n for width, n in self.beam_widths.items()) / nodes if nodes else 0.0
+
+    def cutoff(self, move_number):
+        self.cutoffs += 1
+        if move_number == 0:
+            self.first_move_cutoffs += 1
+
+    def first_move_cutoff_rate(self):
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def tt_hit_rate(self):
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    def cache_hit_rate(self):
+        return self.cache_hits / self.cache_lookups if self.cache_lookups else 0.0
+
+    def nodes_per_second(self):
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+    def recursion_time(self):
+        return max(self.elapsed - self.movegen_time - self.eval_time, 0.0)
+
+    def branching_factors(self):
+        """
+        Effective branching factor per depth. With iterative deepening, the
+        ratio of nodes searched by consecutive iterations; otherwise the ratio
+        of nodes at consecutive plies of the search (depth 1 = root's children).
+        """
+        if len(self.iteration_nodes) > 1:
+            return {depth: nodes / self.iteration_nodes[depth - 1]
+                    for depth, nodes in sorted(self.iteration_nodes.items())
+                    if self.iteration_nodes.get(depth - 1)}
+        root = max(self.depth_nodes, default=0)
+        return {root - depth: self.depth_nodes.get(depth, 0) / self.depth_nodes[depth + 1]
+                for depth in range(root - 1, -1, -1) if self.depth_nodes.get(depth + 1)}
+
+    def as_dict(self):
+        return {
+            'nodes': self.nodes,
+            'leaf_evals': self.leaf_evals,
+            'quiescence_nodes': self.quiescence_nodes,
+            'cutoffs': self.cutoffs,
+            'first_move_cutoff_rate': self.first_move_cutoff_rate(),
+            'tt_hit_rate': self.tt_hit_rate(),
+            'cache_hit_rate': self.cache_hit_rate(),
+            'branching_factors': self.branching_factors(),
+            'beam_widths': dict(self.beam_widths),
+            'mean_beam_width': self.mean_beam_width(),
+            'nodes_per_second': self.nodes_per_second(),
+            'reused_depth': self.reused_depth,
+            'pv_hit': self.pv_hit,
+            'proof_nodes': self.proof_nodes,
+            'proven_win': self.proven_win,
+            'proof_time': self.proof_time,
+            'elapsed': self.elapsed,
+            'movegen_time': self.movegen_time,
+            'eval_time': self.eval_time,
+            'recursion_time': self.recursion_time(),
+        }
+
+    def summary(self):
+        ebf = ' '.join(f'{depth}:{bf:.1f}' for depth, bf in self.branching_factors().items())
+        return (f'Nodes: {self.nodes} ({self.nodes_per_second():.0f}/s), leaf evals: {self.leaf_evals}, '
+                f'cutoffs: {self.cutoffs} ({100 * self.first_move_cutoff_rate():.1f}% first move), '
+                f'TT hit rate: {100 * self.tt_hit_rate():.1f}%, eval cache hit rate: {100 * self.cache_hit_rate():.1f}%, '
+                f'EBF: {ebf or "-"}, beam: {self._beam_summary()}, '
+                f'reused depth: {self.reused_depth}{" (PV hit)" if self.pv_hit else ""}, '
+                f'time: {self.elapsed:.3f}s (movegen {self.movegen_time:.3f}s, '
+                f'eval {self.eval_time:.3f}s, recursion {self.recursion_time():.3f}s){self._proof_summary()}')
+
+    def _beam_summary(self):
+        if not self.beam_widths:
+            return '-'
+        return f'{self.mean_beam_width():.1f} mean ({min(self.beam_widths)}-{max(self.beam_widths)})'
+
+    def _proof_summary(self):
+        if not self.proof_nodes:
+            return ''
+        return f', proof: {self.proof_nodes} nodes in {self.proof_time:.3f}s' + (' (forced win)' if self.proven_win else '')
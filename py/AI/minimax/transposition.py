@@ -0,0 +1,131 @@
+"""
+Fixed-size transposition table for minimax search.
+
+Positions reached by different move orders (very common in Hive since
+placements commute) are searched once; later visits reuse the stored score
+when it was searched at least as deep, or at least try the stored best move
+first.
+"""
+
+EXACT = 0
+LOWER_BOUND = 1 # search failed high - true score is at least the stored score
+UPPER_BOUND = 2 # search failed low - true score is at most the stored score
+
+
+class TTEntry:
+    __slots__ = ('key', 'depth', 'score', 'flag', 'best_move', 'age')
+
+    def __init__(self, key, depth, score, flag, best_move, age):
+        self.key = key
+        self.depth = depth
+        self.score = score
+        self.flag = flag
+        self.best_move = best_move
+        self.age = age
+
+
+class TranspositionTable:
+    def __init__(self, size=2**16):
+        self.size = size
+        self.entries = [None] * size
+        self.age = 0 # bumped per search so entries from earlier searches are replaced first
+
+        # statistics
+        self.probes = 0
+        self.hits = 0
+        self.cutoffs = 0 # probes answered without searching the subtree
+        self.stores = 0
+
+    def new_search(self):
+        """Call at the start of each search. Existing entries are kept but
+        become preferred candidates for replacement"""
+        self.age += 1
+
+    def clear(self):
+        self.entries = [None] * self.size
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.probes = self.hits = self.cutoffs = self.stores = 0
+
+    def probe(self, key):
+        """Returns the entry stored for key, or None"""
+        self.probes += 1
+        entry = self.entries[key % self.size]
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def peek(self, key):
+        """Returns the entry stored for key, or None, without counting a probe"""
+        entry = self.entries[key % self.size]
+        return entry if entry is not None and entry.key == key else None
+
+    def lookup(self, key, depth, alpha, beta):
+        """
+        Probes the table for a position searched to at least the given depth.
+        Returns (score, best_move) where score is None unless the stored bound
+        is tight enough to return without searching. best_move is the stored
+        move (or None) and is worth trying first either way.
+        """
+        entry = self.probe(key)
+        if entry is None:
+            return None, None
+
+        if entry.depth >= depth:
+            if (entry.flag == EXACT
+                    or (entry.flag == LOWER_BOUND and entry.score >= beta)
+                    or (entry.flag == UPPER_BOUND and entry.score <= alpha)):
+                self.cutoffs += 1
+                return entry.score, entry.best_move
+
+        return None, entry.best_move
+
+    def store(self, key, depth, score, alpha, beta, best_move):
+        """
+        Stores a search result. alpha and beta are the window the node was
+        searched with, used to decide whether score is exact or a bound.
+        Replaces the existing entry in the slot if it is from an earlier
+        search, for the same position, or from a shallower search.
+        """
+        idx = key % self.size
+        entry = self.entries[idx]
+        if (entry is not None and entry.key != key
+                and entry.age == self.age and entry.depth > depth):
+            return
+
+        if score <= alpha:
+            flag = UPPER_BOUND
+        elif score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+
+        if entry is not None and entry.key == key and best_move is None:
+            best_move = entry.best_move # keep the old move rather than losing it
+        self.entries[idx] = TTEntry(key, depth, score, flag, best_move, self.age)
+        self.stores += 1
+
+    def store_move(self, key, best_move):
+        """
+        Records a best move to try first without a score, e.g. a principal
+        variation kept from an earlier search. Stored at depth 0 so it never
+        answers a lookup, and only into a slot that is empty or from an earlier
+        search; an entry already held for the position keeps its own move.
+        """
+        idx = key % self.size
+        entry = self.entries[idx]
+        if entry is not None and entry.key == key:
+            if entry.best_move is None:
+                entry.best_move = best_move
+            return
+        if entry is None or entry.age < self.age:
+            self.entries[idx] = TTEntry(key, 0, 0.0, EXACT, best_move, self.age)
+
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    def summary(self):
+        return (f'TT probes: {self.probes}, hit rate: {100 * self.hit_rate():.1f}%, '
+                f'cutoffs: {self.cutoffs}, stores: {self.stores}')
@@ -4,6 +4,7 @@ from game import HiveBoard
 from AI.agents import Agent, RandomAgent, DQLAgent, HeuristicAgent
 from AI.DQL.networks import DQN, DQN_gat, DQN_simple
 from AI.minimax.heuristic import Params
+from AI.minimax import AdaptiveBeam, ProofTable, prove_win, queen_neighbours
 import torch
 
 """
@@ -11,7 +12,10 @@ Provides arena environment for agents to self play/for agents to play each other
 """
 
 
-def create_agent(agent_type: str, player: int, reduced: bool = False) -> Agent | None:
+def create_agent(agent_type: str, player: int, reduced: bool = False, depth: int = 3,
+                 time_budget: float = None, node_budget: int = None, workers: int = None,
+                 incremental_eval: bool = False, quiescence_nodes: int = 0, beam_width: int = 3,
+                 adaptive_beam: bool = False, reuse_tree: bool = True, proof_nodes: int = 0) -> Agent | None:
     """
     Factory function to create an agent based on agent type.
 
@@ -19,6 +23,16 @@ def create_agent(agent_type: str, player: int, reduced: bool = False) -> Agent |
         agent_type: Type of agent ('dqn', 'random', 'mm', or None for human player)
         player: Player number (1 or 2)
         reduced: Whether to use reduced feature set for DQL agents
+        depth: Search depth for minimax agents (maximum depth if a budget is set)
+        time_budget: Seconds per move for minimax agents (iterative deepening)
+        node_budget: Nodes per move for minimax agents (iterative deepening)
+        workers: Processes to split the root search over for minimax agents
+        incremental_eval: Score minimax leaves from the board's maintained features
+        quiescence_nodes: Positions searched past each minimax leaf while a queen is under pressure
+        beam_width: Moves searched per node by minimax agents
+        adaptive_beam: Choose the minimax beam width per node (beam_width is then ignored)
+        reuse_tree: Keep minimax agents' transposition table and principal variation between moves
+        proof_nodes: Node budget of minimax agents' forced-win pre-check (0 disables it)
 
     Returns:
         Agent instance or None if agent_type is None (human player)
@@ -33,8 +47,12 @@ def create_agent(agent_type: str, player: int, reduced: bool = False) -> Agent |
             return RandomAgent(player)
 
         case 'mm':
-            params = Params(queen_surrounding_reward=1, win_reward=100, ownership_reward=3, mp_reward=0.5)
-            return HeuristicAgent(player, 3, params)
+            params = Params(queen_surrounding_reward=1, win_reward=100, ownership_reward=3, mp_reward=0.5,
+                            incremental=incremental_eval)
+            return HeuristicAgent(player, depth, params, time_budget=time_budget, node_budget=node_budget,
+                                  workers=workers, quiescence_nodes=quiescence_nodes,
+                                  beam_width=AdaptiveBeam() if adaptive_beam else beam_width,
+                                  reuse_tree=reuse_tree, proof_nodes=proof_nodes)
 
         case None:
             raise ValueError("Arena requires two AI agents. None is not allowed for player agents.")
@@ -44,10 +62,17 @@ def create_agent(agent_type: str, player: int, reduced: bool = False) -> Agent |
 
 
 class HiveArena:
-    def __init__(self, player1: Agent, player2: Agent, simplified: bool = False):
+    def __init__(self, player1: Agent, player2: Agent, simplified: bool = False, log_stats: bool = False,
+                 adjudicate_nodes: int = 0, adjudicate_plies: int = 5):
         self.p1 = player1
         self.p2 = player2
         self.simplified = simplified
+        self.log_stats = log_stats # print search statistics after every minimax move
+
+        # end games early once the player to move has a proven forced win (0 disables it)
+        self.adjudicate_nodes = adjudicate_nodes
+        self.adjudicate_plies = adjudicate_plies
+        self.proof_table = ProofTable() if adjudicate_nodes else None
 
     def play_game(self) -> int:
         """
@@ -69,10 +94,31 @@ class HiveArena:
             else:
                 action = self.p2.sample_action()
                 moves += 1
+            stats = getattr(self.p1 if player == 1 else self.p2, 'stats', None)
+            if self.log_stats and stats is not None:
+                print(f'Move {moves} (player {player}): {stats.summary()}')
+            if (winner := self.adjudicate(board)) is not None:
+                print(f'Adjudicated: player {winner} has a forced win')
+                result = winner
+                break
 
         print(f'Game Over: Player {result} wins in {moves} moves')
         return result
 
+    def adjudicate(self, board: HiveBoard) -> int | None:
+        """
+        Returns the player to move if the df-pn solver proves they force a win
+        within adjudicate_plies. Only tried once the opponent's queen has four
+        neighbours, as no win can be forced quickly before that.
+        """
+        if not self.adjudicate_nodes or board.game_over() is not False:
+            return None
+        player = board.get_player_turn()
+        if queen_neighbours(board, 3 - player) < 4:
+            return None
+        proof = prove_win(board, self.adjudicate_plies, self.adjudicate_nodes, self.proof_table)
+        return player if proof.proven() else None
+
     def simulate_games(self, num_games: int, print_outcomes: bool = False, log: bool = False) -> list[int]:
         """
         Simulate a number of games between two agents.
@@ -115,12 +161,42 @@ if __name__ == '__main__':
                         help='Use simplified game rules')
     parser.add_argument('--log', action='store_true',
                         help='Log each game')
+    parser.add_argument('--log-stats', action='store_true',
+                        help='Log search statistics for every mm move')
+    parser.add_argument('--depth', type=int, default=3,
+                        help='Search depth for mm agents (maximum depth with a budget)')
+    parser.add_argument('--time-budget', type=float, default=None,
+                        help='Seconds per move for mm agents, enables iterative deepening')
+    parser.add_argument('--node-budget', type=int, default=None,
+                        help='Nodes per move for mm agents, enables iterative deepening')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Processes per move for mm agents (parallel root search)')
+    parser.add_argument('--incremental-eval', action='store_true',
+                        help='Score mm leaves from incrementally maintained board features')
+    parser.add_argument('--beam-width', type=int, default=3,
+                        help='Moves searched per node by mm agents')
+    parser.add_argument('--adaptive-beam', action='store_true',
+                        help='Choose the mm beam width per node from move count, score gap and budget')
+    parser.add_argument('--quiescence', type=int, default=0,
+                        help='Positions mm agents search past each leaf while a queen is under pressure')
+    parser.add_argument('--proof-nodes', type=int, default=0,
+                        help='Node budget of the forced-win check mm agents run once a queen has four neighbours')
+    parser.add_argument('--adjudicate', type=int, default=0,
+                        help='End games once a forced win is proven within this many nodes (0 plays them out)')
+    parser.add_argument('--no-reuse-tree', action='store_true',
+                        help='Start every mm search with an empty transposition table')
     args = parser.parse_args()
 
     # Create agents
-    player1_agent = create_agent(args.player1, 1, reduced=args.reduced)
-    player2_agent = create_agent(args.player2, 2, reduced=args.reduced)
+    search_args = dict(depth=args.depth, time_budget=args.time_budget, node_budget=args.node_budget,
+                       workers=args.workers, incremental_eval=args.incremental_eval,
+                       quiescence_nodes=args.quiescence, beam_width=args.beam_width,
+                       adaptive_beam=args.adaptive_beam, reuse_tree=not args.no_reuse_tree,
+                       proof_nodes=args.proof_nodes)
+    player1_agent = create_agent(args.player1, 1, reduced=args.reduced, **search_args)
+    player2_agent = create_agent(args.player2, 2, reduced=args.reduced, **search_args)
 
     # Run tournament
-    arena = HiveArena(player1_agent, player2_agent, simplified=args.simplified)
+    arena = HiveArena(player1_agent, player2_agent, simplified=args.simplified, log_stats=args.log_stats,
+                      adjudicate_nodes=args.adjudicate)
     arena.simulate_games(args.games, print_outcomes=True, log=args.log)
\ No newline at end of file
@@ -1,9 +1,27 @@
 from collections import defaultdict
 from .pieces import Ant, Beetle, Grasshopper, Spider, Queen
 from .ACTIONSPACE import ACTIONSPACE, ACTIONSPACE_INV
+from .perf import counted, instrumented
+from .features import BoardFeatures
 import copy
+import hashlib
 
+_zobrist_keys = {} # (tile name, position, stack level) -> 64 bit key
 
+
+def zobrist_key(tile_name, position, level):
+    """Returns the Zobrist key for a tile at a given position and stack level.
+    The board is unbounded so keys are generated on demand; they are derived
+    from a digest rather than a random stream so every process agrees on them."""
+    key = (tile_name, position, level)
+    value = _zobrist_keys.get(key)
+    if value is None:
+        digest = hashlib.blake2b(repr(key).encode(), digest_size=8).digest()
+        value = _zobrist_keys[key] = int.from_bytes(digest, 'little')
+    return value
+
+
+@instrumented
 class HiveBoard():
     def __init__(self, max_turns=None, simplified_game=False) -> None:
         self.tile_positions  = defaultdict(list) # mapping from board position to tile objects
@@ -33,7 +51,18 @@ class HiveBoard():
         # ends game once player gets two pieces around opposing queen
         self.simplified_game = simplified_game
 
+        # Zobrist hash of the tiles on the board, updated whenever a tile is added or removed
+        self.zobrist = 0
+
+        # evaluation features, also updated whenever a tile is added or removed
+        self.features = BoardFeatures()
+
     
+    def position_hash(self):
+        """Returns a hash identifying the current position, used to key
+        transposition tables. Includes turn counts as these affect legality."""
+        return hash((self.zobrist, self.player_turns[0], self.player_turns[1]))
+
     def get_player_turn(self):
         if self.player_turns[0] == self.player_turns[1]:
             return 1
@@ -50,7 +79,9 @@ class HiveBoard():
     def place_tile(self, tile, position: tuple, update_turns: bool = True):
         """Places a tile at the given position on the board. Player
         turns only updated if update_turns is set to true"""
+        self.zobrist ^= zobrist_key(tile.name, position, len(self.tile_positions[position]))
         self.tile_positions[position].append(tile)
+        self.features.update(self.tile_positions, position, len(self.tile_positions[position]) == 1)
         tile.position = position
         
         # remove tile from hand and update turns
@@ -73,11 +104,16 @@ class HiveBoard():
         are only updated if update turns is set to true"""
         # remove tile from old position
         self.tile_positions[tile.position].remove(tile)
-        if len(self.tile_positions[tile.position]) == 0:
+        self.zobrist ^= zobrist_key(tile.name, tile.position, len(self.tile_positions[tile.position]))
+        emptied = len(self.tile_positions[tile.position]) == 0
+        if emptied:
             del self.tile_positions[tile.position]
+        self.features.update(self.tile_positions, tile.position, emptied)
         
         # add tile to new position
+        self.zobrist ^= zobrist_key(tile.name, new_position, len(self.tile_positions[new_position]))
         self.tile_positions[new_position].append(tile)
+        self.features.update(self.tile_positions, new_position, len(self.tile_positions[new_position]) == 1)
         tile.position = new_position
 
         # when called from GUI we want this method to update player turns
@@ -132,6 +168,7 @@ class HiveBoard():
                     
         return connected and valid
          
+    @counted('get_valid_placements')
     def get_valid_placements(self, player, insect):
         '''Returns list of all valid placement positions for a given player'''
         valid_placements = set()
@@ -171,6 +208,7 @@ class HiveBoard():
         
         return valid_placements
     
+    @counted('check_unconnected')
     def check_unconnected(self, dummy_pos=None):
         """
         Returns True if the board is in an unconnected state, False otherwise.
@@ -204,6 +242,53 @@ class HiveBoard():
         
         return not connected
                    
+    def pinned_positions(self):
+        """
+        Returns the set of positions holding a single tile whose removal would
+        break the hive - the articulation points of the board graph, found in
+        one iterative Tarjan depth-first search. Tiles there cannot move.
+        """
+        if len(self.tile_positions) < 3:
+            return set()
+
+        root = next(iter(self.tile_positions))
+        depth = {root: 0}
+        low = {root: 0}
+        pinned = set()
+        root_children = 0
+        stack = [(root, None, iter(self.occupied_neighbours(root)))]
+
+        while stack:
+            pos, parent, neighbours = stack[-1]
+            for npos in neighbours:
+                if npos == parent:
+                    continue
+                if npos in depth:
+                    low[pos] = min(low[pos], depth[npos])
+                else:
+                    depth[npos] = low[npos] = depth[pos] + 1
+                    stack.append((npos, pos, iter(self.occupied_neighbours(npos))))
+                    break
+            else: # all neighbours visited - pass low point up to parent
+                stack.pop()
+                if parent is None:
+                    continue
+                low[parent] = min(low[parent], low[pos])
+                if parent == root:
+                    root_children += 1
+                elif low[pos] >= depth[parent]:
+                    pinned.add(parent)
+
+        if root_children > 1:
+            pinned.add(root)
+        return {pos for pos in pinned if len(self.tile_positions[pos]) == 1}
+
+    def occupied_neighbours(self, pos):
+        """Returns the occupied positions adjacent to pos"""
+        npos_arr = [(pos[0], pos[1]+1), (pos[0]+1, pos[1]), (pos[0]+1, pos[1]-1),
+                    (pos[0], pos[1]-1), (pos[0]-1, pos[1]), (pos[0]-1, pos[1]+1)]
+        return [npos for npos in npos_arr if npos in self.tile_positions]
+
     def valid_move(self, tile, new_position, player):
         '''Returns True if the tile can be moved to the given position, False otherwise.'''
         if new_position in tile.get_valid_moves():
@@ -300,6 +385,7 @@ class HiveBoard():
 
         return False
     
+    @counted('get_legal_actions')
     def get_legal_actions(self, player):
         '''Returns a list of all legal actions for the given player
         Action space is represented as a dictionary mapping each board
@@ -330,6 +416,7 @@ class HiveBoard():
         
         return legal_actions
     
+    @counted('get_game_state')
     def get_game_state(self, player):
         """
         Returns the current game state as a dictionary - to be used 
@@ -365,6 +452,8 @@ class HiveBoard():
         """Loads a game state from state dictionary"""
         # clear current tile positions and player hands
         self.tile_positions.clear()
+        self.zobrist = 0
+        self.features.clear()
         self.player1_hand.clear()
         self.player2_hand.clear()
         self.fill_hand(self.player1_hand, 1)
@@ -386,13 +475,35 @@ class HiveBoard():
                 tile_obj = self.name_obj_mapping[tile_name]
                 self.place_tile(tile_obj, pos, update_turns=False)
     
+    def compact_state(self):
+        """Returns a small picklable snapshot of the board - tile names per
+        position from bottom to top - e.g. to send to worker processes"""
+        stacks = tuple((pos, tuple(tile.name for tile in tiles)) for pos, tiles in self.tile_positions.items())
+        return self.max_turns, self.simplified_game, tuple(self.player_turns), stacks
+
+    @classmethod
+    def from_compact_state(cls, compact):
+        """Builds a new board from a snapshot returned by compact_state"""
+        max_turns, simplified_game, player_turns, stacks = compact
+        board = cls(max_turns=max_turns, simplified_game=simplified_game)
+        for pos, names in stacks:
+            for name in names:
+                board.place_tile(board.name_obj_mapping[name], pos, update_turns=False)
+        board.player_turns = list(player_turns)
+        return board
+
     def undo_move(self, tile, old_position=None):
         """Undoes a move"""
         if old_position == None: # tile was placed
             self.tile_positions[tile.position].pop()
-            if len(self.tile_positions[tile.position]) == 0:
+            self.zobrist ^= zobrist_key(tile.name, tile.position, len(self.tile_positions[tile.position]))
+            emptied = len(self.tile_positions[tile.position]) == 0
+            if emptied:
                 del self.tile_positions[tile.position]
+            self.features.update(self.tile_positions, tile.position, emptied)
             tile.position = None
+            if tile.insect == 'queen':
+                self.queen_positions[tile.player-1] = None
             if tile.player == 1:
                 self.player1_hand.add(tile)
                 self.pieces_remaining[0][tile.insect] += 1
@@ -0,0 +1,66 @@
+"""
+Evaluation features maintained incrementally by the board.
+
+HiveBoard calls BoardFeatures.update() whenever a stack changes (place_tile,
+move_tile and undo_move), so the search can score a position from these
+accumulators instead of rescanning the board and generating legal actions.
+
+Mobility is an estimate: a top tile counts as mobile if it sits on another
+tile or has at least two empty neighbours to slide through. Tiles pinned by
+the one-hive rule are not excluded.
+"""
+
+NEIGHBOUR_OFFSETS = [(0, 1), (1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1)]
+
+
+class BoardFeatures:
+    def __init__(self):
+        self.neighbour_counts = {} # position -> number of occupied neighbours (non-zero only)
+        self.mobile = {} # position -> player owning the mobile top tile there
+        self.mobile_counts = [0, 0] # mobile top tiles per player
+
+    def clear(self):
+        self.neighbour_counts.clear()
+        self.mobile.clear()
+        self.mobile_counts = [0, 0]
+
+    def update(self, tile_positions, pos, occupancy_changed):
+        """
+        Call after a tile is added to or removed from the stack at pos.
+        occupancy_changed is True if pos went from empty to occupied or back.
+        """
+        neighbours = [(pos[0] + dq, pos[1] + dr) for dq, dr in NEIGHBOUR_OFFSETS]
+        if occupancy_changed:
+            delta = 1 if pos in tile_positions else -1
+            for npos in neighbours:
+                count = self.neighbour_counts.get(npos, 0) + delta
+                if count:
+                    self.neighbour_counts[npos] = count
+                else:
+                    del self.neighbour_counts[npos]
+            neighbours.append(pos) # pos's own surroundings are unchanged, but its top tile may be
+        else:
+            neighbours = [pos]
+
+        for cell in neighbours:
+            old = self.mobile.pop(cell, None)
+            if old is not None:
+                self.mobile_counts[old - 1] -= 1
+            new = self._mobile_player(tile_positions, cell)
+            if new is not None:
+                self.mobile[cell] = new
+                self.mobile_counts[new - 1] += 1
+
+    def _mobile_player(self, tile_positions, cell):
+        if cell not in tile_positions:
+            return None
+        stack = tile_positions[cell]
+        if not stack:
+            return None
+        if len(stack) > 1 or self.neighbour_counts.get(cell, 0) <= 4:
+            return stack[-1].player
+        return None
+
+    def queen_neighbours(self, queen_pos):
+        """Number of occupied positions around a placed queen"""
+        return self.neighbour_counts.get(queen_pos, 0)
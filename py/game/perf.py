@@ -0,0 +1,125 @@
+"""
+Opt-in performance counters for the board and pieces.
+
+Methods marked with @counted are only registered when their class is
+created - nothing is wrapped until enable() is called, which swaps each
+registered method for a timed wrapper. disable() puts the original methods
+back, so there is no overhead at all while counting is switched off.
+
+Counting is switched on for the whole process by setting HIVE_PERF=1, or for
+a block of code with:
+
+    with perf.profile():
+        ...
+    print(perf.counters.summary())
+
+Times are cumulative and inclusive, e.g. the time spent in check_unconnected
+is also counted in the get_valid_moves call that triggered it.
+"""
+import os
+import functools
+from collections import defaultdict
+from contextlib import contextmanager
+from time import perf_counter
+
+
+class PerfCounters:
+    def __init__(self):
+        self.counts = defaultdict(int)
+        self.times = defaultdict(float)
+
+    def reset(self):
+        self.counts.clear()
+        self.times.clear()
+
+    def record(self, op, elapsed):
+        self.counts[op] += 1
+        self.times[op] += elapsed
+
+    def summary(self, title='Engine counters'):
+        """Returns a table of call counts and cumulative time per operation"""
+        lines = [f'=== {title} ===',
+                 f'{"operation":<28}{"calls":>10}{"total ms":>12}{"avg us":>10}']
+        for op in sorted(self.counts, key=lambda k: -self.times[k]):
+            calls = self.counts[op]
+            total = self.times[op]
+            lines.append(f'{op:<28}{calls:>10}{total * 1e3:>12.1f}{total * 1e6 / calls:>10.1f}')
+        return '\n'.join(lines)
+
+
+counters = PerfCounters()
+enabled = False
+
+_registry = [] # (class, attribute name, operation name) for every counted method
+_originals = {} # (class, attribute name) -> unwrapped method while counting is on
+
+
+def counted(op):
+    """Marks a method to be counted under the operation name op"""
+    def decorator(func):
+        func._perf_op = op
+        return func
+    return decorator
+
+
+def instrumented(cls):
+    """Class decorator registering every @counted method defined on cls"""
+    for attr, value in list(vars(cls).items()):
+        op = getattr(value, '_perf_op', None)
+        if op is not None:
+            _registry.append((cls, attr, op))
+            if enabled:
+                _wrap(cls, attr, op)
+    return cls
+
+
+def _wrap(cls, attr, op):
+    original = vars(cls)[attr]
+
+    @functools.wraps(original)
+    def timed(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            counters.record(op, perf_counter() - start)
+
+    _originals[(cls, attr)] = original
+    setattr(cls, attr, timed)
+
+
+def enable():
+    global enabled
+    if enabled:
+        return
+    enabled = True
+    for cls, attr, op in _registry:
+        _wrap(cls, attr, op)
+
+
+def disable():
+    global enabled
+    if not enabled:
+        return
+    enabled = False
+    for (cls, attr), original in _originals.items():
+        setattr(cls, attr, original)
+    _originals.clear()
+
+
+@contextmanager
+def profile(reset=True):
+    """Counts engine operations for the duration of the with block"""
+    was_enabled = enabled
+    if reset:
+        counters.reset()
+    enable()
+    try:
+        yield counters
+    finally:
+        if not was_enabled:
+            disable()
+
+
+if os.environ.get('HIVE_PERF', '0') not in ('', '0'):
+    enable()
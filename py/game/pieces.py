@@ -1,5 +1,7 @@
 from collections import deque
 
+from .perf import counted, instrumented
+
 
 class HiveTile: # parent class for all pieces
     def __init__(self, name, player, n, board, beetle=False):
@@ -48,10 +50,12 @@ class HiveTile: # parent class for all pieces
         return False
 
 
+@instrumented
 class Ant(HiveTile):
     def __init__(self, player, n, board):
         super().__init__('ant', player, n, board)
     
+    @counted('get_valid_moves.ant')
     def get_valid_moves(self):
         if self.covered() or not self.queen_placed():
             return set()
@@ -86,10 +90,12 @@ class Ant(HiveTile):
         return valid_moves
         
 
+@instrumented
 class Beetle(HiveTile):
     def __init__(self, player, n, board):
         super().__init__('beetle', player, n, board, beetle=True)
     
+    @counted('get_valid_moves.beetle')
     def get_valid_moves(self):
         if self.covered() or not self.queen_placed():
             return set()
@@ -142,10 +148,12 @@ class Beetle(HiveTile):
         return valid_moves
 
 
+@instrumented
 class Grasshopper(HiveTile):
     def __init__(self, player, n, board):
         super().__init__('grasshopper', player, n, board)
     
+    @counted('get_valid_moves.grasshopper')
     def get_valid_moves(self):
         if self.covered() or not self.queen_placed():
             return set()
@@ -201,10 +209,12 @@ class Grasshopper(HiveTile):
         return valid_moves
                 
 
+@instrumented
 class Spider(HiveTile):
     def __init__(self, player, n, board):
         super().__init__('spider', player, n, board)
     
+    @counted('get_valid_moves.spider')
     def get_valid_moves(self):
         if self.covered() or not self.queen_placed():
                 return set()
@@ -242,10 +252,12 @@ class Spider(HiveTile):
         return valid_moves
 
 
+@instrumented
 class Queen(HiveTile):
     def __init__(self, player, n, board):
         super().__init__('queen', player, n, board)
     
+    @counted('get_valid_moves.queen')
     def get_valid_moves(self):
         if self.covered() or not self.queen_placed():
             return set()
@@ -1,3 +1,9 @@
 from .base import Agent, Action
 from .random_agent import RandomAgent
 from .minimax_agent_py import MinimaxAgentPy, MinimaxParams
+from .mcts_agent import MCTSAgent, MCTSParams, MCTSStats
+from .search_stats import SearchStats
+from .transposition import TranspositionTable
+from .eval_cache import EvalCache
+from .proof_search import ProofResult, ProofStatus, ProofTable, prove_win
+from .parallel import parallel_playouts, search_many
@@ -0,0 +1,57 @@
+"""
+Bounded LRU cache of heuristic evaluations.
+
+Keyed by (game.get_hash(), player, params fingerprint), so one cache can be
+kept across searches and moves without returning a score computed for
+different evaluation weights.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Hashable
+
+
+class EvalCache:
+    """LRU cache of at most `size` evaluations."""
+
+    def __init__(self, size: int = 2 ** 16) -> None:
+        self.size = size
+        self._entries: OrderedDict[Hashable, float] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.hits = self.misses = 0
+
+    def get(self, key: Hashable) -> float | None:
+        score = self._entries.get(key)
+        if score is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return score
+
+    def put(self, key: Hashable, score: float) -> None:
+        self._entries[key] = score
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.size:
+            self._entries.popitem(last=False)   # evict least recently used
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def summary(self) -> str:
+        return (f"Eval cache lookups: {self.hits + self.misses}, hit rate: {100 * self.hit_rate:.1f}%, "
+                f"entries: {len(self._entries)}/{self.size}")
@@ -0,0 +1,235 @@
+"""
+Monte Carlo tree search agent.
+
+Each iteration walks down the tree by UCT (or PUCT, with priors favouring
+moves next to the opponent's queen), expands the leaf it reaches and scores
+it with a batch of random playouts, then backs the results up the path.
+The game is traversed in place with apply_action / undo, as in the minimax
+agent.
+
+Actions in the tree are plain (tile_idx, q, r) tuples, taken from
+game.legal_actions_array() and played with apply_action_idx / undo_idx, so
+expanding a node creates no bound Action or Position objects.
+
+Playouts are run `rollouts_per_leaf` at a time from the same leaf by the
+engine (game.playouts, one call per batch, with the GIL released), so
+neither the walk to the leaf nor per-ply Python calls are paid per playout.
+A playout that reaches `rollout_max_plies` without a winner is scored by
+the queen-surround difference (the player with more pieces around the
+opponent's queen wins) rather than played out to the end.
+
+With `reuse_tree`, the subtree under the position the game actually reached
+is kept as the root of the next search.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import time
+from dataclasses import dataclass
+
+import hive_engine
+
+from .base import Agent, Action
+
+_HEX_NEIGHBORS: list[tuple[int, int]] = [(0, 1), (1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1)]
+
+
+@dataclass
+class MCTSParams:
+    iterations: int | None = 2000          # tree iterations per move, None: limited by time only
+    time_budget_ms: float | None = None    # per-move wall-clock limit
+    policy: str = 'uct'                    # 'uct' or 'puct'
+    exploration: float = 1.4               # UCT constant / PUCT c_puct
+    queen_prior: float = 3.0               # PUCT: weight of moves next to the opponent's queen relative to others
+    rollouts_per_leaf: int = 4             # playouts run as one batch from each expanded leaf
+    rollout_max_plies: int = 80            # playout length before it is scored by queen surround
+    reuse_tree: bool = True                # keep the subtree of the position reached between moves
+    seed: int | None = None
+
+
+@dataclass
+class MCTSStats:
+    iterations: int = 0
+    playouts: int = 0
+    playout_plies: int = 0
+    tree_nodes: int = 0            # nodes created by this search
+    reused_visits: int = 0         # visits already in the root when the search started
+    max_depth: int = 0
+    elapsed_s: float = 0.0
+    playout_s: float = 0.0
+
+    @property
+    def playouts_per_second(self) -> float:
+        return self.playouts / self.elapsed_s if self.elapsed_s else 0.0
+
+    def summary(self) -> str:
+        mean_length = self.playout_plies / self.playouts if self.playouts else 0.0
+        return (f'iterations: {self.iterations}, playouts: {self.playouts} ({self.playouts_per_second:.0f}/s, '
+                f'mean length {mean_length:.1f}), tree nodes: {self.tree_nodes}, '
+                f'reused visits: {self.reused_visits}, max depth: {self.max_depth}, '
+                f'time: {1000 * self.elapsed_s:.0f} ms (playouts {1000 * self.playout_s:.0f})')
+
+
+@dataclass(eq=False)
+class _Node:
+    action: tuple[int, int, int] | None    # (tile_idx, q, r) from the parent, None for the root or a pass
+    player: int                            # player who made that move; value is from their side
+    key: int                               # game.get_hash() of the position
+    prior: float = 1.0
+    visits: int = 0
+    value: float = 0.0                     # sum of results: 1 win, 0.5 draw, 0 loss
+    children: list[_Node] | None = None    # None until expanded
+    terminal: bool = False                 # the game is over at this node (is_over, draws included)
+    winner: int = 0                        # if terminal: the winner, 0 for a draw
+
+    def q(self) -> float:
+        return self.value / self.visits if self.visits else 0.5
+
+
+def _apply(game: hive_engine.Game, action: tuple[int, int, int] | None):
+    return game.apply_action_idx(*action) if action is not None else game.pass_turn()
+
+
+def _check_terminal(game: hive_engine.Game, node: _Node) -> None:
+    """Marks node terminal if the game is over there; check_game_over() alone cannot tell a draw from play."""
+    if game.is_over():
+        node.terminal = True
+        node.winner = game.check_game_over()
+
+
+def _undo(game: hive_engine.Game, action: tuple[int, int, int] | None, orig) -> None:
+    if action is not None:
+        game.undo_idx(*action, orig)
+    else:
+        game.undo_pass()
+
+
+class MCTSAgent(Agent):
+    """
+    Monte Carlo tree search over the hive_engine action API.
+
+    After each decision stats holds its MCTSStats and latency_ms its
+    wall-clock time. The move played is the root child with the most visits.
+    """
+
+    def __init__(self, params: MCTSParams | None = None) -> None:
+        self.params = params or MCTSParams()
+        if self.params.iterations is None and not self.params.time_budget_ms:
+            raise ValueError("MCTSParams needs an iteration or time budget")
+        self.rng = random.Random(self.params.seed)
+        self.root: _Node | None = None
+        self.stats = MCTSStats()
+        self.latency_ms: float | None = None
+
+    def select_action(self, game: hive_engine.Game) -> Action | None:
+        t0 = time.perf_counter()
+        self.stats = MCTSStats()
+        root = self._root_for(game)
+        self.stats.reused_visits = root.visits
+        deadline = t0 + self.params.time_budget_ms / 1000 if self.params.time_budget_ms else None
+
+        while True:
+            if self.params.iterations is not None and self.stats.iterations >= self.params.iterations:
+                break
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            self._iterate(game, root)
+            self.stats.iterations += 1
+            if root.terminal or (root.children is not None and not root.children):
+                break
+
+        self.stats.elapsed_s = time.perf_counter() - t0
+        self.latency_ms = self.stats.elapsed_s * 1000
+        if not root.children:
+            self.root = None
+            return None
+        best = max(root.children, key=lambda c: c.visits)
+        self.root = best
+        if best.action is None:
+            return None
+        tile_idx, q, r = best.action
+        return Action(tile_idx=tile_idx, to=(q, r))
+
+    def _root_for(self, game: hive_engine.Game) -> _Node:
+        """The kept node for the current position (the move played, then the reply), or a new root."""
+        key = game.get_hash()
+        if self.params.reuse_tree and self.root is not None:
+            candidates = [self.root] + (self.root.children or [])
+            for node in candidates:
+                if node.key == key:
+                    return node
+        return _Node(action=None, player=3 - game.get_current_player(), key=key)
+
+    def _iterate(self, game: hive_engine.Game, root: _Node) -> None:
+        """One selection / expansion / playout / backup pass; `game` is restored afterwards."""
+        path = [root]
+        applied = []
+        node = root
+        try:
+            while node.children and not node.terminal:
+                node = self._select(node)
+                applied.append((node.action, _apply(game, node.action)))
+                path.append(node)
+
+            if node.children is None and not node.terminal:
+                _check_terminal(game, node)
+                if not node.terminal:
+                    self._expand(game, node)
+                    node = self._select(node)
+                    applied.append((node.action, _apply(game, node.action)))
+                    path.append(node)
+                    _check_terminal(game, node)
+
+            if node.terminal:
+                results = [(node.winner, 0)] * self.params.rollouts_per_leaf
+            else:
+                t0 = time.perf_counter()
+                batch = game.playouts(self.params.rollouts_per_leaf, self.params.rollout_max_plies,
+                                      self.rng.getrandbits(63))
+                self.stats.playout_s += time.perf_counter() - t0
+                self.stats.playouts += len(batch)
+                self.stats.playout_plies += int(batch[:, 1].sum())
+                results = [(int(winner), int(length)) for winner, length in batch]
+        finally:
+            for action, orig in reversed(applied):
+                _undo(game, action, orig)
+
+        self.stats.max_depth = max(self.stats.max_depth, len(path) - 1)
+        for n in path:
+            n.visits += len(results)
+            n.value += sum(1.0 if winner == n.player else 0.5 if winner == 0 else 0.0 for winner, _ in results)
+
+    def _expand(self, game: hive_engine.Game, node: _Node) -> None:
+        player = game.get_current_player()
+        actions: list[tuple[int, int, int] | None] = [tuple(a) for a in game.legal_actions_array().tolist()] or [None]
+        priors = self._priors(game, actions)
+        node.children = []
+        for action, prior in zip(actions, priors):
+            orig = _apply(game, action)
+            node.children.append(_Node(action=action, player=player, key=game.get_hash(), prior=prior))
+            _undo(game, action, orig)
+        self.stats.tree_nodes += len(node.children)
+
+    def _priors(self, game: hive_engine.Game, actions: list[tuple[int, int, int] | None]) -> list[float]:
+        """PUCT priors: moves onto a cell next to the opponent's queen weigh queen_prior, others 1."""
+        if self.params.policy != 'puct':
+            return [1.0] * len(actions)
+        queen = game.get_queen_positions()[2 - game.get_current_player()]
+        near = set()
+        if queen is not None:
+            near = {(queen.q + dq, queen.r + dr) for dq, dr in _HEX_NEIGHBORS}
+        weights = [self.params.queen_prior if a is not None and (a[1], a[2]) in near else 1.0
+                   for a in actions]
+        total = sum(weights)
+        return [w / total for w in weights]
+
+    def _select(self, node: _Node) -> _Node:
+        c = self.params.exploration
+        if self.params.policy == 'puct':
+            sqrt_n = math.sqrt(node.visits)
+            return max(node.children, key=lambda ch: ch.q() + c * ch.prior * sqrt_n / (1 + ch.visits))
+        log_n = math.log(node.visits) if node.visits else 0.0
+        return max(node.children, key=lambda ch: math.inf if not ch.visits
+                   else ch.q() + c * math.sqrt(log_n / ch.visits))
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
-import heapq
+import functools
 import math
+import time
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
 import hive_engine
 
 from .base import Agent, Action
+from .eval_cache import EvalCache
+from .proof_search import ProofTable, prove_win, queen_neighbours
+from .search_stats import SearchStats
+from .transposition import TranspositionTable
 
 if TYPE_CHECKING:
     pass
@@ -24,18 +29,89 @@ class MinimaxParams:
     ownership_reward: float = 3.0
     win_reward: float = 100.0
     mp_reward: float = 0.5
+    tt_size: int = 2 ** 16   # transposition table slots, 0 disables the table
+    time_budget_ms: float | None = None   # per-move wall-clock limit, enables iterative deepening
+    node_budget: int | None = None        # per-move node limit, enables iterative deepening
+    eval_cache_size: int = 2 ** 16        # cached evaluations kept across moves, 0 disables the cache
+    pvs: bool = True                      # null-window search after the first move at each node
+    aspiration_window: float | None = 1.0 # iterative-deepening window around the previous score
+    lmr: bool = False                     # late-move reductions for low-ordered candidates
+    lmr_min_moves: int = 2                # candidates searched at full depth before reducing
+    lmr_min_depth: int = 3                # shallowest remaining depth at which moves are reduced
+    lmr_reduction: int = 1                # plies taken off a reduced search
+    futility_margin: float | None = None  # per-ply margin for futility pruning, None disables it
+    futility_depth: int = 2               # deepest remaining depth at which nodes are futility-pruned
+    null_move: bool = False               # pass-based null-move pruning
+    null_move_reduction: int = 2          # plies taken off the search after a pass
+    null_move_min_depth: int = 3          # shallowest remaining depth at which a pass is tried
+    adaptive_beam: bool = True            # choose the beam width per node instead of beam_width
+    beam_min: int = 2                     # adaptive beam: fewest candidates kept
+    beam_max: int = 6                     # adaptive beam: most candidates kept with the budget unspent
+    beam_epsilon: float = 0.25            # adaptive beam: keep candidates within this of the best score
+    full_width_below: int = 6             # adaptive beam: nodes with at most this many moves keep them all
+    reuse_tree: bool = True               # keep the table and principal variation between decisions
+    proof_nodes: int = 0                  # df-pn budget of the forced-win pre-check, 0 disables it
+    proof_plies: int = 3                  # horizon of the pre-check (both sides' moves)
+    proof_min_neighbours: int = 4         # run the pre-check once the opponent's queen has this many neighbours
+    native_eval: bool = True              # evaluate with the engine (Game.evaluate / score_children)
+    backend: str = 'python'               # 'python': this module's search, 'native': the engine's (Game.search)
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when its time or node budget runs out."""
+
+
+class SearchBudget:
+    """Wall-clock and node limits for one search; check() is called once per node."""
+
+    def __init__(self, time_budget_ms: float | None = None, node_budget: int | None = None) -> None:
+        self.time_budget_ms = time_budget_ms
+        self.deadline = time.perf_counter() + time_budget_ms / 1000 if time_budget_ms else None
+        self.node_budget = node_budget
+        self.nodes = 0
+
+    def check(self) -> None:
+        self.nodes += 1
+        if self.node_budget and self.nodes > self.node_budget:
+            raise SearchTimeout
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SearchTimeout
+
+    def remaining(self) -> float:
+        """Fraction of the budget left — the smaller of time and nodes."""
+        fraction = 1.0
+        if self.deadline is not None:
+            fraction = min(fraction, (self.deadline - time.perf_counter()) * 1000 / self.time_budget_ms)
+        if self.node_budget:
+            fraction = min(fraction, 1 - self.nodes / self.node_budget)
+        return max(fraction, 0.0)
 
 
 def _evaluate(game: hive_engine.Game, player: int, params: MinimaxParams) -> float:
     """
     Heuristic evaluation of the current game state from `player`'s perspective.
 
+    Runs in the engine (Game.evaluate) unless params.native_eval is off;
+    _evaluate_py is the reference implementation and gives the same scores.
+    """
+    if params.native_eval:
+        return game.evaluate(_heuristic_params(_eval_fingerprint(params)), player)
+    return _evaluate_py(game, player, params)
+
+
+def _evaluate_py(game: hive_engine.Game, player: int, params: MinimaxParams) -> float:
+    """
+    Heuristic evaluation of the current game state from `player`'s perspective.
+
     Returns a positive score when `player` is advantaged and a negative score
     when the opponent is advantaged.  Four components (all differential):
       - Win/loss detection
       - Queen surrounding (pieces adjacent to each queen)
       - Queen ownership (opponent piece on top of own queen)
       - Mobility (distinct pieces with at least one legal move)
+
+    Reads the board through the engine's array views (piece_locations,
+    stack_heights) rather than converting get_tile_positions().
     """
     winner = game.check_game_over()
     if winner == player:
@@ -43,124 +119,396 @@ def _evaluate(game: hive_engine.Game, player: int, params: MinimaxParams) -> flo
     if winner != 0:
         return -params.win_reward
 
-    tile_positions = game.get_tile_positions()
-    queen_positions = game.get_queen_positions()  # [p1_pos | None, p2_pos | None]
+    locations = game.piece_locations().tolist()   # [player - 1][tile_idx] -> [q, r, level]
+    heights = game.stack_heights().tolist()
+    occupied = {(q, r) for pieces in locations for q, r, level in pieces if level >= 0}
+    # Top piece of every stack: cell -> owner
+    tops = {(q, r): p for p, pieces in enumerate(locations, start=1)
+            for (q, r, level), height in zip(pieces, heights[p - 1]) if level >= 0 and level == height - 1}
     opp = 3 - player
 
     # ── Queen surrounding ──────────────────────────────────────────────────
-    def _count_surrounding(queen_pos: hive_engine.Position | None) -> int:
-        if queen_pos is None:
+    def _count_surrounding(p: int) -> int:
+        q, r, level = locations[p - 1][0]   # tile_idx 0 is the queen
+        if level < 0:
             return 0
-        count = 0
-        for dq, dr in _HEX_NEIGHBORS:
-            neighbour = hive_engine.Position(queen_pos.q + dq, queen_pos.r + dr)
-            if neighbour in tile_positions:
-                count += 1
-        return count
+        return sum((q + dq, r + dr) in occupied for dq, dr in _HEX_NEIGHBORS)
 
-    own_surrounded = _count_surrounding(queen_positions[player - 1])
-    opp_surrounded = _count_surrounding(queen_positions[opp - 1])
-    value = (opp_surrounded - own_surrounded) * params.queen_surrounding_reward
+    value = (_count_surrounding(opp) - _count_surrounding(player)) * params.queen_surrounding_reward
 
     # ── Queen ownership (any opponent piece on top of own queen's stack) ───
-    def _is_owned_by_opp(queen_pos: hive_engine.Position | None, owner: int) -> bool:
-        if queen_pos is None:
-            return False
-        stack = tile_positions.get(queen_pos)
-        if stack and len(stack) > 1 and stack[-1].player != owner:
-            return True
-        return False
-
-    own_owned = 1 if _is_owned_by_opp(queen_positions[player - 1], player) else 0
-    opp_owned = 1 if _is_owned_by_opp(queen_positions[opp - 1], opp) else 0
+    def _is_owned_by_opp(owner: int) -> bool:
+        q, r, level = locations[owner - 1][0]
+        return level >= 0 and heights[owner - 1][0] > 1 and tops[(q, r)] != owner
+
+    own_owned = 1 if _is_owned_by_opp(player) else 0
+    opp_owned = 1 if _is_owned_by_opp(opp) else 0
     value += (opp_owned - own_owned) * params.ownership_reward
 
     # ── Mobility (distinct pieces with ≥1 valid move) ─────────────────────
     def _count_moveable(p: int) -> int:
-        moveable: set[tuple] = set()
-        for pos, stack in tile_positions.items():
-            if stack and stack[-1].player == p:
-                if game.get_valid_moves(pos):
-                    top = stack[-1]
-                    moveable.add((int(top.insect), top.id))
-        return len(moveable)
+        return sum(1 for (q, r), owner in tops.items()
+                   if owner == p and game.get_valid_moves(hive_engine.Position(q, r)))
 
     value += (_count_moveable(player) - _count_moveable(opp)) * params.mp_reward
 
     return value
 
 
-def _beam_minimax(
+def _eval_fingerprint(params: MinimaxParams) -> tuple[float, ...]:
+    """The evaluation weights — the part of params a cached score depends on."""
+    return (params.queen_surrounding_reward, params.ownership_reward,
+            params.win_reward, params.mp_reward)
+
+
+@functools.lru_cache(maxsize=16)
+def _heuristic_params(fingerprint: tuple[float, ...]) -> hive_engine.HeuristicParams:
+    """The engine-side weights for an _eval_fingerprint, built once per distinct set."""
+    queen_surrounding_reward, ownership_reward, win_reward, mp_reward = fingerprint
+    return hive_engine.HeuristicParams(queen_surrounding_reward=queen_surrounding_reward,
+                                       ownership_reward=ownership_reward,
+                                       win_reward=win_reward, mp_reward=mp_reward)
+
+
+def _cached_evaluate(
+    game: hive_engine.Game,
+    player: int,
+    params: MinimaxParams,
+    cache: EvalCache | None,
+) -> float:
+    """_evaluate, looked up in `cache` first if one is given."""
+    if cache is None:
+        return _evaluate(game, player, params)
+    key = (game.get_hash(), player, _eval_fingerprint(params))
+    value = cache.get(key)
+    if value is None:
+        value = _evaluate(game, player, params)
+        cache.put(key, value)
+    return value
+
+
+def _search_evaluate(
+    game: hive_engine.Game,
+    player: int,
+    params: MinimaxParams,
+    cache: EvalCache | None,
+    stats: SearchStats | None,
+    leaf: bool = False,
+) -> float:
+    """_cached_evaluate, timed in `stats` (and counted if `leaf`) when given."""
+    if stats is None:
+        return _cached_evaluate(game, player, params, cache)
+    t0 = time.perf_counter()
+    value = _cached_evaluate(game, player, params, cache)
+    stats.eval_s += time.perf_counter() - t0
+    if leaf:
+        stats.leaf_evals += 1
+    return value
+
+
+def _beam_width(
+    scores: list[float],
+    params: MinimaxParams,
+    beam_width: int,
+    budget: SearchBudget | None,
+) -> int:
+    """
+    Candidates to keep at a node, given its phase-1 scores (side to move's
+    perspective, best first). Fixed at beam_width unless params.adaptive_beam:
+    then nodes with few legal moves keep them all, otherwise every move within
+    params.beam_epsilon of the best is kept, between params.beam_min and an
+    upper limit that falls from params.beam_max over the second half of the budget.
+    """
+    if not params.adaptive_beam:
+        return beam_width
+    if len(scores) <= params.full_width_below:
+        return len(scores)
+    remaining = budget.remaining() if budget is not None else 1.0
+    upper = max(params.beam_min, round(params.beam_max * min(remaining * 2, 1.0)))
+    within = sum(1 for score in scores if score >= scores[0] - params.beam_epsilon)
+    return min(max(within, params.beam_min), upper)
+
+
+_NULL_WINDOW = 1e-6   # PVS scout window width, well below any difference between evaluations
+
+
+def _negamax(
     game: hive_engine.Game,
     depth: int,
-    is_maximizing: bool,
     player: int,
     params: MinimaxParams,
     alpha: float,
     beta: float,
     beam_width: int,
+    tt: TranspositionTable | None = None,
+    budget: SearchBudget | None = None,
+    cache: EvalCache | None = None,
+    stats: SearchStats | None = None,
+    ply: int = 0,
+    after_null: bool = False,
 ) -> tuple[float, hive_engine.Action | None]:
     """
-    Beam-search minimax with alpha-beta pruning.
+    Beam-search negamax with fail-soft alpha-beta and principal variation search.
+
+    Scores are from the perspective of the side to move; evaluations are
+    computed for `player` (the root player) and negated on the opponent's turns.
 
     Two-phase per node:
       1. Shallow-evaluate all legal actions to select top-`beam_width` candidates.
-      2. Recurse only on those candidates with full alpha-beta search.
+      2. Recurse on those candidates: the first with the full window, the rest
+         with a null window around alpha, re-searched only if they beat it.
+
+    Fail-soft: a returned score outside (alpha, beta) is a bound on the true
+    score rather than being clamped to the window.
 
     Uses game.apply_action / game.undo for in-place tree traversal — no deep copy.
+    If a transposition table is given, positions already searched deeply enough
+    return their stored score, and the stored best move is always searched first.
+    If a budget is given SearchTimeout is raised once it runs out; every applied
+    action is undone on the way out, so `game` is left unchanged.
+    Evaluations go through `cache` when one is given.
+
+    Below the root, three selective techniques can be switched on in params:
+      - Futility pruning: within params.futility_depth of the leaves, a node
+        whose static score plus params.futility_margin per remaining ply is
+        still no better than alpha returns that bound without generating moves.
+      - Null move: the side to move passes (game.pass_turn) and the opponent
+        is searched params.null_move_reduction plies shallower with a null
+        window at beta; if passing still fails high, so will a real move.
+        Never twice in a row (`after_null`).
+      - Late-move reductions: candidates after the first params.lmr_min_moves
+        are scouted params.lmr_reduction plies shallower and searched at full
+        depth only if the reduced search beats alpha.
+    `stats` collects node, cutoff and pruning counts and phase times.
     """
+    if budget is not None:
+        budget.check()
+    if stats is not None:
+        stats.node(depth)
+
+    sign = 1 if game.get_current_player() == player else -1
+
     winner = game.check_game_over()
     if winner != 0 or depth == 0:
-        return _evaluate(game, player, params), None
-
-    legal = game.get_legal_actions()
-    if not legal:
-        return _evaluate(game, player, params), None
+        return sign * _search_evaluate(game, player, params, cache, stats, leaf=True), None
+
+    tt_move: hive_engine.Action | None = None
+    if tt is not None:
+        key = game.get_hash()
+        alpha_orig, beta_orig = alpha, beta
+        tt_score, tt_move = tt.lookup(key, depth, alpha, beta)
+        if tt_score is not None:
+            return tt_score, tt_move
+
+    # ── Selective pruning from the static evaluation (never at the root) ──
+    futile = ply > 0 and params.futility_margin is not None and depth <= params.futility_depth
+    try_null = (ply > 0 and params.null_move and not after_null
+                and depth >= params.null_move_min_depth and beta < math.inf)
+    if futile or try_null:
+        static = sign * _search_evaluate(game, player, params, cache, stats)
+        if futile and static + params.futility_margin * depth <= alpha:
+            if stats is not None:
+                stats.futility_prunes += 1
+            return static + params.futility_margin * depth, None   # upper bound, as if every move failed low
+        if try_null and static >= beta:
+            if stats is not None:
+                stats.null_move_tries += 1
+            game.pass_turn()
+            try:
+                val = -_negamax(game, max(depth - 1 - params.null_move_reduction, 0), player, params,
+                                -beta, -beta + _NULL_WINDOW, beam_width, tt, budget, cache, stats,
+                                ply + 1, after_null=True)[0]
+            finally:
+                game.undo_pass()
+            if val >= beta:
+                if stats is not None:
+                    stats.null_move_cutoffs += 1
+                return val, None
 
     # ── Phase 1: shallow evaluation of all moves ───────────────────────────
-    scored: list[tuple[float, hive_engine.Action]] = []
-    for a in legal:
-        orig = game.apply_action(a)
-        score = _evaluate(game, player, params)
-        game.undo(a, orig)
-        scored.append((score, a))
-
-    # ── Phase 2: select top-k candidates ──────────────────────────────────
-    if is_maximizing:
-        candidates = heapq.nlargest(beam_width, scored, key=lambda x: x[0])
+    if params.native_eval:
+        # One engine call generates, applies, scores and undoes every move
+        t0 = time.perf_counter()
+        legal, child_scores = game.score_children(_heuristic_params(_eval_fingerprint(params)), player)
+        if stats is not None:
+            stats.eval_s += time.perf_counter() - t0
+        if not legal:
+            return sign * _search_evaluate(game, player, params, cache, stats, leaf=True), None
+        scored: list[tuple[float, hive_engine.Action]] = list(zip((sign * child_scores).tolist(), legal))
     else:
-        candidates = heapq.nsmallest(beam_width, scored, key=lambda x: x[0])
+        t0 = time.perf_counter()
+        legal = game.get_legal_actions()
+        if stats is not None:
+            stats.movegen_s += time.perf_counter() - t0
+        if not legal:
+            return sign * _search_evaluate(game, player, params, cache, stats, leaf=True), None
+
+        t0 = time.perf_counter()
+        scored = []
+        for a in legal:
+            orig = game.apply_action(a)
+            score = sign * _cached_evaluate(game, player, params, cache)
+            game.undo(a, orig)
+            scored.append((score, a))
+        if stats is not None:
+            stats.eval_s += time.perf_counter() - t0
 
-    # ── Phase 3: recursive alpha-beta on candidates ────────────────────────
+    # ── Phase 2: select top-k candidates ──────────────────────────────────
+    # Ties broken by the action itself: the legal-action order of a Game depends on its history
+    scored.sort(key=lambda x: (-x[0], x[1].tile_idx, x[1].to.q, x[1].to.r))
+    width = _beam_width([score for score, _ in scored], params, beam_width, budget)
+    candidates = [a for _, a in scored[:width]]
+    if stats is not None:
+        stats.beam(len(candidates))
+
+    # The stored best move is searched first, even if it fell outside the beam
+    if tt_move is not None and tt_move in legal:
+        candidates = [tt_move] + [a for a in candidates if a != tt_move]
+
+    # ── Phase 3: recursive PVS on candidates ──────────────────────────────
+    best_val = -math.inf
     best_action: hive_engine.Action | None = None
 
-    if is_maximizing:
-        best_val = -math.inf
-        for _, a in candidates:
-            orig = game.apply_action(a)
-            val, _ = _beam_minimax(game, depth - 1, False, player, params, alpha, beta, beam_width)
+    for i, a in enumerate(candidates):
+        orig = game.apply_action(a)
+        try:
+            if i == 0 or alpha == -math.inf:
+                val = -_negamax(game, depth - 1, player, params, -beta, -alpha,
+                                beam_width, tt, budget, cache, stats, ply + 1)[0]
+            else:
+                val = math.inf
+                if params.lmr and i >= params.lmr_min_moves and depth >= params.lmr_min_depth:
+                    if stats is not None:
+                        stats.lmr_reductions += 1
+                    val = -_negamax(game, depth - 1 - params.lmr_reduction, player, params,
+                                    -alpha - _NULL_WINDOW, -alpha, beam_width, tt, budget, cache,
+                                    stats, ply + 1)[0]
+                    if val > alpha and stats is not None:
+                        stats.lmr_researches += 1
+                if val > alpha:   # not reduced, or the reduced search beat alpha
+                    if not params.pvs:
+                        val = -_negamax(game, depth - 1, player, params, -beta, -alpha,
+                                        beam_width, tt, budget, cache, stats, ply + 1)[0]
+                    else:
+                        val = -_negamax(game, depth - 1, player, params, -alpha - _NULL_WINDOW, -alpha,
+                                        beam_width, tt, budget, cache, stats, ply + 1)[0]
+                        if alpha < val < beta and depth > 1:   # beat alpha — re-search, val is a lower bound
+                            # (children at depth 0 are leaves, whose scout score is already exact)
+                            val = -_negamax(game, depth - 1, player, params, -beta, -val,
+                                            beam_width, tt, budget, cache, stats, ply + 1)[0]
+        finally:
             game.undo(a, orig)
-            if val > best_val:
-                best_val = val
-                best_action = a
-            alpha = max(alpha, val)
-            if beta <= alpha:
-                break
-        return best_val, best_action
+        if val > best_val:
+            best_val = val
+            best_action = a
+        alpha = max(alpha, val)
+        if alpha >= beta:
+            if stats is not None:
+                stats.cutoff(i)
+            break
 
-    else:
-        best_val = math.inf
-        for _, a in candidates:
-            orig = game.apply_action(a)
-            val, _ = _beam_minimax(game, depth - 1, True, player, params, alpha, beta, beam_width)
-            game.undo(a, orig)
-            if val < best_val:
-                best_val = val
-                best_action = a
-            beta = min(beta, val)
-            if beta <= alpha:
-                break
-        return best_val, best_action
+    if tt is not None:
+        tt.store(key, depth, best_val, alpha_orig, beta_orig, best_action)
+    return best_val, best_action
+
+
+def _iterative_deepening(
+    game: hive_engine.Game,
+    player: int,
+    params: MinimaxParams,
+    tt: TranspositionTable,
+    cache: EvalCache | None = None,
+    stats: SearchStats | None = None,
+) -> tuple[float | None, hive_engine.Action | None, int]:
+    """
+    Runs _negamax at depth 1, 2, … params.depth until the time or node
+    budget runs out and returns (score, best_action, depth) of the deepest
+    completed iteration. The shared table puts each iteration's principal
+    variation first in the next. Depth 1 always completes so a move is found
+    however small the budget.
+
+    From depth 2 each iteration searches an aspiration window of
+    ±params.aspiration_window around an earlier score, opening the failing
+    side and re-searching if the result falls outside it. The window is
+    centred on the score from two depths back when there is one, since scores
+    alternate between odd and even depths.
+
+    If `stats` is given, the nodes searched by each completed iteration are
+    recorded in its iteration_nodes.
+    """
+    budget = SearchBudget(params.time_budget_ms, params.node_budget)
+    score: float | None = None
+    best: hive_engine.Action | None = None
+    completed = 0
+    scores: list[float] = []
+
+    for depth in range(1, params.depth + 1):
+        alpha, beta = -math.inf, math.inf
+        if completed and params.aspiration_window is not None:
+            centre = scores[-2] if len(scores) > 1 else score
+            alpha, beta = centre - params.aspiration_window, centre + params.aspiration_window
+        nodes_before = stats.nodes if stats is not None else 0
+        try:
+            while True:
+                result, action = _negamax(
+                    game, depth, player, params, alpha, beta,
+                    params.beam_width, tt, budget if completed else None, cache, stats,
+                )
+                if result <= alpha:
+                    alpha = -math.inf
+                elif result >= beta:
+                    beta = math.inf
+                else:
+                    break
+        except SearchTimeout:
+            break
+        score, best = result, action
+        scores.append(score)
+        completed = depth
+        if stats is not None:
+            stats.iteration_nodes[depth] = stats.nodes - nodes_before
+        if best is None or abs(score) >= params.win_reward / 2:   # no moves or result decided
+            break
+
+    return score, best, completed
+
+
+_NATIVE_SEARCH_FIELDS = (
+    'depth', 'beam_width', 'tt_size', 'pvs', 'aspiration_window', 'lmr', 'lmr_min_moves',
+    'lmr_min_depth', 'lmr_reduction', 'futility_margin', 'futility_depth', 'null_move',
+    'null_move_reduction', 'null_move_min_depth', 'adaptive_beam', 'beam_min', 'beam_max',
+    'beam_epsilon', 'full_width_below',
+)
+
+
+def _search_params(params: MinimaxParams) -> hive_engine.SearchParams:
+    """params as the engine's SearchParams, for the native backend."""
+    native = hive_engine.SearchParams()
+    for name in _NATIVE_SEARCH_FIELDS:
+        setattr(native, name, getattr(params, name))
+    native.heuristic = _heuristic_params(_eval_fingerprint(params))
+    return native
+
+
+def principal_variation(
+    game: hive_engine.Game, tt: TranspositionTable, max_length: int,
+) -> list[tuple[hive_engine.Action, int]]:
+    """
+    Follows the best moves stored in `tt` from the current position and
+    returns up to max_length (action, hash of the position after it) pairs.
+    `game` is left unchanged.
+    """
+    line: list[tuple[hive_engine.Action, int]] = []
+    applied = []
+    while len(line) < max_length:
+        entry = tt.peek(game.get_hash())
+        if entry is None or entry.best_move is None or entry.best_move not in game.get_legal_actions():
+            break
+        applied.append((entry.best_move, game.apply_action(entry.best_move)))
+        line.append((entry.best_move, game.get_hash()))
+    for action, orig in reversed(applied):
+        game.undo(action, orig)
+    return line
 
 
 class MinimaxAgentPy(Agent):
@@ -168,17 +516,127 @@ class MinimaxAgentPy(Agent):
     Depth-limited beam-search minimax agent.
 
     All configuration (depth, beam_width, heuristic weights) is held in params.
+    With a time or node budget set, params.depth is the maximum depth of an
+    iterative-deepening search and depth_reached records how far it got.
+    After each decision, stats holds its SearchStats and latency_ms its
+    wall-clock time.
+
+    With params.reuse_tree the transposition table lives as long as the
+    agent, so positions searched for one decision (the subtree under the move
+    played and the replies already considered) start the next one warm, and
+    pv keeps the expected continuation. If the game followed it, the rest of
+    the line is written back into the table so it is searched first even if
+    its entries were replaced.
+
+    With params.proof_nodes set, positions where the opponent's queen has at
+    least params.proof_min_neighbours neighbours are first given to the df-pn
+    solver (proof_search.py); a proven forced win is played without searching.
+
+    With params.backend == 'native' the search itself runs in the engine
+    (Game.search, with the GIL released): the same tree as the Python search
+    with native_eval, but with a table that lasts one decision and no
+    evaluation cache, so reuse_tree and eval_cache_size have no effect. The
+    Python search stays the reference implementation.
     """
 
     def __init__(self, params: MinimaxParams) -> None:
         self.params = params
+        self.tt: TranspositionTable | None = None
+        self.pv: list[tuple[hive_engine.Action, int]] = []   # (action, hash after it) from the last decision
+        self.depth_reached: int | None = None
+        self.eval_cache = EvalCache(params.eval_cache_size) if params.eval_cache_size else None
+        self.stats = SearchStats()
+        self.latency_ms: float | None = None
+        self.proof_table = ProofTable() if params.proof_nodes else None
 
     def select_action(self, game: hive_engine.Game) -> Action | None:
+        t0 = time.perf_counter()
         player = game.get_current_player()
-        _, best = _beam_minimax(
-            game, self.params.depth, True, player, self.params,
-            -math.inf, math.inf, self.params.beam_width,
-        )
+        self.stats = SearchStats()
+        winning = self._prove_win(game, player)
+        if winning is not None:
+            self.pv = []
+            self.depth_reached = self.params.proof_plies
+            self.latency_ms = (time.perf_counter() - t0) * 1000
+            return Action(tile_idx=winning.tile_idx, to=(winning.to.q, winning.to.r))
+        if self.params.backend == 'native':
+            best = self._native_search(game)
+            self.latency_ms = (time.perf_counter() - t0) * 1000
+            if best is None:
+                return None
+            return Action(tile_idx=best.tile_idx, to=(best.to.q, best.to.r))
+        iterative = bool(self.params.time_budget_ms or self.params.node_budget)
+        if self.params.reuse_tree and self.tt is not None:
+            self.tt.new_search()
+            self._follow_pv(game)
+        elif self.params.tt_size:
+            self.tt = TranspositionTable(self.params.tt_size)
+        else:
+            self.tt = TranspositionTable() if iterative else None   # carries the PV between iterations
+        if self.eval_cache is not None:
+            self.eval_cache.reset_stats()
+        if iterative:
+            self.stats.start(self.tt, self.eval_cache)
+            _, best, self.depth_reached = _iterative_deepening(
+                game, player, self.params, self.tt, self.eval_cache, self.stats)
+        else:
+            self.stats.start(self.tt, self.eval_cache)
+            _, best = _negamax(
+                game, self.params.depth, player, self.params,
+                -math.inf, math.inf, self.params.beam_width, self.tt, cache=self.eval_cache,
+                stats=self.stats,
+            )
+            self.depth_reached = self.params.depth
+        self.stats.stop()
+        if self.params.reuse_tree and self.tt is not None:
+            self.pv = principal_variation(game, self.tt, self.depth_reached or 0)
+        self.latency_ms = (time.perf_counter() - t0) * 1000
         if best is None:
             return None
         return Action(tile_idx=best.tile_idx, to=(best.to.q, best.to.r))
+
+    def _native_search(self, game: hive_engine.Game) -> hive_engine.Action | None:
+        """Runs Game.search and copies its counters into stats."""
+        result = game.search(_search_params(self.params), self.params.time_budget_ms, self.params.node_budget)
+        for name in ('nodes', 'leaf_evals', 'cutoffs', 'first_move_cutoffs', 'tt_probes', 'tt_hits',
+                     'lmr_reductions', 'lmr_researches', 'futility_prunes', 'null_move_tries',
+                     'null_move_cutoffs', 'elapsed_s'):
+            setattr(self.stats, name, getattr(result, name))
+        self.stats.depth_nodes = dict(result.depth_nodes)
+        self.stats.iteration_nodes = dict(result.iteration_nodes)
+        self.stats.beam_widths = dict(result.beam_widths)
+        self.depth_reached = result.depth
+        self.pv = []
+        return result.action
+
+    def _prove_win(self, game: hive_engine.Game, player: int) -> hive_engine.Action | None:
+        """The first move of a forced win found by the df-pn pre-check, or None."""
+        if self.proof_table is None or queen_neighbours(game, 3 - player) < self.params.proof_min_neighbours:
+            return None
+        t0 = time.perf_counter()
+        proof = prove_win(game, self.params.proof_plies, self.params.proof_nodes, self.proof_table)
+        self.stats.proof_nodes = proof.nodes
+        self.stats.proof_s = time.perf_counter() - t0
+        self.stats.proven_win = proof.proven
+        return proof.move
+
+    def _follow_pv(self, game: hive_engine.Game) -> None:
+        """
+        Before a search with the kept table: if the game reached a position on
+        the last principal variation, store the rest of the line as best moves,
+        and record in stats how deep the current position was already searched.
+        """
+        key = game.get_hash()
+        keys = [k for _, k in self.pv]
+        if key in keys:
+            self.stats.pv_hit = True
+            applied = []
+            for action, _ in self.pv[keys.index(key) + 1:]:
+                if action not in game.get_legal_actions():
+                    break
+                self.tt.store_move(game.get_hash(), action)
+                applied.append((action, game.apply_action(action)))
+            for action, orig in reversed(applied):
+                game.undo(action, orig)
+        entry = self.tt.peek(key)
+        self.stats.reused_depth = entry.depth if entry is not None else 0
@@ -0,0 +1,62 @@
+"""
+Thread-pool helpers over the hive_engine calls that release the GIL.
+
+Move generation, apply_action / undo, evaluation, Game.search and
+Game.playouts all run without the GIL, so threads scale across cores as long
+as each Game is only mutated by one thread at a time. Const calls
+(get_legal_actions, playouts, …) may share a Game; anything that applies
+actions (Game.search, a Python search) needs its own.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Iterable
+
+import numpy as np
+
+import hive_engine
+
+from .minimax_agent_py import MinimaxParams, _search_params
+
+
+def _map(fn, items: Iterable, workers: int | None, executor: Executor | None) -> list:
+    if executor is not None:
+        return list(executor.map(fn, items))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, items))
+
+
+def search_many(
+    games: list[hive_engine.Game],
+    params: MinimaxParams,
+    workers: int | None = None,
+    executor: Executor | None = None,
+) -> list[hive_engine.SearchResult]:
+    """
+    Game.search on each of `games` (distinct objects — game.clone() one
+    position to search it several ways) in a thread pool, with
+    params.time_budget_ms / node_budget per search. Results are in input order.
+    """
+    native = _search_params(params)
+    return _map(lambda game: game.search(native, params.time_budget_ms, params.node_budget),
+                games, workers, executor)
+
+
+def parallel_playouts(
+    game: hive_engine.Game,
+    n: int,
+    max_plies: int = 200,
+    seed: int = 0,
+    workers: int = 4,
+    executor: Executor | None = None,
+) -> np.ndarray:
+    """
+    game.playouts(n, max_plies) split into `workers` batches run concurrently
+    on the same (unmodified) game, each batch with its own seed derived from
+    `seed`. Returns the (n, 2) [winner, plies] array.
+    """
+    sizes = [n // workers + (i < n % workers) for i in range(workers)]
+    batches = [(size, seed + i) for i, size in enumerate(sizes) if size]
+    results = _map(lambda batch: game.playouts(batch[0], max_plies, batch[1]), batches, workers, executor)
+    return np.concatenate(results) if results else np.zeros((0, 2), dtype=np.int32)
@@ -0,0 +1,195 @@
+"""
+Depth-first proof-number search (df-pn) for forced wins.
+
+Answers one question exactly: can the side to move force a win within
+`max_plies`? The heuristic search can only estimate this, and either misses
+a forced queen surround a few plies deep or spends its budget reaching it.
+
+Every node holds a proof number phi and a disproof number delta from the
+perspective of the player to move there (phi = 0: that player wins). The
+side to move at the root is the attacker; draws, running out of plies and
+every other outcome count as wins for the defender, so a proof is a forced
+win and a disproof only means there is none within the horizon. df-pn
+expands the most-proving node depth-first under thresholds, and a
+ProofTable of its own (separate from the minimax transposition table) keeps
+the numbers of positions already seen. A player without legal actions passes.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import IntEnum
+
+import hive_engine
+
+INF = 10 ** 9   # phi/delta of a solved node
+
+_HEX_NEIGHBORS: list[tuple[int, int]] = [(0, 1), (1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1)]
+
+
+class ProofStatus(IntEnum):
+    UNKNOWN = 0     # node budget ran out
+    PROVEN = 1      # the side to move forces a win
+    DISPROVEN = 2   # no forced win within the horizon
+
+
+@dataclass
+class ProofResult:
+    status: ProofStatus
+    move: hive_engine.Action | None   # first move of the proof when proven
+    nodes: int
+
+    @property
+    def proven(self) -> bool:
+        return self.status == ProofStatus.PROVEN
+
+
+class ProofTable:
+    """
+    Direct-mapped table of (phi, delta) keyed by position hash and plies left.
+
+    The plies are part of the key because a disproof only holds for the
+    horizon it was searched with. Entries are always overwritten.
+    """
+
+    def __init__(self, size: int = 2 ** 16) -> None:
+        self.size = size
+        self._entries: list[tuple[int, int, int] | None] = [None] * size
+
+    def _key(self, key: int, plies: int) -> int:
+        return key ^ (plies * 0x9E3779B97F4A7C15 & 0xFFFFFFFFFFFFFFFF)
+
+    def get(self, key: int, plies: int) -> tuple[int, int]:
+        key = self._key(key, plies)
+        entry = self._entries[key % self.size]
+        if entry is not None and entry[0] == key:
+            return entry[1], entry[2]
+        return 1, 1
+
+    def put(self, key: int, plies: int, phi: int, delta: int) -> None:
+        key = self._key(key, plies)
+        self._entries[key % self.size] = (key, phi, delta)
+
+    def clear(self) -> None:
+        self._entries = [None] * self.size
+
+
+class _OutOfBudget(Exception):
+    pass
+
+
+def queen_neighbours(game: hive_engine.Game, player: int) -> int:
+    """Occupied cells around `player`'s queen, 0 if it is not placed."""
+    q, r, level = game.queen_cells()[player - 1].tolist()
+    if level < 0:
+        return 0
+    occupied = {(cq, cr) for pieces in game.piece_locations().tolist() for cq, cr, lvl in pieces if lvl >= 0}
+    return sum((q + dq, r + dr) in occupied for dq, dr in _HEX_NEIGHBORS)
+
+
+def prove_win(
+    game: hive_engine.Game,
+    max_plies: int = 5,
+    node_budget: int = 20_000,
+    table: ProofTable | None = None,
+) -> ProofResult:
+    """
+    df-pn from the current position: does the side to move force a win
+    within max_plies (counting both sides' moves, so 5 is three of its own)?
+    Expands at most node_budget nodes; `game` is left unchanged.
+    """
+    if game.is_over():
+        return ProofResult(ProofStatus.DISPROVEN, None, 0)
+    solver = _DFPN(game, game.get_current_player(), table or ProofTable(), node_budget, max_plies)
+    try:
+        phi, _ = solver.mid(max_plies, INF, INF)
+    except _OutOfBudget:
+        return ProofResult(ProofStatus.UNKNOWN, None, solver.nodes)
+    if phi == 0:
+        return ProofResult(ProofStatus.PROVEN, solver.root_move, solver.nodes)
+    return ProofResult(ProofStatus.DISPROVEN, None, solver.nodes)
+
+
+class _DFPN:
+    def __init__(self, game: hive_engine.Game, attacker: int, table: ProofTable, node_budget: int,
+                 max_plies: int) -> None:
+        self.game = game
+        self.attacker = attacker
+        self.table = table
+        self.node_budget = node_budget
+        self.max_plies = max_plies
+        self.nodes = 0
+        self.root_move: hive_engine.Action | None = None
+
+    def _fails(self) -> tuple[int, int]:
+        """(phi, delta) of a node where the attacker can no longer win, seen by its mover."""
+        return (INF, 0) if self.game.get_current_player() == self.attacker else (0, INF)
+
+    def _children(self, plies: int) -> list[list]:
+        """
+        [action, phi, delta] per child, from the child's mover's view.
+        Children that end the game, or would be searched with no plies left,
+        are solved here. action None is a pass.
+        """
+        game = self.game
+        actions: list[hive_engine.Action | None] = list(game.get_legal_actions()) or [None]
+        children = []
+        for action in actions:
+            orig = game.apply_action(action) if action is not None else game.pass_turn()
+            if game.is_over():
+                # check_game_over() is 0 for a draw too: a finished draw counts against the attacker
+                winner = game.check_game_over()
+                attacker_to_move = game.get_current_player() == self.attacker
+                if winner == 0:
+                    phi, delta = self._fails()
+                else:
+                    phi, delta = (0, INF) if (winner == self.attacker) == attacker_to_move else (INF, 0)
+            elif plies == 1:
+                phi, delta = self._fails()
+            else:
+                phi, delta = self.table.get(game.get_hash(), plies - 1)
+            children.append([action, phi, delta])
+            if action is not None:
+                game.undo(action, orig)
+            else:
+                game.undo_pass()
+        return children
+
+    def mid(self, plies: int, th_phi: int, th_delta: int) -> tuple[int, int]:
+        """Searches the current position until phi >= th_phi or delta >= th_delta."""
+        self.nodes += 1
+        if self.nodes > self.node_budget:
+            raise _OutOfBudget
+        game = self.game
+        key = game.get_hash()
+        children = self._children(plies)
+
+        while True:
+            phi = min(c[2] for c in children)
+            delta = min(sum(c[1] for c in children), INF)
+            if phi >= th_phi or delta >= th_delta:
+                break
+            best = second = None
+            for c in children:
+                if best is None or c[2] < best[2]:
+                    best, second = c, best
+                elif second is None or c[2] < second[2]:
+                    second = c
+            delta2 = second[2] if second is not None else INF
+            child_th_phi = min(th_delta - delta + best[1], INF)
+            child_th_delta = min(th_phi, delta2 + 1)
+
+            action = best[0]
+            orig = game.apply_action(action) if action is not None else game.pass_turn()
+            try:
+                best[1], best[2] = self.mid(plies - 1, child_th_phi, child_th_delta)
+            finally:
+                if action is not None:
+                    game.undo(action, orig)
+                else:
+                    game.undo_pass()
+
+        self.table.put(key, plies, phi, delta)
+        if plies == self.max_plies and phi == 0:
+            self.root_move = next(c[0] for c in children if c[2] == 0)
+        return phi, delta
@@ -9,9 +9,8 @@ class RandomAgent(Agent):
     """Selects uniformly at random from legal actions."""
 
     def select_action(self, game: hive_engine.Game) -> Action | None:
-        actions = game.get_legal_actions()
-        if not actions:
+        actions = game.legal_actions_array()   # (N, 3): tile_idx, q, r
+        if not len(actions):
             return None
-        a = random.choice(actions)
-        # pybind11 exposes Action as an object with .tile_idx and .to
-        return Action(tile_idx=a.tile_idx, to=(a.to.q, a.to.r))
+        tile_idx, q, r = actions[random.randrange(len(actions))].tolist()
+        return Action(tile_idx=tile_idx, to=(q, r))
@@ -0,0 +1,167 @@
+"""
+Statistics for one MinimaxAgentPy decision.
+
+The search adds to a SearchStats passed down the tree instead of a global
+counter, so each decision (and each agent) has its own counters. Phase times
+split the search into move generation (get_legal_actions), evaluation
+(phase-1 scoring and leaves) and recursion — everything else: applying and
+undoing actions, table lookups and bookkeeping.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from .eval_cache import EvalCache
+from .transposition import TranspositionTable
+
+
+@dataclass
+class SearchStats:
+    nodes: int = 0
+    leaf_evals: int = 0            # evaluations at leaves (phase-1 scoring not included)
+    cutoffs: int = 0
+    first_move_cutoffs: int = 0    # cutoffs caused by the first candidate searched
+    depth_nodes: dict[int, int] = field(default_factory=dict)       # remaining depth -> nodes
+    iteration_nodes: dict[int, int] = field(default_factory=dict)   # iterative deepening: depth -> nodes
+    beam_widths: dict[int, int] = field(default_factory=dict)       # beam width -> nodes searched with it
+    tt_probes: int = 0
+    tt_hits: int = 0
+    cache_lookups: int = 0
+    cache_hits: int = 0
+    reused_depth: int = 0          # depth the root was already searched to by the previous decision
+    pv_hit: bool = False           # the game followed the previous decision's principal variation
+    proof_nodes: int = 0           # nodes of the df-pn forced-win pre-check, 0 if it did not run
+    proven_win: bool = False       # the pre-check proved a win and the search was skipped
+
+    # Selective search (see MinimaxParams)
+    lmr_reductions: int = 0        # moves searched at reduced depth
+    lmr_researches: int = 0        # reduced searches that beat alpha and were repeated at full depth
+    futility_prunes: int = 0       # nodes cut off by the static evaluation before generating moves
+    null_move_tries: int = 0
+    null_move_cutoffs: int = 0     # passes that still failed high
+
+    # Seconds
+    movegen_s: float = 0.0
+    eval_s: float = 0.0
+    proof_s: float = 0.0
+    elapsed_s: float = 0.0
+
+    _start: float | None = field(default=None, repr=False)
+    _tables: tuple[Any, ...] = field(default=(None, None, 0, 0, 0, 0), repr=False)
+
+    def start(self, tt: TranspositionTable | None = None, cache: EvalCache | None = None) -> None:
+        """Start the clock; TT and cache hit rates are measured from their counters until stop()."""
+        self._start = time.perf_counter()
+        self._tables = (tt, cache,
+                        tt.probes if tt else 0, tt.hits if tt else 0,
+                        cache.hits + cache.misses if cache else 0, cache.hits if cache else 0)
+
+    def stop(self) -> None:
+        if self._start is not None:
+            self.elapsed_s += time.perf_counter() - self._start
+            self._start = None
+        tt, cache, tt_probes, tt_hits, cache_lookups, cache_hits = self._tables
+        if tt is not None:
+            self.tt_probes += tt.probes - tt_probes
+            self.tt_hits += tt.hits - tt_hits
+        if cache is not None:
+            self.cache_lookups += cache.hits + cache.misses - cache_lookups
+            self.cache_hits += cache.hits - cache_hits
+        self._tables = (None, None, 0, 0, 0, 0)
+
+    def node(self, depth: int) -> None:
+        self.nodes += 1
+        self.depth_nodes[depth] = self.depth_nodes.get(depth, 0) + 1
+
+    def beam(self, width: int) -> None:
+        self.beam_widths[width] = self.beam_widths.get(width, 0) + 1
+
+    @property
+    def mean_beam_width(self) -> float:
+        nodes = sum(self.beam_widths.values())
+        return sum(width * n for width, n in self.beam_widths.items()) / nodes if nodes else 0.0
+
+    def cutoff(self, move_number: int) -> None:
+        self.cutoffs += 1
+        if move_number == 0:
+            self.first_move_cutoffs += 1
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    @property
+    def tt_hit_rate(self) -> float:
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    @property
+    def cache_hit_rate(self) -> float:
+        return self.cache_hits / self.cache_lookups if self.cache_lookups else 0.0
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.elapsed_s if self.elapsed_s else 0.0
+
+    @property
+    def recursion_s(self) -> float:
+        return max(self.elapsed_s - self.movegen_s - self.eval_s, 0.0)
+
+    def branching_factors(self) -> dict[int, float]:
+        """
+        Effective branching factor per depth: the ratio of nodes searched by
+        consecutive iterative-deepening iterations, or for a single fixed-depth
+        search the ratio of nodes at consecutive plies (depth 1 = root's children).
+        """
+        if len(self.iteration_nodes) > 1:
+            return {depth: nodes / self.iteration_nodes[depth - 1]
+                    for depth, nodes in sorted(self.iteration_nodes.items())
+                    if self.iteration_nodes.get(depth - 1)}
+        root = max(self.depth_nodes, default=0)
+        return {root - depth: self.depth_nodes.get(depth, 0) / self.depth_nodes[depth + 1]
+                for depth in range(root - 1, -1, -1) if self.depth_nodes.get(depth + 1)}
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'nodes': self.nodes,
+            'leaf_evals': self.leaf_evals,
+            'cutoffs': self.cutoffs,
+            'first_move_cutoff_rate': self.first_move_cutoff_rate,
+            'tt_hit_rate': self.tt_hit_rate,
+            'cache_hit_rate': self.cache_hit_rate,
+            'branching_factors': self.branching_factors(),
+            'beam_widths': dict(self.beam_widths),
+            'mean_beam_width': self.mean_beam_width,
+            'nodes_per_second': self.nodes_per_second,
+            'reused_depth': self.reused_depth,
+            'pv_hit': self.pv_hit,
+            'proof_nodes': self.proof_nodes,
+            'proven_win': self.proven_win,
+            'proof_s': self.proof_s,
+            'lmr_reductions': self.lmr_reductions,
+            'lmr_researches': self.lmr_researches,
+            'futility_prunes': self.futility_prunes,
+            'null_move_tries': self.null_move_tries,
+            'null_move_cutoffs': self.null_move_cutoffs,
+            'elapsed_s': self.elapsed_s,
+            'movegen_s': self.movegen_s,
+            'eval_s': self.eval_s,
+            'recursion_s': self.recursion_s,
+        }
+
+    def summary(self) -> str:
+        ebf = ' '.join(f'{depth}:{bf:.1f}' for depth, bf in self.branching_factors().items())
+        proof = (f', proof: {self.proof_nodes} nodes in {1000 * self.proof_s:.0f} ms'
+                 f'{" (forced win)" if self.proven_win else ""}' if self.proof_nodes else '')
+        beam = (f'{self.mean_beam_width:.1f} mean ({min(self.beam_widths)}-{max(self.beam_widths)})'
+                if self.beam_widths else '-')
+        return (f'nodes: {self.nodes} ({self.nodes_per_second:.0f}/s), leaf evals: {self.leaf_evals}, '
+                f'cutoffs: {self.cutoffs} ({100 * self.first_move_cutoff_rate:.1f}% first move), '
+                f'TT hit rate: {100 * self.tt_hit_rate:.1f}%, cache hit rate: {100 * self.cache_hit_rate:.1f}%, '
+                f'EBF: {ebf or "-"}, beam: {beam}, reused depth: {self.reused_depth}{" (PV hit)" if self.pv_hit else ""}, '
+                f'LMR: {self.lmr_reductions} reduced / {self.lmr_researches} re-searched, '
+                f'futility: {self.futility_prunes}, null move: {self.null_move_cutoffs}/{self.null_move_tries} '
+                f'cutoffs, time: {1000 * self.elapsed_s:.0f} ms (movegen {1000 * self.movegen_s:.0f}, '
+                f'eval {1000 * self.eval_s:.0f}, recursion {1000 * self.recursion_s:.0f}){proof}')
@@ -0,0 +1,135 @@
+"""
+Fixed-size transposition table keyed by hive_engine.Game.get_hash().
+
+Positions reached through transposed move orders (very common in Hive since
+placements commute) are searched once; later visits reuse the stored score if
+it was searched at least as deep, or at least try the stored best move first.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any
+
+
+class Bound(IntEnum):
+    EXACT = 0
+    LOWER = 1   # search failed high — true score is at least the stored score
+    UPPER = 2   # search failed low — true score is at most the stored score
+
+
+@dataclass(slots=True)
+class TTEntry:
+    key: int
+    depth: int
+    score: float
+    bound: Bound
+    best_move: Any
+    age: int
+
+
+class TranspositionTable:
+    """
+    Direct-mapped table of `size` slots.
+
+    Replacement: a slot is overwritten when empty, when it holds the same
+    position, when its entry is from an earlier search (older age), or when
+    the new result was searched at least as deep.
+    """
+
+    def __init__(self, size: int = 2 ** 16) -> None:
+        self.size = size
+        self._entries: list[TTEntry | None] = [None] * size
+        self.age = 0
+
+        self.probes = 0
+        self.hits = 0
+        self.cutoffs = 0   # probes answered without searching the subtree
+        self.stores = 0
+
+    def new_search(self) -> None:
+        """Start a new search: existing entries are kept but replaced first."""
+        self.age += 1
+
+    def clear(self) -> None:
+        self._entries = [None] * self.size
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.probes = self.hits = self.cutoffs = self.stores = 0
+
+    def probe(self, key: int) -> TTEntry | None:
+        self.probes += 1
+        entry = self._entries[key % self.size]
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def peek(self, key: int) -> TTEntry | None:
+        """The entry stored for key, without counting a probe."""
+        entry = self._entries[key % self.size]
+        return entry if entry is not None and entry.key == key else None
+
+    def lookup(self, key: int, depth: int, alpha: float, beta: float) -> tuple[float | None, Any]:
+        """
+        Returns (score, best_move). score is None unless the stored result was
+        searched to at least `depth` with a bound tight enough to return
+        without searching; best_move is worth trying first either way.
+        """
+        entry = self.probe(key)
+        if entry is None:
+            return None, None
+        if entry.depth >= depth:
+            if (entry.bound == Bound.EXACT
+                    or (entry.bound == Bound.LOWER and entry.score >= beta)
+                    or (entry.bound == Bound.UPPER and entry.score <= alpha)):
+                self.cutoffs += 1
+                return entry.score, entry.best_move
+        return None, entry.best_move
+
+    def store(self, key: int, depth: int, score: float, alpha: float, beta: float,
+              best_move: Any) -> None:
+        """Store a result searched with window (alpha, beta)."""
+        idx = key % self.size
+        entry = self._entries[idx]
+        if (entry is not None and entry.key != key
+                and entry.age == self.age and entry.depth > depth):
+            return
+
+        if score <= alpha:
+            bound = Bound.UPPER
+        elif score >= beta:
+            bound = Bound.LOWER
+        else:
+            bound = Bound.EXACT
+
+        if entry is not None and entry.key == key and best_move is None:
+            best_move = entry.best_move
+        self._entries[idx] = TTEntry(key, depth, score, bound, best_move, self.age)
+        self.stores += 1
+
+    def store_move(self, key: int, best_move: Any) -> None:
+        """
+        Record a best move to try first without a score, e.g. a principal
+        variation kept from an earlier search. Stored at depth 0, so it never
+        answers a lookup, and only into a slot that is empty or from an earlier
+        search; an entry already held for the position keeps its own move.
+        """
+        idx = key % self.size
+        entry = self._entries[idx]
+        if entry is not None and entry.key == key:
+            if entry.best_move is None:
+                entry.best_move = best_move
+            return
+        if entry is None or entry.age < self.age:
+            self._entries[idx] = TTEntry(key, 0, 0.0, Bound.EXACT, best_move, self.age)
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+    def summary(self) -> str:
+        return (f"TT probes: {self.probes}, hit rate: {100 * self.hit_rate:.1f}%, "
+                f"cutoffs: {self.cutoffs}, stores: {self.stores}")
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Headless arena: plays many games between two agents on a thread pool.
+
+Each game gets its own hive_engine.Game and its own pair of agents (agents
+keep per-game state such as transposition tables and search trees), so games
+share nothing and run on separate threads. The engine releases the GIL in
+move generation, apply_action / undo, evaluation and the native search, so
+games whose agents spend their time in the engine (backend='native'
+minimax, MCTS playouts) scale with the number of workers; the Python
+search and the random agent mostly hold the GIL and do not.
+
+Like the legacy py/arena.py, a game can be adjudicated as soon as the df-pn
+solver proves a forced win for the side to move.
+
+Usage:
+    python arena.py --player1 minimax_py --player2 random --games 8 --workers 4
+    python arena.py --player1 mcts --player2 minimax_py --games 4 --max-turns 40 --adjudicate 2000
+    python arena.py --player1 minimax_py --player2 random --games 1 --log-stats
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import hive_engine
+
+from agents import Agent, RandomAgent, MinimaxAgentPy, MinimaxParams, MCTSAgent, MCTSParams
+from agents.proof_search import ProofTable, prove_win, queen_neighbours
+
+_CONFIG_PATH = Path(__file__).parent / 'config.json'
+
+
+def agent_factory(name: str, config_path: Path = _CONFIG_PATH) -> Callable[[], Agent]:
+    """A function building a fresh agent per game, configured from config.json like main.py."""
+    cfg = json.loads(config_path.read_text()) if config_path.exists() else {}
+    if name == 'random':
+        return RandomAgent
+    if name == 'minimax_py':
+        return lambda: MinimaxAgentPy(MinimaxParams(**cfg.get('minimax', {})))
+    if name == 'mcts':
+        return lambda: MCTSAgent(MCTSParams(**cfg.get('mcts', {})))
+    raise ValueError(f"Unknown agent type: {name!r}. Valid: random, minimax_py, mcts")
+
+
+@dataclass
+class GameRecord:
+    winner: int              # 1, 2, or 0 for a draw
+    plies: int
+    adjudicated: bool        # ended early by a proven forced win
+    elapsed_s: float
+
+
+class Arena:
+    """
+    Plays games between agents built by `player1` / `player2` (called once
+    per game) with up to `workers` games in flight.
+    """
+
+    def __init__(
+        self,
+        player1: Callable[[], Agent],
+        player2: Callable[[], Agent],
+        max_turns: int = 50,
+        simplified: bool = False,
+        workers: int = 4,
+        adjudicate_nodes: int = 0,
+        adjudicate_plies: int = 5,
+        log_stats: bool = False,
+    ) -> None:
+        self.player1 = player1
+        self.player2 = player2
+        self.max_turns = max_turns
+        self.simplified = simplified
+        self.workers = workers
+        self.adjudicate_nodes = adjudicate_nodes   # df-pn budget, 0 plays every game out
+        self.adjudicate_plies = adjudicate_plies
+        self.log_stats = log_stats                 # print agent.stats.summary() after every move
+
+    def play_game(self, game_id: int = 0) -> GameRecord:
+        t0 = time.perf_counter()
+        game = hive_engine.Game(self.max_turns, self.simplified)
+        agents = {1: self.player1(), 2: self.player2()}
+        proof_table = ProofTable() if self.adjudicate_nodes else None
+        plies = 0
+        while not game.is_over():   # check_game_over() is 0 for a draw too
+            player = game.get_current_player()
+            action = agents[player].select_action(game)
+            if action is None:
+                game.pass_turn()
+            else:
+                game.apply_action(hive_engine.Action(action.tile_idx, hive_engine.Position(*action.to)))
+            plies += 1
+            stats = getattr(agents[player], 'stats', None)
+            if self.log_stats and stats is not None:
+                # One write per line, so lines from concurrent games interleave but do not mix
+                sys.stdout.write(f'Game {game_id} move {plies} (player {player}): {stats.summary()}\n')
+            if proof_table is not None and self._adjudicate(game, proof_table):
+                return GameRecord(game.get_current_player(), plies, True, time.perf_counter() - t0)
+        return GameRecord(game.check_game_over(), plies, False, time.perf_counter() - t0)
+
+    def _adjudicate(self, game: hive_engine.Game, table: ProofTable) -> bool:
+        """Whether the side to move has a proven forced win (tried once the opponent's queen has four neighbours)."""
+        if game.is_over() or queen_neighbours(game, 3 - game.get_current_player()) < 4:
+            return False
+        return prove_win(game, self.adjudicate_plies, self.adjudicate_nodes, table).proven
+
+    def run(self, num_games: int) -> list[GameRecord]:
+        """Plays num_games games; records are in the order the games were started."""
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(self.play_game, i) for i in range(num_games)]
+            return [f.result() for f in futures]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Play games between two agents on a thread pool')
+    parser.add_argument('--player1', default='minimax_py', help='random | minimax_py | mcts')
+    parser.add_argument('--player2', default='random', help='random | minimax_py | mcts')
+    parser.add_argument('--games', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=4, help='Games played concurrently')
+    parser.add_argument('--max-turns', type=int, default=50, help='Turns before the game is scored (-1 = unlimited)')
+    parser.add_argument('--simplified', action='store_true', help='Simplified game: queen surrounded by 3 = loss')
+    parser.add_argument('--adjudicate', type=int, default=0,
+                        help='End games once a forced win is proven within this many nodes (0 plays them out)')
+    parser.add_argument('--log-stats', action='store_true',
+                        help='Log search statistics after every move of an agent that keeps them')
+    args = parser.parse_args()
+
+    arena = Arena(agent_factory(args.player1), agent_factory(args.player2), args.max_turns, args.simplified,
+                  args.workers, args.adjudicate, log_stats=args.log_stats)
+    t0 = time.perf_counter()
+    records = arena.run(args.games)
+    elapsed = time.perf_counter() - t0
+
+    winners = [r.winner for r in records]
+    print(f'{args.player1} vs {args.player2}: {args.games} games on {args.workers} workers in {elapsed:.1f} s '
+          f'({sum(r.elapsed_s for r in records) / elapsed:.2f} games in flight on average)')
+    print(f'Player 1 wins: {winners.count(1)}, player 2 wins: {winners.count(2)}, draws: {winners.count(0)}, '
+          f'adjudicated: {sum(r.adjudicated for r in records)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,4 @@
+import logging
 import time
 from dataclasses import dataclass
 
@@ -5,6 +6,8 @@ import hive_engine
 
 from agents.base import Agent
 
+logger = logging.getLogger(__name__)
+
 # Insect enum value → display string mapping.
 # Matches the C++ Insect enum order: ANT=0, BEETLE=1, GRASSHOPPER=2, SPIDER=3, QUEEN=4
 INSECT_NAMES: dict[int, str] = {0: 'ant', 1: 'beetle', 2: 'grasshopper', 3: 'spider', 4: 'queen'}
@@ -125,6 +128,9 @@ class GameController:
         elapsed = time.perf_counter() - t0
         if action is None:
             return
+        stats = getattr(agent, 'stats', None)   # SearchStats of the decision, for searching agents
+        if stats is not None:
+            logger.info('Player %d search: %s', player, stats.summary())
         self.game.apply_action(_cpp_action(action.tile_idx, action.to))
         self.view.add_turn_entry(player, elapsed)
         self._refresh_view()
@@ -154,32 +160,29 @@ class GameController:
 
     def _build_board_state(self) -> dict[tuple[int, int], list[TileState]]:
         """
-        Convert C++ tile_positions into a dict of (q,r) → list[TileState].
-        Isolates the view from pybind11 objects.
+        Convert the engine's piece table into a dict of (q,r) → list[TileState]
+        (bottom to top). Isolates the view from pybind11 objects.
         """
+        placed = sorted(
+            (level, q, r, player, tile_idx)
+            for player, pieces in enumerate(self.game.piece_locations().tolist(), start=1)
+            for tile_idx, (q, r, level) in enumerate(pieces)
+            if level >= 0
+        )
         result: dict[tuple[int, int], list[TileState]] = {}
-        for pos, tiles in self.game.get_tile_positions().items():
-            coord: tuple[int, int] = (pos.q, pos.r)
-            result[coord] = []
-            for tile in tiles:
-                insect_name = INSECT_NAMES.get(int(tile.insect), 'unknown')
-                tile_idx = _tile_to_idx(int(tile.insect), tile.id)
-                result[coord].append(TileState(
-                    player=tile.player,
-                    insect=insect_name,
-                    tile_idx=tile_idx,
-                    position=coord,
-                ))
+        for _, q, r, player, tile_idx in placed:
+            result.setdefault((q, r), []).append(TileState(
+                player=player,
+                insect=TILE_IDX_TO_INSECT[tile_idx],
+                tile_idx=tile_idx,
+                position=(q, r),
+            ))
         return result
 
     def _build_pieces_remaining(self, player: int) -> dict[str, int]:
         """Return insect → count for tiles still in the given player's hand."""
-        hand = self.game.get_player_hands()[player - 1]
-        counts: dict[str, int] = {}
-        for tile in hand:
-            name = INSECT_NAMES.get(int(tile.insect), 'unknown')
-            counts[name] = counts.get(name, 0) + 1
-        return counts
+        counts = self.game.hand_counts()[player - 1].tolist()
+        return {INSECT_NAMES[insect]: n for insect, n in enumerate(counts) if n}
 
     def _resolve_placement_tile_idx(self, insect: str) -> int | None:
         """Return the tile_idx for a placement of the given insect type."""
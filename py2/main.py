@@ -13,9 +13,16 @@ Usage examples:
 
     # Simplified game (queen surrounded by 3 = loss)
     python main.py --player2 random --simplified
+
+    # Log search statistics for every AI move
+    python main.py --player2 minimax_py --log-stats
+
+    # Human vs Monte Carlo tree search
+    python main.py --player2 mcts
 """
 
 import json
+import logging
 import sys
 import argparse
 from pathlib import Path
@@ -26,7 +33,7 @@ import hive_engine
 
 from controller.game_controller import GameController
 from gui.main_window import HiveGUI
-from agents import Agent, RandomAgent, MinimaxAgentPy, MinimaxParams
+from agents import Agent, RandomAgent, MinimaxAgentPy, MinimaxParams, MCTSAgent, MCTSParams
 
 _CONFIG_PATH = Path(__file__).parent / 'config.json'
 
@@ -39,6 +46,14 @@ def _load_minimax_agent() -> MinimaxAgentPy:
     return MinimaxAgentPy(params=MinimaxParams())
 
 
+def _load_mcts_agent() -> MCTSAgent:
+    if _CONFIG_PATH.exists():
+        with _CONFIG_PATH.open() as f:
+            cfg = json.load(f)
+        return MCTSAgent(params=MCTSParams(**cfg.get('mcts', {})))
+    return MCTSAgent(params=MCTSParams())
+
+
 def _make_agent(name: str | None) -> Agent | None:
     if name is None or name == 'human':
         return None
@@ -46,7 +61,9 @@ def _make_agent(name: str | None) -> Agent | None:
         return RandomAgent()
     if name == 'minimax_py':
         return _load_minimax_agent()
-    raise ValueError(f"Unknown agent type: {name!r}. Valid: human, random, minimax")
+    if name == 'mcts':
+        return _load_mcts_agent()
+    raise ValueError(f"Unknown agent type: {name!r}. Valid: human, random, minimax_py, mcts")
 
 
 def main() -> None:
@@ -57,8 +74,13 @@ def main() -> None:
                         help='Maximum turns before draw (-1 = unlimited)')
     parser.add_argument('--simplified', action='store_true',
                         help='Simplified game: queen surrounded by 3 = loss')
+    parser.add_argument('--log-stats', action='store_true',
+                        help='Log search statistics (nodes, cutoffs, hit rates, timings) for every AI move')
     args = parser.parse_args()
 
+    if args.log_stats:
+        logging.basicConfig(level=logging.INFO, format='%(message)s')
+
     app = QApplication(sys.argv)
 
     game = hive_engine.Game(args.max_turns, args.simplified)
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Perft-style move generation benchmark and cross-engine parity check.
+
+Counts the leaf nodes of the full game tree to a fixed depth from a corpus of
+fixed positions, on both the legacy pure-Python engine (py/game/HiveBoard) and
+the C++ engine (hive_engine.Game), and reports nodes per second for each.
+
+With both engines selected it also walks the trees in lockstep and flags every
+position where the two engines disagree on the legal actions.
+
+Usage:
+    python scripts/perft.py --depth 2
+    python scripts/perft.py --depth 3 --engine native
+    python scripts/perft.py --depth 2 --position midgame
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(_ROOT / 'py'))    # legacy engine: `game` package
+sys.path.insert(0, str(_ROOT / 'py2'))   # hive_engine extension module
+
+import hive_engine
+from game import HiveBoard, ACTIONSPACE, ACTIONSPACE_INV
+
+# tile_idx → insect name (matches C++ TILE_IDX_MAP)
+_TILE_IDX_TO_INSECT: dict[int, str] = {
+    0: 'queen',
+    1: 'spider', 2: 'spider',
+    3: 'beetle', 4: 'beetle',
+    5: 'ant', 6: 'ant', 7: 'ant',
+    8: 'grasshopper', 9: 'grasshopper', 10: 'grasshopper',
+}
+
+# tile_idx → (Insect, id) (mirrors C++ TILE_IDX_MAP)
+_TILE_IDX_MAP: list[tuple[hive_engine.Insect, int]] = [
+    (hive_engine.Insect.QUEEN, 1),
+    (hive_engine.Insect.SPIDER, 1), (hive_engine.Insect.SPIDER, 2),
+    (hive_engine.Insect.BEETLE, 1), (hive_engine.Insect.BEETLE, 2),
+    (hive_engine.Insect.ANT, 1), (hive_engine.Insect.ANT, 2), (hive_engine.Insect.ANT, 3),
+    (hive_engine.Insect.GRASSHOPPER, 1), (hive_engine.Insect.GRASSHOPPER, 2),
+    (hive_engine.Insect.GRASSHOPPER, 3),
+]
+
+# Fixed positions, each given as the (tile_idx, q, r) actions that reach it from
+# the start. Placements use the highest-id piece in hand, as the C++ engine does,
+# so every sequence replays identically on both engines.
+CORPUS: dict[str, list[tuple[int, int, int]]] = {
+    'start': [],
+    'opening': [(7, 0, 0), (10, -1, 0), (10, 1, 0), (4, -2, 0)],
+    'queens': [(0, 0, 0), (0, 0, -1), (0, 1, -1), (4, -1, -1), (10, 2, -1), (3, -2, -1),
+               (4, 3, -1), (3, -1, -2)],
+    'midgame': [(7, 0, 0), (10, -1, 0), (10, 1, 0), (4, -2, 0), (0, 0, 1), (0, -2, -1),
+                (6, 1, -1), (3, -1, -1), (6, -3, 1), (3, 0, -1), (6, -1, -2), (7, -3, 1),
+                (6, 1, 1), (3, -1, -1)],
+    'crowded': [(2, 0, 0), (7, -1, 0), (4, 1, 0), (0, -1, -1), (0, 1, 1), (10, -2, 1),
+                (3, 2, 1), (6, -2, 2), (7, 2, 2), (2, -3, 3), (7, 1, 2), (0, -2, 0),
+                (10, 3, 1), (5, -2, -1), (6, 1, 3), (5, -1, 2), (5, 1, -1), (2, -3, 0),
+                (9, 1, -2), (5, 0, 1)],
+    'beetles': [(2, 0, 0), (2, 0, 1), (0, 0, -1), (7, 1, 1), (7, -1, -1), (0, 2, 0),
+                (4, -1, -2), (1, -1, 2), (1, -1, 0), (0, 1, 0), (4, -2, -1), (7, 2, 0),
+                (10, 0, -2), (6, 3, -1), (1, -2, 3), (5, 4, -2), (9, -2, -2), (5, 4, -1),
+                (6, -2, 4), (5, -2, 0), (5, -1, 4), (5, -3, 3), (5, 0, -3), (5, 1, -4),
+                (3, -3, -1), (5, 2, -1)],
+}
+
+
+class LegacyEngine:
+    """Wraps py/game/HiveBoard in the (tile_idx, q, r) action API."""
+    name = 'py'
+
+    def __init__(self) -> None:
+        self.board = HiveBoard()
+
+    def legal_actions(self) -> list[tuple[int, int, int]]:
+        # HiveBoard lists a placement for every instance of an insect in hand;
+        # keep only the highest id so node counts match the C++ engine
+        player = self.board.get_player_turn()
+        hand = self.board.player1_hand if player == 1 else self.board.player2_hand
+        in_hand = {ACTIONSPACE[tile.name.split('_')[0]] for tile in hand}
+        placed_idx = {}
+        for tile_idx in in_hand:
+            insect = _TILE_IDX_TO_INSECT[tile_idx]
+            placed_idx[insect] = max(placed_idx.get(insect, -1), tile_idx)
+        skipped = in_hand - set(placed_idx.values())
+
+        actions = self.board.get_legal_actions(player)
+        return [(tile_idx, pos[0], pos[1])
+                for pos, mask in actions.items()
+                for tile_idx, legal in enumerate(mask)
+                if legal and tile_idx not in skipped]
+
+    def is_placement(self, tile_idx: int) -> bool:
+        tile = self._tile(tile_idx, self.board.get_player_turn())
+        return tile in self.board.player1_hand or tile in self.board.player2_hand
+
+    def apply(self, action: tuple[int, int, int]):
+        tile_idx, q, r = action
+        tile = self._tile(tile_idx, self.board.get_player_turn())
+        original_pos = tile.position
+        if tile in self.board.player1_hand or tile in self.board.player2_hand:
+            self.board.place_tile(tile, (q, r))
+        else:
+            self.board.move_tile(tile, (q, r), update_turns=True)
+        return original_pos
+
+    def undo(self, action: tuple[int, int, int], token) -> None:
+        tile = self._tile(action[0], 3 - self.board.get_player_turn())
+        self.board.undo_move(tile, token)
+
+    def game_over(self) -> bool:
+        return self.board.game_over() is not False
+
+    def _tile(self, tile_idx: int, player: int):
+        return self.board.name_obj_mapping[ACTIONSPACE_INV[tile_idx] + '_p' + str(player)]
+
+
+class NativeEngine:
+    """Wraps hive_engine.Game in the (tile_idx, q, r) action API."""
+    name = 'native'
+
+    def __init__(self) -> None:
+        self.game = hive_engine.Game()
+
+    def legal_actions(self) -> list[tuple[int, int, int]]:
+        return [(a.tile_idx, a.to.q, a.to.r) for a in self.game.get_legal_actions()]
+
+    def is_placement(self, tile_idx: int) -> bool:
+        player = self.game.get_current_player()
+        insect, tile_id = _TILE_IDX_MAP[tile_idx]
+        return hive_engine.HiveTile(player, insect, tile_id) in self.game.get_player_hands()[player - 1]
+
+    def apply(self, action: tuple[int, int, int]):
+        a = hive_engine.Action(action[0], hive_engine.Position(action[1], action[2]))
+        return a, self.game.apply_action(a)
+
+    def undo(self, action: tuple[int, int, int], token) -> None:
+        a, original_pos = token
+        self.game.undo(a, original_pos)
+
+    def game_over(self) -> bool:
+        return self.game.check_game_over() != 0
+
+
+ENGINES = {'py': LegacyEngine, 'native': NativeEngine}
+
+
+def perft(engine, depth: int) -> int:
+    """Counts the leaf nodes of the game tree below the engine's current position."""
+    if depth == 0 or engine.game_over():
+        return 1
+    actions = engine.legal_actions()
+    if not actions:
+        return 1
+    if depth == 1:
+        return len(actions)
+    nodes = 0
+    for action in actions:
+        token = engine.apply(action)
+        nodes += perft(engine, depth - 1)
+        engine.undo(action, token)
+    return nodes
+
+
+def normalised_actions(engine) -> set[tuple]:
+    """
+    Legal actions in a form comparable across engines. Placements are compared
+    by insect type and movements by the tile_idx of the piece moved.
+    """
+    result = set()
+    for tile_idx, q, r in engine.legal_actions():
+        if engine.is_placement(tile_idx):
+            result.add(('place', _TILE_IDX_TO_INSECT[tile_idx], q, r))
+        else:
+            result.add(('move', tile_idx, q, r))
+    return result
+
+
+def parity(reference, other, depth: int, path: list, mismatches: list, limit: int) -> None:
+    """
+    Walks both engines in lockstep to `depth`, recording the path to every
+    position where their legal actions differ. Only actions legal in both
+    engines are followed.
+    """
+    if len(mismatches) >= limit or reference.game_over() or other.game_over():
+        return
+    ref_actions = normalised_actions(reference)
+    other_actions = normalised_actions(other)
+    if ref_actions != other_actions:
+        mismatches.append((list(path),
+                           sorted(ref_actions - other_actions),
+                           sorted(other_actions - ref_actions)))
+    if depth == 0:
+        return
+    common = set(reference.legal_actions()) & set(other.legal_actions())
+    for action in sorted(common):
+        ref_token = reference.apply(action)
+        other_token = other.apply(action)
+        path.append(action)
+        parity(reference, other, depth - 1, path, mismatches, limit)
+        path.pop()
+        other.undo(action, other_token)
+        reference.undo(action, ref_token)
+
+
+def load_position(engine_cls, moves: list[tuple[int, int, int]]):
+    engine = engine_cls()
+    for action in moves:
+        engine.apply(action)
+    return engine
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Perft benchmark and engine parity check')
+    parser.add_argument('--depth', type=int, default=2, help='Perft depth (plies)')
+    parser.add_argument('--engine', choices=['py', 'native', 'both'], default='both',
+                        help='Engine(s) to benchmark')
+    parser.add_argument('--position', choices=list(CORPUS), default=None,
+                        help='Run a single corpus position (default: all)')
+    parser.add_argument('--parity-depth', type=int, default=None,
+                        help='Depth of the lockstep parity walk (default: --depth - 1)')
+    parser.add_argument('--max-mismatches', type=int, default=5,
+                        help='Mismatches reported per position')
+    args = parser.parse_args()
+
+    engine_names = ['py', 'native'] if args.engine == 'both' else [args.engine]
+    positions = {args.position: CORPUS[args.position]} if args.position else CORPUS
+    totals = {name: [0, 0.0] for name in engine_names}
+    diverged = []
+
+    print(f'{"position":<10}{"engine":>8}{"nodes":>12}{"seconds":>10}{"nodes/s":>12}')
+    for pos_name, moves in positions.items():
+        counts = {}
+        for name in engine_names:
+            engine = load_position(ENGINES[name], moves)
+            t0 = time.perf_counter()
+            nodes = perft(engine, args.depth)
+            elapsed = time.perf_counter() - t0
+            counts[name] = nodes
+            totals[name][0] += nodes
+            totals[name][1] += elapsed
+            print(f'{pos_name:<10}{name:>8}{nodes:>12}{elapsed:>10.3f}{nodes / max(elapsed, 1e-9):>12.0f}')
+
+        if len(engine_names) == 2:
+            mismatches: list = []
+            parity_depth = args.parity_depth if args.parity_depth is not None else max(args.depth - 1, 0)
+            parity(load_position(LegacyEngine, moves), load_position(NativeEngine, moves),
+                   parity_depth, [], mismatches, args.max_mismatches)
+            if mismatches or counts['py'] != counts['native']:
+                diverged.append((pos_name, counts, mismatches))
+
+    print('\n=== Totals ===')
+    for name, (nodes, elapsed) in totals.items():
+        print(f'{name:<10}{nodes:>12} nodes {elapsed:>10.3f}s {nodes / max(elapsed, 1e-9):>12.0f} nodes/s')
+
+    if len(engine_names) == 2:
+        print('\n=== Parity ===')
+        if not diverged:
+            print('Engines agree on every corpus position')
+        for pos_name, counts, mismatches in diverged:
+            print(f'{pos_name}: perft py={counts["py"]} native={counts["native"]}')
+            for path, only_py, only_native in mismatches:
+                print(f'  after {path}')
+                if only_py:
+                    print(f'    only py:     {only_py}')
+                if only_native:
+                    print(f'    only native: {only_native}')
+
+
+if __name__ == '__main__':
+    main()
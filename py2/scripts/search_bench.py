@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Search benchmark for the legacy beam_minimax (py/AI/minimax) and
+MinimaxAgentPy (py2/agents) over the perft corpus.
+
+For each position one decision is searched with and without the transposition
+table and evaluation cache, reporting moves applied (phase-1 scoring plus
+recursion), wall time, TT and cache hit rates and the node reduction the
+table gives.
+
+The legacy engine can also be searched full width (plain alpha-beta minimax)
+and with killer/history move ordering on top of the table, reporting the
+node reduction and the rate of cutoffs at the first move searched.
+
+The native search can add late-move reductions, futility pruning and
+null-move pruning to the TT run, reporting how often each fired.
+
+Usage:
+    python scripts/search_bench.py
+    python scripts/search_bench.py --engine native --depth 3
+    python scripts/search_bench.py --engine py --depth 2 --full-width --ordering
+    python scripts/search_bench.py --engine native --depth 4 --beam-width 5 --lmr --futility-margin 0.5 --null-move
+"""
+
+import argparse
+import sys
+import time
+
+from perft import CORPUS, LegacyEngine, NativeEngine, load_position, _ROOT
+
+sys.path.insert(0, str(_ROOT / 'py2'))
+
+import hive_engine
+from agents import MinimaxAgentPy, MinimaxParams
+
+
+class CountingGame(hive_engine.Game):
+    """hive_engine.Game that counts apply_action calls."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.applied = 0
+
+    def apply_action(self, action):
+        self.applied += 1
+        return super().apply_action(action)
+
+
+def bench_native(moves, depth: int, beam_width: int, tt_size: int,
+                 full_width: bool = False, ordering: bool = False,
+                 selective: dict | None = None) -> tuple[int, float, str]:
+    game = CountingGame()
+    for tile_idx, q, r in moves:
+        game.apply_action(hive_engine.Action(tile_idx, hive_engine.Position(q, r)))
+    game.applied = 0
+
+    # Python phase-1 scoring, so every applied move goes through CountingGame; a fixed
+    # beam_width, as in the legacy beam_minimax
+    agent = MinimaxAgentPy(MinimaxParams(depth=depth, beam_width=beam_width, tt_size=tt_size,
+                                         eval_cache_size=2 ** 16 if tt_size else 0, native_eval=False,
+                                         adaptive_beam=False, **(selective or {})))
+    t0 = time.perf_counter()
+    agent.select_action(game)
+    elapsed = time.perf_counter() - t0
+    summaries = [agent.tt.summary() if agent.tt else '', agent.eval_cache.summary() if agent.eval_cache else '',
+                 agent.stats.summary() if selective else '']
+    return game.applied, elapsed, '; '.join(filter(None, summaries))
+
+
+def bench_legacy(moves, depth: int, beam_width: int, tt_size: int,
+                 full_width: bool = False, ordering: bool = False,
+                 selective: dict | None = None) -> tuple[int, float, str]:
+    sys.path.insert(0, str(_ROOT / 'py'))
+    from AI.minimax import minimax, beam_minimax, Params, TranspositionTable, MoveOrdering, EvalCache
+    minimax_module = sys.modules['AI.minimax.minimax']
+
+    applied = 0
+    make_move = minimax_module.make_move
+
+    def counting_make_move(board, action):
+        nonlocal applied
+        applied += 1
+        return make_move(board, action)
+
+    board = load_position(LegacyEngine, moves).board
+    params = Params(queen_surrounding_reward=1, win_reward=100, ownership_reward=3, mp_reward=0.5)
+    tt = TranspositionTable(tt_size) if tt_size else None
+    move_ordering = MoveOrdering() if ordering else None
+    eval_cache = EvalCache() if tt_size else None
+    minimax_module.make_move = counting_make_move
+    try:
+        t0 = time.perf_counter()
+        if full_width:
+            minimax(board, depth, True, board.get_player_turn(), params, tt=tt, ordering=move_ordering,
+                    eval_cache=eval_cache)
+        else:
+            beam_minimax(board, depth, True, board.get_player_turn(), params,
+                         beam_width=beam_width, tt=tt, ordering=move_ordering, eval_cache=eval_cache)
+        elapsed = time.perf_counter() - t0
+    finally:
+        minimax_module.make_move = make_move
+    summaries = [tt.summary() if tt else '', eval_cache.summary() if eval_cache else '',
+                 move_ordering.summary() if move_ordering else '']
+    return applied, elapsed, '; '.join(filter(None, summaries))
+
+
+BENCHES = {'py': bench_legacy, 'native': bench_native}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Search benchmark over the perft corpus')
+    parser.add_argument('--engine', choices=['py', 'native', 'both'], default='both')
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--beam-width', type=int, default=3)
+    parser.add_argument('--tt-size', type=int, default=2 ** 16)
+    parser.add_argument('--full-width', action='store_true',
+                        help='py engine: search with minimax instead of beam_minimax')
+    parser.add_argument('--ordering', action='store_true',
+                        help='py engine: add killer/history move ordering to the TT run')
+    parser.add_argument('--lmr', action='store_true',
+                        help='native engine: add late-move reductions to the TT run')
+    parser.add_argument('--futility-margin', type=float, default=None,
+                        help='native engine: add futility pruning with this per-ply margin to the TT run')
+    parser.add_argument('--null-move', action='store_true',
+                        help='native engine: add null-move pruning to the TT run')
+    args = parser.parse_args()
+    selective = {k: v for k, v in [('lmr', args.lmr), ('futility_margin', args.futility_margin),
+                                   ('null_move', args.null_move)] if v}
+
+    engine_names = ['py', 'native'] if args.engine == 'both' else [args.engine]
+    positions = {name: moves for name, moves in CORPUS.items() if moves}
+
+    for name in engine_names:
+        print(f'=== {name} (depth {args.depth}, beam {args.beam_width}) ===')
+        print(f'{"position":<10}{"nodes":>10}{"nodes+TT":>10}{"reduction":>11}{"s":>8}{"s+TT":>8}  TT')
+        for pos_name, moves in positions.items():
+            base_nodes, base_time, _ = BENCHES[name](moves, args.depth, args.beam_width, 0, args.full_width)
+            tt_nodes, tt_time, tt_summary = BENCHES[name](moves, args.depth, args.beam_width, args.tt_size,
+                                                          args.full_width, args.ordering, selective)
+            reduction = 1 - tt_nodes / base_nodes if base_nodes else 0.0
+            print(f'{pos_name:<10}{base_nodes:>10}{tt_nodes:>10}{100 * reduction:>10.1f}%'
+                  f'{base_time:>8.2f}{tt_time:>8.2f}  {tt_summary}')
+
+
+if __name__ == '__main__':
+    main()
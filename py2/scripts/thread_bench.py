@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Thread-scaling benchmark for the GIL-releasing hive_engine calls.
+
+For each worker count, runs the same work on a thread pool and reports
+throughput and speedup over one worker:
+  - search:    one native Game.search per perft corpus position (separate Games)
+  - playouts:  random playouts from one shared position (agents.parallel_playouts)
+  - movegen:   get_legal_actions / apply_action / undo walks, one Game per thread
+
+Speedup is bounded by the cores available (os.cpu_count()).
+
+Usage:
+    python scripts/thread_bench.py
+    python scripts/thread_bench.py --workers 1 2 4 8 --depth 3 --playouts 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from perft import CORPUS, NativeEngine, load_position, _ROOT
+
+sys.path.insert(0, str(_ROOT / 'py2'))
+
+from agents import MinimaxParams
+from agents.parallel import parallel_playouts, search_many
+
+
+def _games(copies: int):
+    games = [load_position(NativeEngine, moves).game for moves in CORPUS.values()]
+    return [game.clone() for game in games for _ in range(copies)]
+
+
+def _walk(game, depth: int) -> int:
+    """Leaf count of the full tree to depth, through the bound move generation calls."""
+    if depth == 0:
+        return 1
+    nodes = 0
+    for action in game.get_legal_actions():
+        orig = game.apply_action(action)
+        nodes += _walk(game, depth - 1)
+        game.undo(action, orig)
+    return nodes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--depth', type=int, default=3, help='Native search depth')
+    parser.add_argument('--copies', type=int, default=2, help='Searches per corpus position')
+    parser.add_argument('--playouts', type=int, default=1000)
+    parser.add_argument('--walk-depth', type=int, default=2)
+    args = parser.parse_args()
+
+    print(f'{os.cpu_count()} CPUs')
+    print(f"{'workers':>7}  {'search/s':>9} {'x':>5}  {'playouts/s':>10} {'x':>5}  {'walks/s':>8} {'x':>5}")
+    base = None
+    params = MinimaxParams(depth=args.depth)
+    for workers in args.workers:
+        games = _games(args.copies)
+        t0 = time.perf_counter()
+        search_many(games, params, workers)
+        search_rate = len(games) / (time.perf_counter() - t0)
+
+        shared = load_position(NativeEngine, CORPUS['midgame']).game
+        t0 = time.perf_counter()
+        parallel_playouts(shared, args.playouts, 80, seed=1, workers=workers)
+        playout_rate = args.playouts / (time.perf_counter() - t0)
+
+        games = _games(args.copies)
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda game: _walk(game, args.walk_depth), games))
+        walk_rate = len(games) / (time.perf_counter() - t0)
+
+        rates = (search_rate, playout_rate, walk_rate)
+        base = base or rates
+        print(f'{workers:>7}  {rates[0]:>9.1f} {rates[0] / base[0]:>5.2f}  {rates[1]:>10.0f} '
+              f'{rates[1] / base[1]:>5.2f}  {rates[2]:>8.1f} {rates[2] / base[2]:>5.2f}')
+
+
+if __name__ == '__main__':
+    main()
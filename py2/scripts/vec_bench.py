@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Batched stepping benchmark: random self-play through hive_engine.VecGame
+against the same games stepped one by one.
+
+Both sides play uniformly random legal actions (a side with none passes) and
+restart finished games, for the same number of plies per game:
+  - loop:  one Game per slot, legal_actions_array / apply_action_idx per game per ply
+  - vec:   one VecGame, legal_indices / step per ply for the whole batch
+
+Reports plies per second and finished games for each.
+
+Usage:
+    python scripts/vec_bench.py
+    python scripts/vec_bench.py --games 256 --plies 200 --max-turns 30
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))   # hive_engine extension module
+
+import hive_engine
+
+
+def run_loop(games: int, plies: int, max_turns: int, seed: int) -> tuple[float, int]:
+    rng = np.random.default_rng(seed)
+    slots = [hive_engine.Game(max_turns) for _ in range(games)]
+    finished = 0
+    t0 = time.perf_counter()
+    for _ in range(plies):
+        for i, game in enumerate(slots):
+            actions = game.legal_actions_array()
+            if len(actions):
+                game.apply_action_idx(*actions[rng.integers(len(actions))])
+            else:
+                game.pass_turn()
+            if game.is_over():
+                finished += 1
+                slots[i] = hive_engine.Game(max_turns)
+    return time.perf_counter() - t0, finished
+
+
+def run_vec(games: int, plies: int, max_turns: int, seed: int) -> tuple[float, int]:
+    rng = np.random.default_rng(seed)
+    vec = hive_engine.VecGame(games, max_turns)
+    t0 = time.perf_counter()
+    for _ in range(plies):
+        legal, offsets = vec.legal_indices()
+        counts = np.diff(offsets)
+        picks = offsets[:-1] + (rng.random(games) * counts).astype(np.int64)
+        actions = np.where(counts > 0, legal[np.minimum(picks, len(legal) - 1)], hive_engine.VecGame.PASS)
+        vec.step(actions)
+    return time.perf_counter() - t0, int(vec.results().sum())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--games', type=int, default=64)
+    parser.add_argument('--plies', type=int, default=100, help='Plies stepped per game')
+    parser.add_argument('--max-turns', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    total = args.games * args.plies
+    print(f"{'':>5}  {'plies/s':>9}  {'finished':>8}")
+    for name, run in (('loop', run_loop), ('vec', run_vec)):
+        elapsed, finished = run(args.games, args.plies, args.max_turns, args.seed)
+        print(f'{name:>5}  {total / elapsed:>9.0f}  {finished:>8}')
+
+
+if __name__ == '__main__':
+    main()